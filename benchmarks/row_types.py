@@ -0,0 +1,55 @@
+"""
+Benchmarks the row types of the Conversations data object: creation time and bytes per row of namedtuples built with
+keyword arguments (the original parsing path), namedtuples built positionally with _make, and compact slot based rows.
+
+Usage:
+    $ python benchmarks/row_types.py
+"""
+
+import gc
+import time
+import tracemalloc
+from lp_api_wrapper.data.messaging_interactions.conversations import (MessageRecord, CompactMessageRecord)
+
+ROWS = 200000
+REPEATS = 5
+
+
+def message_record_values(i: int) -> list:
+    return ['conversation-{}'.format(i // 20), None, 'DESKTOP', 'dialog-{}'.format(i // 20), 'message {}'.format(i),
+            'ms::{}'.format(i), 'participant', 'Consumer', i % 20, 'APP', '2017-04-01 00:00:00.000+0000',
+            1491004800000 + i, 'TEXT_PLAIN']
+
+
+def benchmark(label: str, build, values: list) -> None:
+    # Best of REPEATS runs with the garbage collector off, so collections triggered by earlier runs do not count.
+    elapsed = None
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            rows = [build(v) for v in values]
+            run = time.perf_counter() - start
+            elapsed = run if elapsed is None else min(elapsed, run)
+            del rows
+    finally:
+        gc.enable()
+
+    # Measured separately, as tracing allocations slows creation down.  The list's own pointers are excluded.
+    tracemalloc.start()
+    rows = [build(v) for v in values]
+    size = tracemalloc.get_traced_memory()[0] - 8 * len(rows)
+    tracemalloc.stop()
+
+    print('{:<28} {:>8.1f} ns/row {:>8.1f} bytes/row'.format(label, elapsed / len(rows) * 1e9, size / len(rows)))
+
+
+if __name__ == '__main__':
+    fields = MessageRecord._fields
+    values = [message_record_values(i) for i in range(ROWS)]
+    keyword_values = [dict(zip(fields, v)) for v in values]
+
+    print('{} MessageRecord rows'.format(ROWS))
+    benchmark('namedtuple(**kwargs)', lambda v: MessageRecord(**v), keyword_values)
+    benchmark('namedtuple._make(values)', MessageRecord._make, values)
+    benchmark('compact._make(values)', CompactMessageRecord._make, values)
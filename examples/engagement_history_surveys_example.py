@@ -2,10 +2,9 @@
 This example shows how to view all Engagement History Surveys by account.
 """
 
-import pandas as pd
-from collections import OrderedDict
 from datetime import datetime, timedelta
 from lp_api_wrapper import UserLogin, EngagementHistory
+from lp_api_wrapper.data.engagement_history import pivot_surveys
 
 
 # Set up account authentication.
@@ -19,29 +18,13 @@ start_from = int((datetime.now() - timedelta(days=.1)).timestamp() * 1000)
 start_to = int(datetime.now().timestamp() * 1000)
 body = {'start': {'from': start_from, 'to': start_to}}
 
-# Retrieve all interaction history records in time frame.
-interaction_history_records = eh_conn.all_engagements(body, debug=True)
-
-# Extract all survey data from interaction history records.
-survey_data = []
-for ihr in interaction_history_records:
-    if 'surveys' in ihr:
-        for survey_type, surveys in ihr['surveys'].items():
-            if type(surveys) == list:
-                survey_records = []
-                for survey in surveys:
-                    survey_record = dict(
-                        # Experiment by adding additional info parameters.
-                        accountId=ihr['info']['accountId'],
-                        engagementID=ihr['info']['engagementId'],
-                        agentId=ihr['info']['agentId'],
-                        surveyType=survey_type
-                    )
-                    survey_record.update(survey)
-                    survey_records.append(OrderedDict(survey_record))
-                survey_data.extend(survey_records)
+# Pivot the surveys of each page of interaction history records as it arrives, one row per engagement and survey type
+# and one column per question.
+surveys = pivot_surveys([])
+for records in eh_conn.engagement_pages(body, debug=True):
+    surveys = pivot_surveys(records, pivot=surveys)
 
 # Convert to a Pandas DF
-survey_df = pd.DataFrame(survey_data)
+survey_df = surveys.to_pandas()
 
 print(survey_df.head())
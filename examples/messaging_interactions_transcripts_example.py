@@ -4,7 +4,6 @@ This example shows how to create a Messaging Interactions transcripts CSV flat f
 
 from lp_api_wrapper import MessagingInteractions, UserLogin
 from datetime import datetime, timedelta
-import pandas as pd
 
 # For User Login
 auth = UserLogin(account_id='1234', username='YOURUSERNAME', password='YOURPASSWORD')
@@ -25,7 +24,7 @@ body = {'start': {'from': start_from, 'to': start_to}}
 conversations = mi_conn.conversations(body=body)
 
 # Convert into Pandas DataFrame
-df = pd.DataFrame(conversations.message_record)
+df = conversations.to_pandas(table='message_record')
 
 # File path with file name.
 file_path = './transcripts.csv'
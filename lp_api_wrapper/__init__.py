@@ -1,3 +1,4 @@
-from .util import (DomainService, LoginService, UserLogin, OAuthLogin)
+from .util import (DomainService, LoginService, UserLogin, OAuthLogin, set_json_decoder)
 from .data import (AgentMetrics, EngagementHistory, MessagingInteractions, MessagingOperations, OperationalRealtime)
 from .account_configuration import (PredefinedContent, PredefinedCategories)
+from .export import (Checkpoint, CsvWriter, NdjsonArchive, ParquetWriter)
@@ -1,4 +1,5 @@
 import requests
+from ..util.json_decoder import decode_json
 from ..util.login_service import (LoginService, UserLogin, OAuthLogin)
 from typing import (Optional, Union, Any)
 
@@ -24,7 +25,7 @@ class PredefinedCategories(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -1,4 +1,5 @@
 import requests
+from ..util.json_decoder import decode_json
 from ..util.login_service import (LoginService, UserLogin, OAuthLogin)
 from typing import Optional, Union
 
@@ -59,7 +60,7 @@ class PredefinedContent(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -119,7 +120,7 @@ class PredefinedContent(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -150,7 +151,7 @@ class PredefinedContent(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -180,7 +181,7 @@ class PredefinedContent(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -26,7 +26,7 @@ Usage Example:
 """
 
 import requests
-from ..util import (LoginService, UserLogin, OAuthLogin)
+from ..util import (LoginService, UserLogin, OAuthLogin, decode_json)
 from typing import List, Optional, Union
 
 
@@ -69,7 +69,7 @@ class AgentMetrics(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -108,7 +108,7 @@ class AgentMetrics(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -1 +1,4 @@
 from .engagement_history import EngagementHistory
+from .engagement_surveys import pivot_surveys
+from .engagements import Engagements
+from .transcript_lines import TranscriptLines
@@ -28,10 +28,13 @@ Usage Example:
     > data = eh_conn.engagements(body)
 """
 
-import concurrent.futures
 import requests
-from ...util import (LoginService, UserLogin, OAuthLogin)
-from typing import (List, Optional, Union)
+from .engagements import Engagements
+from .transcript_lines import TranscriptLines
+from ...export.checkpoint import Checkpoint
+from ...export.ndjson_archive import (NdjsonArchive, page_record_count)
+from ...util import (LoginService, UserLogin, OAuthLogin, Pipeline, decode_json)
+from typing import (Iterator, List, Optional, Tuple, Union)
 
 
 class EngagementHistory(LoginService):
@@ -57,6 +60,22 @@ class EngagementHistory(LoginService):
         :return: Dictionary of the json data_api from the request.
         """
 
+        return decode_json(self.engagements_content(body=body, offset=offset, limit=limit, sort=sort))
+
+    def engagements_content(self, body: dict, offset: int = 0, limit: int = 100, sort: Optional[str] = None) -> bytes:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-engagement-history-methods.html
+
+        Same as engagements, but returns the undecoded response body so decoding can happen elsewhere, or not at all.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param offset: Specifies from which record to retrieve the chat. Default is 0.
+        :param limit: Max amount of conversations to be received in the response.  Default and max is 100.
+        :param sort: Sort the results in a predefined order.
+        :return: JSON response body as bytes.
+        """
+
         url = 'https://{}/interaction_history/api/account/{}/interactions/search?'
 
         # Establish Authorization
@@ -72,13 +91,15 @@ class EngagementHistory(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return r.content
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
 
     def all_engagements(self, body: dict, offset: int = 0, limit: int = 100, sort: Optional[str] = None,
-                        max_concurrent_requests: int = 5, debug: bool = False) -> Union[List, List[dict]]:
+                        max_concurrent_requests: int = 5, debug: bool = False, raw_data: bool = True,
+                        compact_rows: bool = False, checkpoint: Optional[str] = None
+                        ) -> Union[List, List[dict], Optional[Engagements]]:
         """
         Documentation:
         https://developers.liveperson.com/data_api-messaging-interactions-conversations.html
@@ -95,44 +116,213 @@ class EngagementHistory(LoginService):
         :param body: Enter body parameters that are the same as the API documentation.
         :param max_concurrent_requests: Maximum concurrent requests.
         :param debug: Shows status of requests.
-        :return: List of all interactionHistoryRecords within the start time range.
+        :param raw_data: Returns the raw interactionHistoryRecords.  False parses them into an Engagements object.
+        :param compact_rows: Store the rows of the Engagements object as slot based classes.  Used when raw_data is
+         False.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  Running the same search again
+         with the same directory resumes an interrupted extraction.  See Checkpoint.
+        :return: List of all interactionHistoryRecords within the start time range, or Engagements.
+        """
+
+        if not raw_data:
+            engagements = None
+            for page in self.engagement_table_pages(body=body, offset=offset, limit=limit, sort=sort,
+                                                    max_concurrent_requests=max_concurrent_requests, debug=debug,
+                                                    compact_rows=compact_rows, checkpoint=checkpoint):
+                if engagements is None:
+                    engagements = page
+                else:
+                    engagements.extend(page)
+            return engagements
+
+        interaction_history_records = []
+        for records in self.engagement_pages(body=body, offset=offset, limit=limit, sort=sort,
+                                             max_concurrent_requests=max_concurrent_requests, debug=debug,
+                                             checkpoint=checkpoint):
+            # Add data to results.
+            interaction_history_records.extend(records)
+
+        return interaction_history_records
+
+    def archive_engagements(self, body: dict, path: str, sort: Optional[str] = None, max_concurrent_requests: int = 5,
+                            compresslevel: int = 1, debug: bool = False) -> int:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-engagement-history-methods.html
+
+        Writes the raw interactionHistoryRecords of the search to a compressed newline delimited JSON file, streaming
+        each page to disk as it completes.  Responses are written as received, one page per line, and only decoded to
+        count their records.  Read the records back with read_archive.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param path: REQUIRED File to write.  Example: './engagements.ndjson.gz'
+        :param sort: Sort the results in a predefined order.
+        :param max_concurrent_requests: Maximum concurrent requests.
+        :param compresslevel: Gzip compression level from 0 to 9.  Default 1 favours speed over size.
+        :param debug: Shows status of requests.
+        :return: Number of records written.
+        :raises requests.HTTPError: If a page cannot be downloaded, even after logging in again.  The archive would
+         otherwise be missing the page.
+        """
+
+        with NdjsonArchive(path=path, compresslevel=compresslevel) as archive:
+            for records, content in self._engagement_pipeline(body=body, offset=0, limit=100, sort=sort,
+                                                              max_concurrent_requests=max_concurrent_requests,
+                                                              debug=debug, checkpoint=None, queue_size=4, raw=True):
+                archive.write_page_content(content=content, records=records)
+            return archive.count
+
+    def engagement_table_pages(self, body: dict, offset: int = 0, limit: int = 100, sort: Optional[str] = None,
+                               max_concurrent_requests: int = 5, debug: bool = False, compact_rows: bool = False,
+                               drop_time_strings: bool = False, checkpoint: Optional[str] = None
+                               ) -> Iterator[Engagements]:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-engagement-history-methods.html
+
+        Yields an Engagements object for each page of the search as soon as the page is retrieved and parsed.  Pages
+        share one dictionary encoding, so repeated strings are stored once across the whole search.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param offset: Specifies from which record to retrieve the chat. Default is 0.
+        :param limit: Max amount of conversations to be received in the response.  Default and max is 100.
+        :param sort: Sort the results in a predefined order.
+        :param max_concurrent_requests: Maximum concurrent requests.
+        :param debug: Shows status of requests.
+        :param compact_rows: Store rows as slot based classes instead of namedtuples.
+        :param drop_time_strings: Skip the string timestamps that duplicate the *_time_l fields.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  See engagement_pages.
+        :return: Iterator of Engagements, one per page, in completion order.
+        """
+
+        categories = {}
+        for records in self.engagement_pages(body=body, offset=offset, limit=limit, sort=sort,
+                                             max_concurrent_requests=max_concurrent_requests, debug=debug,
+                                             checkpoint=checkpoint):
+            engagements = Engagements(categories=categories, compact_rows=compact_rows,
+                                      drop_time_strings=drop_time_strings)
+            engagements.append_records(records=records)
+            yield engagements
+
+    def transcript_lines(self, body: dict, offset: int = 0, limit: int = 100, sort: Optional[str] = None,
+                         max_concurrent_requests: int = 5, debug: bool = False,
+                         lines: Optional[TranscriptLines] = None) -> TranscriptLines:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-engagement-history-methods.html
+
+        Collects the chat transcript lines of the search into a TranscriptLines table.  Each page is flattened into the
+        table as soon as it is retrieved and then dropped, so only the compact table is held in memory.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param offset: Specifies from which record to retrieve the chat. Default is 0.
+        :param limit: Max amount of conversations to be received in the response.  Default and max is 100.
+        :param sort: Sort the results in a predefined order.
+        :param max_concurrent_requests: Maximum concurrent requests.
+        :param debug: Shows status of requests.
+        :param lines: TranscriptLines to append to.  Default: a new one.
+        :return: TranscriptLines of every engagement in the search.
         """
 
+        if lines is None:
+            lines = TranscriptLines()
+        for records in self.engagement_pages(body=body, offset=offset, limit=limit, sort=sort,
+                                             max_concurrent_requests=max_concurrent_requests, debug=debug):
+            lines.append_records(records=records)
+        return lines
+
+    def engagement_pages(self, body: dict, offset: int = 0, limit: int = 100, sort: Optional[str] = None,
+                         max_concurrent_requests: int = 5, debug: bool = False,
+                         checkpoint: Optional[str] = None, queue_size: int = 4) -> Iterator[List[dict]]:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-engagement-history-methods.html
+
+        Yields the interactionHistoryRecords of each page of the search as soon as the page is retrieved, so
+        callers can process or export large date ranges without holding every record in memory.
+
+        Pages are downloaded by max_concurrent_requests threads through a Pipeline.  At most queue_size pages wait for
+        the caller, so downloading pauses while the caller falls behind, and closing the iterator early stops it.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param offset: Specifies from which record to retrieve the chat. Default is 0.
+        :param limit: Max amount of conversations to be received in the response.  Default and max is 100.
+        :param sort: Sort the results in a predefined order.
+        :param max_concurrent_requests: Maximum concurrent requests.
+        :param debug: Shows status of requests.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  Pages already journaled are
+         read from disk first, then only the missing offsets are downloaded.  See Checkpoint.
+        :param queue_size: Max number of downloaded pages waiting for the caller.
+        :return: Iterator of lists of interactionHistoryRecords, one list per page, in completion order.
+        """
+
+        return self._engagement_pipeline(body=body, offset=offset, limit=limit, sort=sort,
+                                         max_concurrent_requests=max_concurrent_requests, debug=debug,
+                                         checkpoint=checkpoint, queue_size=queue_size)
+
+    def _engagement_pipeline(self, body: dict, offset: int, limit: int, sort: Optional[str],
+                             max_concurrent_requests: int, debug: bool, checkpoint: Optional[str], queue_size: int,
+                             raw: bool = False) -> Iterator:
+        # Yields decoded record lists, or with raw, (record count, undecoded response) of each page.  With raw, a page
+        # that cannot be downloaded raises instead of leaving a hole in the archive.
+
+        journal = Checkpoint(path=checkpoint, search={'source': 'engagements', 'body': body, 'sort': sort}) \
+            if checkpoint else None
+
         count = self.engagements(body, offset, limit, sort)['_metadata']['count']
-        # Returns an empty list
+        # Nothing to yield
         if count == 0:
-            return []
+            return
+
+        # Each page holds limit records, so offsets step by limit to leave no records between pages.
+        offsets = range(0, count, limit)
+        if journal:
+            journal.check_layout(count=count, page_size=limit)
+            # Pages completed by an earlier run are read back from disk instead of downloaded.
+            yield from journal.pages(offsets=set(offsets))
+            offsets = [o for o in offsets if o not in journal]
+
+        def fetch(b, o, l, s):
+            # Undecoded response with raw, otherwise the decoded records of the page.
+            if raw:
+                return self.engagements_content(body=b, offset=o, limit=l, sort=s)
+            return self.engagements(body=b, offset=o, limit=l, sort=s)['interactionHistoryRecords']
 
         # Inner function to process concurrent requests.
         def get_record(b, o, l, s):
             if self.bearer:
                 # If User Login is used.
-                api_data = []
+                api_data = b'' if raw else []
                 for attempt in range(1, 3):
                     try:
-                        api_data = self.engagements(body=b, offset=o, limit=l, sort=s)['interactionHistoryRecords']
+                        api_data = fetch(b, o, l, s)
                     except requests.HTTPError:
                         print('Reconnecting... [Attempt {}, Offset {}]'.format(attempt, o))
                         self.user_login(username=self.auth.username, password=self.auth.password)
                         print('Woot! We have connection!')
                         continue
                     break
+                else:
+                    if raw:
+                        raise requests.HTTPError('Offset {} could not be downloaded after logging in again.'.format(o))
                 return api_data
             else:
                 # If OAuth1 is used.
-                return self.engagements(body=b, offset=o, limit=l, sort=s)['interactionHistoryRecords']
+                return fetch(b, o, l, s)
 
-        interaction_history_records = []
-        # Multi-threading to handle multiple requests at a time.
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent_requests) as executor:
-            future_requests = {
-                executor.submit(get_record, body, offset, limit, sort): offset for offset in range(0, count, 100)
-            }
-
-            for future in concurrent.futures.as_completed(future_requests):
-                if debug:
-                    print('Record Count: {}, Offset: {} finished.'.format(count, future_requests[future]))
-                # Add data to results.
-                interaction_history_records.extend(future.result())
+        def download(page_offset: int) -> Tuple[int, Union[List[dict], bytes]]:
+            records = get_record(body, page_offset, limit, sort)
+            if debug:
+                print('Record Count: {}, Offset: {} finished.'.format(count, page_offset))
+            return page_offset, records
 
-        return interaction_history_records
+        # Multi-threading to handle multiple requests at a time, with at most queue_size pages waiting.
+        pipeline = Pipeline(stages=[(download, max_concurrent_requests)], queue_size=queue_size)
+        for page_offset, records in pipeline.run(items=offsets):
+            if raw:
+                yield page_record_count(records), records
+                continue
+            # An empty page means every login retry failed, so it is left for the next run to download.
+            if journal and records:
+                journal.write_page(offset=page_offset, records=records)
+            yield records
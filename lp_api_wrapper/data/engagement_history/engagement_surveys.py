@@ -0,0 +1,45 @@
+"""
+Provides a wide survey table for Engagement History records.
+
+Each record's surveys map a survey type, such as preChat or postChat, to a list of answered questions.  pivot_surveys
+collects every answer into a SurveyPivot with one row per engagement and survey type and one column per question name.
+
+Usage Example:
+    > records = eh_conn.all_engagements(body)
+    > pivot_surveys(records).to_pandas()
+"""
+
+from ...util.survey_pivot import SurveyPivot
+from typing import (Iterable, Optional, Sequence)
+
+
+def pivot_surveys(records: Iterable[dict], survey_types: Optional[Sequence[str]] = None,
+                  pivot: Optional[SurveyPivot] = None) -> SurveyPivot:
+    """
+    :param records: interactionHistoryRecords, such as from EngagementHistory.all_engagements or engagement_pages.
+    :param survey_types: Only include these survey types.  Example: ['postChat']  Default: every survey type.
+    :param pivot: SurveyPivot to add to, such as the result of a previous page.  Default: a new SurveyPivot.
+    :return: SurveyPivot keyed by (engagement_id, survey_type), with the value of each question name.
+    """
+
+    if pivot is None:
+        pivot = SurveyPivot(key_fields=('engagement_id', 'survey_type'))
+
+    keys, questions, answers = [], [], []
+    for record in records:
+        surveys = record.get('surveys')
+        if not surveys:
+            continue
+
+        engagement_id = record['info'].get('engagementId')
+        for survey_type, survey in surveys.items():
+            if not isinstance(survey, list) or (survey_types is not None and survey_type not in survey_types):
+                continue
+            key = (engagement_id, survey_type)
+            for item in survey:
+                keys.append(key)
+                questions.append(item.get('name'))
+                answers.append(item.get('value'))
+
+    pivot.extend(keys=keys, questions=questions, answers=answers)
+    return pivot
@@ -0,0 +1,257 @@
+"""
+Provides a Data Structure for the Interaction History Records of the Engagement History API.
+
+Engagements parses interactionHistoryRecords into typed tables, like Conversations does for Messaging Interactions:
+info, campaign, transcript_line, visitor_info, survey, customer_info and personal_info.  Every row starts with the
+engagement_id of its record, and the tables support the same indexes, columns, joins and pandas/arrow conversions.
+
+Usage Example:
+    > engagements = eh_conn.all_engagements(body, raw_data=False)
+    > engagements.lookup(table='transcript_line', field='engagement_id', value='1234')
+"""
+
+from collections import namedtuple
+from ..messaging_interactions.conversations import (FIELD_KEYS as CONVERSATION_FIELD_KEYS,
+                                                    CATEGORICAL_FIELDS as CONVERSATION_CATEGORICAL_FIELDS,
+                                                    Campaign, CustomerInfo, PersonalInfo)
+from ..record_tables import RecordTables
+from ...util.categories import Categories
+from ...util.compact_row import compact_row_type
+from ...util.survey_pivot import SurveyPivot
+from typing import (Dict, List, Optional)
+
+# Declare new types to store each section of a record.
+EngagementInfo = namedtuple(
+    typename='EngagementInfo',
+    field_names=['engagement_id', 'account_id', 'agent_deleted', 'agent_full_name', 'agent_group_id',
+                 'agent_group_name', 'agent_id', 'agent_login_name', 'agent_nick_name', 'alerted_mcs', 'channel',
+                 'chat_data_enriched', 'chat_mcs', 'chat_requested_time', 'chat_requested_time_l', 'chat_start_page',
+                 'chat_start_url', 'duration', 'end_reason', 'end_reason_desc', 'end_time', 'end_time_l', 'ended',
+                 'engagement_sequence', 'engagement_set', 'interactive', 'is_agent_survey', 'is_interactive',
+                 'is_partial', 'is_post_chat_survey', 'is_pre_chat_survey', 'mcs', 'session_id', 'skill_id',
+                 'skill_name', 'start_reason', 'start_reason_desc', 'start_time', 'start_time_l', 'visitor_id',
+                 'visitor_name']
+)
+
+EngagementCampaign = namedtuple(
+    typename='EngagementCampaign',
+    field_names=['engagement_id'] + list(Campaign._fields[1:])
+)
+
+TranscriptLine = namedtuple(
+    typename='TranscriptLine',
+    field_names=['engagement_id', 'agent_id', 'by', 'can_be_translated', 'line_seq', 'source', 'sub_type', 'text',
+                 'text_type', 'time', 'time_l']
+)
+
+VisitorInfo = namedtuple(
+    typename='VisitorInfo',
+    field_names=['engagement_id', 'browser', 'city', 'country', 'country_code', 'device', 'ip_address', 'isp',
+                 'operating_system', 'org', 'state', 'visitor_id', 'visitor_name', 'visitor_phone']
+)
+
+EngagementSurvey = namedtuple(
+    typename='EngagementSurvey',
+    field_names=['engagement_id', 'survey_type', 'display_value', 'name', 'question_id', 'survey_id', 'value']
+)
+
+EngagementCustomerInfo = namedtuple(
+    typename='EngagementCustomerInfo',
+    field_names=['engagement_id'] + list(CustomerInfo._fields[1:])
+)
+
+EngagementPersonalInfo = namedtuple(
+    typename='EngagementPersonalInfo',
+    field_names=['engagement_id'] + list(PersonalInfo._fields[1:])
+)
+
+# JSON key of each field, by table.  Parsing copies each key's value straight into its field; absent keys are None.
+FIELD_KEYS = {
+    'info': {
+        'accountId': 'account_id', 'agentDeleted': 'agent_deleted', 'agentFullName': 'agent_full_name',
+        'agentGroupId': 'agent_group_id', 'agentGroupName': 'agent_group_name', 'agentId': 'agent_id',
+        'agentLoginName': 'agent_login_name', 'agentNickName': 'agent_nick_name', 'alertedMCS': 'alerted_mcs',
+        'channel': 'channel', 'chatDataEnriched': 'chat_data_enriched', 'chatMCS': 'chat_mcs',
+        'chatRequestedTime': 'chat_requested_time', 'chatRequestedTimeL': 'chat_requested_time_l',
+        'chatStartPage': 'chat_start_page', 'chatStartUrl': 'chat_start_url', 'duration': 'duration',
+        'endReason': 'end_reason', 'endReasonDesc': 'end_reason_desc', 'endTime': 'end_time', 'endTimeL': 'end_time_l',
+        'ended': 'ended', 'engagementSequence': 'engagement_sequence', 'engagementSet': 'engagement_set',
+        'interactive': 'interactive', 'isAgentSurvey': 'is_agent_survey', 'isInteractive': 'is_interactive',
+        'isPartial': 'is_partial', 'isPostChatSurvey': 'is_post_chat_survey', 'isPreChatSurvey': 'is_pre_chat_survey',
+        'mcs': 'mcs', 'sessionId': 'session_id', 'skillId': 'skill_id', 'skillName': 'skill_name',
+        'startReason': 'start_reason', 'startReasonDesc': 'start_reason_desc', 'startTime': 'start_time',
+        'startTimeL': 'start_time_l', 'visitorId': 'visitor_id', 'visitorName': 'visitor_name'
+    },
+    'campaign': CONVERSATION_FIELD_KEYS['campaign'],
+    'transcript_line': {
+        'agentId': 'agent_id', 'by': 'by', 'canBeTranslated': 'can_be_translated', 'lineSeq': 'line_seq',
+        'source': 'source', 'subType': 'sub_type', 'text': 'text', 'textType': 'text_type', 'time': 'time',
+        'timeL': 'time_l'
+    },
+    'visitor_info': {
+        'browser': 'browser', 'city': 'city', 'country': 'country', 'countryCode': 'country_code', 'device': 'device',
+        'ipAddress': 'ip_address', 'isp': 'isp', 'operatingSystem': 'operating_system', 'org': 'org',
+        'state': 'state', 'visitorId': 'visitor_id', 'visitorName': 'visitor_name', 'visitorPhone': 'visitor_phone'
+    },
+    'survey': {
+        'displayValue': 'display_value', 'name': 'name', 'questionID': 'question_id', 'surveyID': 'survey_id',
+        'value': 'value'
+    },
+    'customer_info': CONVERSATION_FIELD_KEYS['customer_info'],
+    'personal_info': CONVERSATION_FIELD_KEYS['personal_info']
+}
+
+# Slot based alternatives to the row types, with the same fields.  See Engagements(compact_rows=True).
+CompactEngagementInfo = compact_row_type(EngagementInfo)
+CompactEngagementCampaign = compact_row_type(EngagementCampaign)
+CompactTranscriptLine = compact_row_type(TranscriptLine)
+CompactVisitorInfo = compact_row_type(VisitorInfo)
+CompactEngagementSurvey = compact_row_type(EngagementSurvey)
+CompactEngagementCustomerInfo = compact_row_type(EngagementCustomerInfo)
+CompactEngagementPersonalInfo = compact_row_type(EngagementPersonalInfo)
+
+# Maps each Engagements table attribute to the row type it stores.
+TABLES = {
+    'info': EngagementInfo,
+    'campaign': EngagementCampaign,
+    'transcript_line': TranscriptLine,
+    'visitor_info': VisitorInfo,
+    'survey': EngagementSurvey,
+    'customer_info': EngagementCustomerInfo,
+    'personal_info': EngagementPersonalInfo
+}
+
+# Maps each Engagements table attribute to its compact row type.
+COMPACT_TABLES = {
+    'info': CompactEngagementInfo,
+    'campaign': CompactEngagementCampaign,
+    'transcript_line': CompactTranscriptLine,
+    'visitor_info': CompactVisitorInfo,
+    'survey': CompactEngagementSurvey,
+    'customer_info': CompactEngagementCustomerInfo,
+    'personal_info': CompactEngagementPersonalInfo
+}
+
+# Fields whose values repeat across many rows.  Their strings are dictionary encoded while parsing.
+CATEGORICAL_FIELDS = {
+    'info': ('agent_full_name', 'agent_group_name', 'agent_login_name', 'agent_nick_name', 'channel', 'end_reason',
+             'end_reason_desc', 'skill_name', 'start_reason', 'start_reason_desc'),
+    'campaign': CONVERSATION_CATEGORICAL_FIELDS['campaign'],
+    'transcript_line': ('by', 'source', 'sub_type', 'text_type'),
+    'visitor_info': ('browser', 'city', 'country', 'country_code', 'device', 'isp', 'operating_system', 'org',
+                     'state'),
+    'survey': ('survey_type', 'name')
+}
+
+# Epoch millisecond fields and the string timestamp field holding the same time, by table.
+TIME_FIELDS = {
+    table: {field: field[:-2] for field in row_type._fields if field.endswith('_l') and field[:-2] in row_type._fields}
+    for table, row_type in TABLES.items()
+}
+
+
+class Engagements(RecordTables):
+    TABLES = TABLES
+    COMPACT_TABLES = COMPACT_TABLES
+    FIELD_KEYS = FIELD_KEYS
+    CATEGORICAL_FIELDS = CATEGORICAL_FIELDS
+    TIME_FIELDS = TIME_FIELDS
+    KEY_FIELD = 'engagement_id'
+
+    def __init__(self, categories: Optional[Dict[str, Categories]] = None, compact_rows: bool = False,
+                 drop_time_strings: bool = False) -> None:
+        """
+        :param categories: Dictionary encodings of categorical fields, keyed by field name.  Pass the categories of
+         another Engagements object to share one copy of each repeated string between them.
+        :param compact_rows: Store rows as slot based classes (COMPACT_TABLES) instead of namedtuples.
+        :param drop_time_strings: Leave the string timestamp fields in TIME_FIELDS, such as time and start_time, as None
+         when parsing.
+        """
+
+        self.info: List[EngagementInfo] = []
+        self.campaign: List[EngagementCampaign] = []
+        self.transcript_line: List[TranscriptLine] = []
+        self.visitor_info: List[VisitorInfo] = []
+        self.survey: List[EngagementSurvey] = []
+        self.customer_info: List[EngagementCustomerInfo] = []
+        self.personal_info: List[EngagementPersonalInfo] = []
+
+        super().__init__(categories=categories, compact_rows=compact_rows, drop_time_strings=drop_time_strings)
+
+    def append_records(self, records: List[dict]) -> None:
+        for record in records:
+            eid = record['info']['engagementId']
+            for section, data in record.items():
+                if not data:
+                    continue
+                if section == 'info':
+                    self.info.append(
+                        self._set_row(table='info', data=data, record_id=eid)
+                    )
+                elif section == 'campaign':
+                    self.campaign.append(
+                        self._set_row(table='campaign', data=data, record_id=eid)
+                    )
+                elif section == 'transcript':
+                    self.transcript_line.extend(
+                        self._set_rows(table='transcript_line', data=data.get('lines') or [], record_id=eid)
+                    )
+                elif section == 'visitorInfo':
+                    self.visitor_info.append(
+                        self._set_row(table='visitor_info', data=data, record_id=eid)
+                    )
+                elif section == 'surveys':
+                    self.survey.extend(
+                        self._set_surveys(survey_data=data, engagement_id=eid)
+                    )
+                elif section == 'sdes':
+                    if 'events' in data:
+                        customer_info, personal_info = self._filter_sdes(sde_data=data['events'])
+                        if customer_info:
+                            self.customer_info.extend(
+                                self._set_customer_info(customer_info_data=customer_info, record_id=eid)
+                            )
+                        if personal_info:
+                            self.personal_info.extend(
+                                self._set_personal_info(personal_info_data=personal_info, record_id=eid)
+                            )
+
+    def engagement(self, engagement_id: str) -> Dict[str, list]:
+        """
+        Returns every row related to a single engagement.
+
+        :param engagement_id: ID of the engagement.
+        :return: Dictionary of table name to the rows of that table belonging to the engagement.
+        """
+
+        return {
+            table: self.lookup(table=table, field='engagement_id', value=engagement_id) for table in TABLES
+        }
+
+    def survey_pivot(self) -> SurveyPivot:
+        """
+        Pivots the survey table into a wide table with one row per engagement and survey type and one column per
+        question name.
+
+        :return: SurveyPivot keyed by (engagement_id, survey_type).  Use its columns or to_pandas methods.
+        """
+
+        columns = self.columns(table='survey')
+        pivot = SurveyPivot(key_fields=('engagement_id', 'survey_type'))
+        pivot.extend(keys=zip(columns['engagement_id'], columns['survey_type']), questions=columns['name'],
+                     answers=columns['value'])
+        return pivot
+
+    def _set_surveys(self, survey_data: dict, engagement_id: str) -> List[EngagementSurvey]:
+        # Surveys map each survey type, such as preChat or postChat, to a list of answered questions.
+        position = EngagementSurvey._fields.index('survey_type')
+
+        surveys = []
+        for survey_type, items in survey_data.items():
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                values = self._row_values(table='survey', item=item, record_id=engagement_id)
+                values[position] = survey_type
+                surveys.append(self._make_row(table='survey', values=values))
+        return surveys
@@ -0,0 +1,191 @@
+"""
+Provides a flat, compact table of the chat transcript lines of Engagement History records.
+
+The text of every line is stored in one contiguous UTF-8 buffer, with the offset where each line starts in an int64
+array.  Engagement, source and agent are dictionary encoded into int32/int16 code arrays, and times are int64 epoch
+milliseconds, so a line costs a few dozen bytes plus its text instead of a row object and a dict.  Lines of an
+engagement are stored next to each other, so the lines of one engagement are a slice of every column.
+
+Usage Example:
+    > lines = eh_conn.transcript_lines(body)
+    > lines.engagement_lines('1234')
+    > lines.to_arrow()
+"""
+
+from array import array
+from collections import namedtuple
+from ...util.categories import Categories
+from typing import (Dict, Iterable, Iterator, List, Tuple)
+
+Line = namedtuple(
+    typename='Line',
+    field_names=['engagement_id', 'time_l', 'source', 'agent_id', 'text']
+)
+
+# Stored in place of a missing time.
+_NO_TIME = -2 ** 63
+
+
+class TranscriptLines:
+    def __init__(self) -> None:
+        # Dictionary encodings of engagement IDs, sources and agent IDs.  Missing values have the code -1.
+        self.engagements = Categories()
+        self.sources = Categories()
+        self.agents = Categories()
+
+        self.engagement_codes = array('i')
+        self.source_codes = array('h')
+        self.agent_codes = array('i')
+        self.times = array('q')
+
+        # UTF-8 text of every line, and the start offset of each line followed by the end offset of the last line.
+        self.text_buffer = bytearray()
+        self.text_offsets = array('q', [0])
+
+        # First line and line count of each engagement, by engagement code.
+        self._ranges: Dict[int, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __getitem__(self, i: int) -> Line:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('line index out of range')
+
+        source, agent, time_l = self.source_codes[i], self.agent_codes[i], self.times[i]
+        return Line(
+            self.engagements.decode(self.engagement_codes[i]),
+            None if time_l == _NO_TIME else time_l,
+            None if source == -1 else self.sources.decode(source),
+            None if agent == -1 else self.agents.decode(agent),
+            self.text(i)
+        )
+
+    def __iter__(self) -> Iterator[Line]:
+        return (self[i] for i in range(len(self)))
+
+    def text(self, i: int) -> str:
+        """
+        :param i: Line position.
+        :return: Text of the line, decoded from the text buffer.
+        """
+        return self.text_buffer[self.text_offsets[i]:self.text_offsets[i + 1]].decode()
+
+    def append_records(self, records: Iterable[dict]) -> None:
+        """
+        Appends the transcript lines of interactionHistoryRecords, such as one page from
+        EngagementHistory.engagement_pages.
+
+        :param records: interactionHistoryRecords.
+        """
+
+        for record in records:
+            transcript = record.get('transcript') or {}
+            lines = transcript.get('lines')
+            if not lines:
+                continue
+
+            engagement = self.engagements.encode(record['info']['engagementId'])
+            first = len(self.times)
+
+            for line in lines:
+                source = line.get('source')
+                agent_id = line.get('agentId')
+                time_l = line.get('timeL')
+                text = line.get('text') or ''
+
+                self.engagement_codes.append(engagement)
+                self.source_codes.append(-1 if source is None else self.sources.encode(source))
+                self.agent_codes.append(-1 if agent_id is None else self.agents.encode(agent_id))
+                self.times.append(_NO_TIME if time_l is None else time_l)
+                self.text_buffer += text.encode()
+                self.text_offsets.append(len(self.text_buffer))
+
+            start, count = self._ranges.get(engagement, (first, 0))
+            if start + count == first:
+                self._ranges[engagement] = (start, count + len(lines))
+            else:
+                # A record repeated on a later page is kept, but only its latest lines are found by engagement_lines.
+                self._ranges[engagement] = (first, len(lines))
+
+    def engagement_lines(self, engagement_id: str) -> List[Line]:
+        """
+        :param engagement_id: ID of the engagement.
+        :return: Lines of the engagement, in transcript order.
+        """
+        code = self.engagements.lookup(engagement_id)
+        if code is None or code not in self._ranges:
+            return []
+        start, count = self._ranges[code]
+        return [self[i] for i in range(start, start + count)]
+
+    def columns(self) -> Dict[str, list]:
+        """
+        :return: Dictionary of Line field name to a list of its values in line order.
+        """
+
+        def decoded(codes: array, categories: Categories) -> list:
+            values = categories.values
+            return [None if code == -1 else values[code] for code in codes]
+
+        return {
+            'engagement_id': decoded(self.engagement_codes, self.engagements),
+            'time_l': [None if time_l == _NO_TIME else time_l for time_l in self.times],
+            'source': decoded(self.source_codes, self.sources),
+            'agent_id': decoded(self.agent_codes, self.agents),
+            'text': [self.text(i) for i in range(len(self))]
+        }
+
+    def to_pandas(self):
+        """
+        :return: pandas.DataFrame with one row per line.  Requires pandas.
+        """
+
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('to_pandas requires pandas.  Install with: pip install pandas')
+
+        return pd.DataFrame(self.columns(), columns=Line._fields)
+
+    def to_arrow(self):
+        """
+        Builds a PyArrow Table directly from the buffers: text becomes a large_string column over the text buffer and
+        offsets, and encoded columns become dictionary arrays.  Requires pyarrow.
+
+        :return: pyarrow.Table with one row per line.
+        """
+
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            raise ImportError('to_arrow requires pyarrow.  Install with: pip install pyarrow')
+
+        def dictionary(codes: array, categories: Categories, index_type) -> 'pa.DictionaryArray':
+            indices = pa.array(codes, type=index_type)
+            indices = pc.if_else(pc.equal(indices, -1), None, indices)
+            return pa.DictionaryArray.from_arrays(indices, pa.array(categories.values, type=pa.string()))
+
+        times = pa.array(self.times, type=pa.int64())
+        text = pa.LargeStringArray.from_buffers(
+            len(self), pa.py_buffer(self.text_offsets), pa.py_buffer(bytes(self.text_buffer))
+        )
+
+        return pa.Table.from_arrays(
+            [dictionary(self.engagement_codes, self.engagements, pa.int32()),
+             pc.if_else(pc.equal(times, _NO_TIME), None, times),
+             dictionary(self.source_codes, self.sources, pa.int16()),
+             dictionary(self.agent_codes, self.agents, pa.int32()),
+             text],
+            names=list(Line._fields)
+        )
+
+    def nbytes(self) -> int:
+        """
+        :return: Bytes held by the column arrays and the text buffer, excluding the dictionaries.
+        """
+        arrays = (self.engagement_codes, self.source_codes, self.agent_codes, self.times, self.text_offsets)
+        return sum(column.itemsize * len(column) for column in arrays) + len(self.text_buffer)
@@ -1,2 +1,9 @@
 from ..messaging_interactions.messaging_interactions_endpoints import MessagingInteractionsEndpoints
 from ..messaging_interactions.messaging_interactions import MessagingInteractions
+from .normalized_conversations import NormalizedConversations
+from .conversations import Conversations
+from .mapped_conversations import MappedConversations
+from .windowed_aggregator import WindowedAggregator
+from .incremental_sync import IncrementalSync
+from .open_conversation_poller import (OpenConversationPoller, ConversationDelta)
+from .conversation_cache import ConversationCache
@@ -0,0 +1,244 @@
+"""
+Provides a local cache of conversation searches that is aware of time intervals.
+
+Searches are grouped by their filters, the body without start.  For each group, the cache keeps the start time
+intervals that have already been fetched, each in its own compressed newline delimited JSON file.  A new search is
+split into the sub-intervals already covered, which are read from disk, and the gaps, which are the only ranges
+downloaded.  So after searching the last 7 days, searching the last 8 days downloads one new day.
+
+Conversations keep changing for a while after they start, so only the part of a fetched interval older than settle at
+fetch time, and before the start of the earliest conversation still open, is marked as covered.  The newer part is
+returned but downloaded again by the next search that covers it, so open conversations are never served stale.
+
+A gap is written to disk only once it has been fetched in full, under a temporary name that is renamed into place, and
+only with the records of its covered part, so an interrupted fetch or an unsettled tail leaves nothing behind.  compact
+merges the files of adjacent intervals, so a cache extended by many small searches is read from few files.
+
+Usage Example:
+    > cache = mi_conn.conversation_cache(path='./mi_cache')
+    > conversations = cache.conversations(body={'start': {'from': 1491004800000, 'to': 1491609599000}})
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+from .conversations import Conversations
+from ...export.ndjson_archive import NdjsonArchive
+from ...util.json_decoder import (decode_json, encode_json)
+from typing import (Dict, List, Optional, Tuple)
+
+_HOUR_MS = 3600000
+
+
+def missing_intervals(start: int, end: int, covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    :param start: Epoch milliseconds the range starts at, inclusive.
+    :param end: Epoch milliseconds the range ends at, inclusive.
+    :param covered: Inclusive (from, to) intervals already fetched, in any order and possibly overlapping.
+    :return: Inclusive (from, to) gaps of the range not covered by any interval, in time order.
+    """
+
+    gaps = []
+    position = start
+    for interval_from, interval_to in sorted(covered):
+        if interval_to < position:
+            continue
+        if interval_from > end:
+            break
+        if interval_from > position:
+            gaps.append((position, interval_from - 1))
+        position = interval_to + 1
+        if position > end:
+            break
+
+    if position <= end:
+        gaps.append((position, end))
+    return gaps
+
+
+class ConversationCache:
+    def __init__(self, mi_conn, path: str, settle: int = _HOUR_MS) -> None:
+        """
+        :param mi_conn: MessagingInteractions connection.
+        :param path: Cache directory.  Created if missing.
+        :param settle: Milliseconds before the fetch time that are not cached, because their conversations may still
+         change.  Default: one hour.
+        """
+
+        self.mi_conn = mi_conn
+        self.path = path
+        self.settle = settle
+
+        os.makedirs(path, exist_ok=True)
+        self._index_path = os.path.join(path, 'index.json')
+
+    def _load_index(self) -> Dict[str, dict]:
+        if not os.path.exists(self._index_path):
+            return {}
+        with open(self._index_path, 'rb') as f:
+            return decode_json(f.read())
+
+    def _save_index(self, index: Dict[str, dict]) -> None:
+        temporary = '{}.tmp'.format(self._index_path)
+        with open(temporary, 'wb') as f:
+            f.write(encode_json(index))
+        os.replace(temporary, self._index_path)
+
+    @staticmethod
+    def search_key(filters: dict) -> str:
+        """
+        :param filters: Search body without start.
+        :return: Key of the filters, equal for equal filters whatever the order of their keys.
+        """
+        return hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+    def intervals(self, body: dict) -> List[Tuple[int, int]]:
+        """
+        :param body: Search body.  Only its filters are used.
+        :return: Inclusive (from, to) start time intervals cached for the filters of the body.
+        """
+        filters = {key: value for key, value in body.items() if key != 'start'}
+        entry = self._load_index().get(self.search_key(filters)) or {'intervals': []}
+        return [(interval['from'], interval['to']) for interval in entry['intervals']]
+
+    def records(self, body: dict, max_workers: int = 10, debug: bool = False) -> List[dict]:
+        """
+        Returns the conversationHistoryRecords of the search, reading covered intervals from disk and downloading only
+        the gaps.
+
+        :param body: REQUIRED Search body, as in MessagingInteractions.conversations, including start.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :return: List of conversationHistoryRecords in start time order, one per conversation.
+        """
+
+        start, end = body['start']['from'], body['start']['to']
+        filters = {key: value for key, value in body.items() if key != 'start'}
+        key = self.search_key(filters)
+
+        index = self._load_index()
+        entry = index.setdefault(key, {'filters': filters, 'intervals': []})
+        covered = [(interval['from'], interval['to']) for interval in entry['intervals']]
+
+        # Records fetched now, with the part of each gap that is still settling.
+        fetched = []
+        for gap_from, gap_to in missing_intervals(start=start, end=end, covered=covered):
+            fetched_at = int(time.time() * 1000)
+            # Coverage stops before the earliest open conversation, which is fetched again until it closes.
+            settled_to = min(gap_to, fetched_at - self.settle)
+            search = dict(filters, start={'from': gap_from, 'to': gap_to})
+
+            gap_records = []
+            for page in self.mi_conn.conversation_record_pages(body=search, max_workers=max_workers, debug=debug):
+                gap_records.extend(page)
+                for record in page:
+                    start_time = record['info'].get('startTimeL')
+                    if record['info'].get('status') == 'OPEN' and start_time is not None:
+                        settled_to = min(settled_to, start_time - 1)
+            fetched.extend(gap_records)
+
+            if settled_to >= gap_from:
+                file_name = os.path.join(key, '{}-{}-{}.ndjson.gz'.format(gap_from, settled_to, fetched_at))
+                settled = []
+                for record in gap_records:
+                    start_time = record['info'].get('startTimeL')
+                    if start_time is not None and gap_from <= start_time <= settled_to:
+                        settled.append(record)
+                self._write(file_name, settled)
+                entry['intervals'].append({'from': gap_from, 'to': settled_to, 'file': file_name})
+                self._save_index(index)
+
+        # Covered intervals are read from disk, keeping only records that started inside both the interval and the
+        # search.  Records fetched now replace cached ones of the same conversation.
+        by_id: Dict[str, dict] = {}
+        for interval in entry['intervals'][:len(covered)]:
+            low, high = max(start, interval['from']), min(end, interval['to'])
+            if low > high:
+                continue
+            for record in self._read(interval['file']):
+                start_time = record['info'].get('startTimeL')
+                if start_time is not None and low <= start_time <= high:
+                    by_id[record['info']['conversationId']] = record
+
+        for record in fetched:
+            start_time = record['info'].get('startTimeL')
+            if start_time is None or start <= start_time <= end:
+                by_id[record['info']['conversationId']] = record
+
+        return sorted(by_id.values(), key=lambda record: record['info'].get('startTimeL') or 0)
+
+    def conversations(self, body: dict, max_workers: int = 10, debug: bool = False,
+                      drop_time_strings: bool = False) -> Optional[Conversations]:
+        """
+        Same as records, but parses the records into a Conversations object.
+
+        :param drop_time_strings: Skip the string timestamps that duplicate the *_time_l fields.  See Conversations.
+        :return: Conversations of the search, or None if there are none.
+        """
+
+        records = self.records(body=body, max_workers=max_workers, debug=debug)
+        if not records:
+            return None
+
+        conversations = Conversations(drop_time_strings=drop_time_strings)
+        conversations.append_records(records=records)
+        return conversations
+
+    def compact(self) -> None:
+        """
+        Merges the files of adjacent cached intervals of every search into one file per run of adjacent intervals.
+        """
+
+        index = self._load_index()
+        for key, entry in index.items():
+            merged = []
+            for interval in sorted(entry['intervals'], key=lambda interval: interval['from']):
+                if merged and merged[-1][-1]['to'] + 1 == interval['from']:
+                    merged[-1].append(interval)
+                else:
+                    merged.append([interval])
+
+            intervals = []
+            for run in merged:
+                if len(run) == 1:
+                    intervals.append(run[0])
+                    continue
+
+                file_name = os.path.join(key, '{}-{}-{}.ndjson.gz'.format(
+                    run[0]['from'], run[-1]['to'], int(time.time() * 1000)))
+                self._write(file_name, [record for interval in run for record in self._read(interval['file'])])
+                intervals.append({'from': run[0]['from'], 'to': run[-1]['to'], 'file': file_name})
+
+            superseded = [interval['file'] for interval in entry['intervals'] if interval not in intervals]
+            entry['intervals'] = intervals
+            self._save_index(index)
+            for file_name in superseded:
+                os.remove(os.path.join(self.path, file_name))
+
+    def _write(self, file_name: str, records: List[dict]) -> None:
+        # Writes records under a temporary name and renames the file into place once it is complete.
+        path = os.path.join(self.path, file_name)
+        temporary = '{}.tmp'.format(path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            with NdjsonArchive(path=temporary) as archive:
+                archive.write_records(records)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _read(self, file_name: str) -> List[dict]:
+        with gzip.open(os.path.join(self.path, file_name), 'rb') as f:
+            return [decode_json(line) for line in f]
+
+    def clear(self) -> None:
+        """
+        Deletes every cached interval.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path, exist_ok=True)
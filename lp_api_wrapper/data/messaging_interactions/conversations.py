@@ -2,8 +2,18 @@
 Provides a Data Structure for a Conversation History Record from the Messaging Interactions API.
 """
 
+import json
+import os
+import sys
 from collections import namedtuple
-from typing import List
+from operator import attrgetter
+from ...util.categories import Categories
+from ...util.columnar_file import write_column
+from ..record_tables import RecordTables
+from ...util.compact_row import compact_row_type
+from .message_context import (CONTEXT_CATEGORICAL_FIELDS, CompactMessageContext, MessageContext, compact_context,
+                              parse_context)
+from typing import (Dict, List, Optional, Tuple)
 
 # Declare new types to store each event from data.
 Info = namedtuple(
@@ -103,8 +113,213 @@ PersonalInfo = namedtuple(
 )
 
 
-class Conversations:
-    def __init__(self) -> None:
+def _message_text(message_data: dict) -> Optional[str]:
+    if 'msg' in message_data and message_data['msg'] and 'text' in message_data['msg']:
+        return message_data['msg']['text']
+    return None
+
+
+# JSON key of each field, by table.  Parsing copies each key's value straight into its field; absent keys are None.
+FIELD_KEYS = {
+    'info': {
+        'agentDeleted': 'agent_deleted', 'alertedMCS': 'alerted_mcs', 'brandId': 'brand_id', 'browser': 'browser',
+        'closeReason': 'close_reason', 'closeReasonDescription': 'close_reason_description', 'csat': 'csat',
+        'csatRate': 'csat_rate', 'device': 'device', 'duration': 'duration', 'endTime': 'end_time',
+        'endTimeL': 'end_time_l', 'firstConversation': 'first_conversation', 'isPartial': 'is_partial',
+        'latestAgentFullName': 'latest_agent_full_name', 'latestAgentGroupId': 'latest_agent_group_id',
+        'latestAgentGroupName': 'latest_agent_group_name', 'latestAgentId': 'latest_agent_id',
+        'latestAgentLoginName': 'latest_agent_login_name', 'latestAgentNickname': 'latest_agent_nickname',
+        'latestQueueState': 'latest_queue_state', 'latestSkillId': 'latest_skill_id',
+        'latestSkillName': 'latest_skill_name', 'mcs': 'mcs', 'operatingSystem': 'operating_system', 'source': 'source',
+        'startTime': 'start_time', 'startTimeL': 'start_time_l', 'status': 'status'
+    },
+    'campaign': {
+        'behaviorSystemDefault': 'behavior_system_default', 'campaignEngagementId': 'campaign_engagement_id',
+        'campaignEngagementName': 'campaign_engagement_name', 'campaignId': 'campaign_id',
+        'campaignName': 'campaign_name', 'engagementAgentNote': 'engagement_agent_note',
+        'engagementApplicationId': 'engagement_application_id',
+        'engagementApplicationName': 'engagement_application_name',
+        'engagementApplicationTypeId': 'engagement_application_type_id',
+        'engagementApplicationTypeName': 'engagement_application_type_name', 'engagementSource': 'engagement_source',
+        'goalId': 'goal_id', 'goalName': 'goal_name', 'lobId': 'lob_id', 'lobName': 'lob_name',
+        'LocationId': 'location_id', 'LocationName': 'location_name', 'profileSystemDefault': 'profile_system_default',
+        'visitorBehaviorId': 'visitor_behavior_id', 'visitorBehaviorName': 'visitor_behavior_name',
+        'visitorProfileId': 'visitor_profile_id', 'visitorProfileName': 'visitor_profile_name'
+    },
+    'message_record': {
+        'contextData': 'context_data', 'device': 'device', 'dialogId': 'dialog_id', 'messageData': 'message_data',
+        'messageId': 'message_id', 'participantId': 'participant_id', 'sentBy': 'sent_by', 'seq': 'seq',
+        'source': 'source', 'time': 'time', 'timeL': 'time_l', 'type': 'type'
+    },
+    'agent_participant': {
+        'agentDeleted': 'agent_deleted', 'agentFullName': 'agent_full_name', 'agentGroupId': 'agent_group_id',
+        'agentGroupName': 'agent_group_name', 'agentId': 'agent_id', 'agentLoginName': 'agent_login_name',
+        'agentNickname': 'agent_nickname', 'agentPid': 'agent_pid', 'permission': 'permission', 'role': 'role',
+        'time': 'time', 'timeL': 'time_l', 'userType': 'user_type', 'userTypeName': 'user_type_name'
+    },
+    'consumer_participant': {
+        'avatarURL': 'avatar_url', 'consumerName': 'consumer_name', 'email': 'email', 'firstName': 'first_name',
+        'lastName': 'last_name', 'participantId': 'participant_id', 'phone': 'phone', 'time': 'time', 'timeL': 'time_l',
+        'token': 'token'
+    },
+    'transfer': {
+        'assignedAgentFullName': 'assigned_agent_full_name', 'assignedAgentId': 'assigned_agent_id',
+        'assignedAgentLoginName': 'assigned_agent_login_name', 'assignedAgentNickname': 'assigned_agent_nickname',
+        'by': 'by', 'contextData': 'context_data', 'reason': 'reason', 'sourceAgentFullName': 'source_agent_full_name',
+        'sourceAgentId': 'source_agent_id', 'sourceAgentLoginName': 'source_agent_login_name',
+        'sourceAgentNickname': 'source_agent_nickname', 'sourceSkillId': 'source_skill_id',
+        'sourceSkillName': 'source_skill_name', 'targetSkillId': 'target_skill_id',
+        'targetSkillName': 'target_skill_name', 'time': 'time', 'timeL': 'time_l'
+    },
+    'interaction': {
+        'assignedAgentId': 'assigned_agent_id', 'assignedAgentLoginName': 'assigned_agent_login_name',
+        'agentLoginName': 'assigned_agent_login_name', 'assignedAgentNickname': 'assigned_agent_nickname',
+        'agentNickname': 'assigned_agent_nickname', 'assignedAgentFullName': 'assigned_agent_full_name',
+        'agentFullName': 'assigned_agent_full_name', 'interactionTime': 'interaction_time',
+        'interactionTimeL': 'interaction_time_l', 'interactiveSequence': 'interactive_sequence'
+    },
+    'message_score': {
+        'mcs': 'mcs', 'messageId': 'message_id', 'messageRawScore': 'message_raw_score', 'time': 'time',
+        'timeL': 'time_l'
+    },
+    'message_status': {
+        'messageDeliveryStatus': 'message_delivery_status', 'messageId': 'message_id',
+        'participantId': 'participant_id', 'participantType': 'participant_type', 'seq': 'seq', 'time': 'time',
+        'timeL': 'time_l'
+    },
+    'cobrowse_session': {
+        'agentId': 'agent_id', 'capabilities': 'capabilities', 'duration': 'duration', 'endReason': 'end_reason',
+        'endTime': 'end_time', 'endTimeL': 'end_time_l', 'interactiveTime': 'interactive_time',
+        'interactiveTimeL': 'interactive_time_l', 'isInteractive': 'is_interactive', 'sessionId': 'session_id',
+        'startTime': 'start_time', 'startTimeL': 'start_time_l', 'type': 'type'
+    },
+    'summary': {
+        'lastUpdatedTime': 'last_updated_time', 'text': 'text'
+    },
+    'customer_info': {
+        'accountName': 'account_name', 'balance': 'balance', 'companyBranch': 'company_branch',
+        'companySize': 'company_size', 'customerId': 'customer_id', 'customerStatus': 'customer_status',
+        'customerType': 'customer_type', 'imei': 'imei', 'loginStatus': 'login_status', 'role': 'role',
+        'socialId': 'social_id', 'storeNumber': 'store_number', 'storeZipCode': 'store_zip_code',
+        'userName': 'user_name'
+    },
+    'personal_info': {
+        'company': 'company', 'customerAge': 'customer_age', 'gender': 'gender', 'language': 'language',
+        'name': 'name', 'surname': 'surname'
+    }
+}
+FIELD_KEYS['agent_participant_active'] = FIELD_KEYS['agent_participant']
+
+# Functions applied to the value of a JSON key before it is stored, by table.
+FIELD_TRANSFORMS = {
+    'message_record': {'contextData': compact_context, 'messageData': _message_text}
+}
+
+# Slot based alternatives to the row types, with the same fields.  See Conversations(compact_rows=True).
+CompactInfo = compact_row_type(Info)
+CompactCampaign = compact_row_type(Campaign)
+CompactMessageRecord = compact_row_type(MessageRecord)
+CompactAgentParticipant = compact_row_type(AgentParticipant)
+CompactConsumerParticipant = compact_row_type(ConsumerParticipant)
+CompactTransfer = compact_row_type(Transfer)
+CompactInteraction = compact_row_type(Interaction)
+CompactMessageScore = compact_row_type(MessageScore)
+CompactMessageStatus = compact_row_type(MessageStatus)
+CompactSurvey = compact_row_type(Survey)
+CompactCoBrowseSession = compact_row_type(CoBrowseSession)
+CompactSummary = compact_row_type(Summary)
+CompactCustomerInfo = compact_row_type(CustomerInfo)
+CompactPersonalInfo = compact_row_type(PersonalInfo)
+
+# Maps each Conversations table attribute to the row type it stores.
+TABLES = {
+    'info': Info,
+    'campaign': Campaign,
+    'message_record': MessageRecord,
+    'agent_participant': AgentParticipant,
+    'agent_participant_active': AgentParticipant,
+    'consumer_participant': ConsumerParticipant,
+    'transfer': Transfer,
+    'interaction': Interaction,
+    'message_score': MessageScore,
+    'message_status': MessageStatus,
+    'survey': Survey,
+    'cobrowse_session': CoBrowseSession,
+    'summary': Summary,
+    'customer_info': CustomerInfo,
+    'personal_info': PersonalInfo
+}
+
+# Maps each Conversations table attribute to its compact row type.
+COMPACT_TABLES = {
+    'info': CompactInfo,
+    'campaign': CompactCampaign,
+    'message_record': CompactMessageRecord,
+    'agent_participant': CompactAgentParticipant,
+    'agent_participant_active': CompactAgentParticipant,
+    'consumer_participant': CompactConsumerParticipant,
+    'transfer': CompactTransfer,
+    'interaction': CompactInteraction,
+    'message_score': CompactMessageScore,
+    'message_status': CompactMessageStatus,
+    'survey': CompactSurvey,
+    'cobrowse_session': CompactCoBrowseSession,
+    'summary': CompactSummary,
+    'customer_info': CompactCustomerInfo,
+    'personal_info': CompactPersonalInfo
+}
+
+# Fields whose values repeat across many rows.  Their strings are dictionary encoded while parsing, so rows share one
+# string object per distinct value.
+CATEGORICAL_FIELDS = {
+    'info': ('browser', 'close_reason', 'close_reason_description', 'device', 'latest_agent_full_name',
+             'latest_agent_group_name', 'latest_agent_login_name', 'latest_agent_nickname', 'latest_queue_state',
+             'latest_skill_name', 'operating_system', 'source', 'status'),
+    'campaign': ('campaign_engagement_name', 'campaign_name', 'engagement_application_name',
+                 'engagement_application_type_name', 'engagement_source', 'goal_name', 'lob_name', 'location_name',
+                 'visitor_behavior_name', 'visitor_profile_name'),
+    'message_record': ('device', 'sent_by', 'source', 'type'),
+    'agent_participant': ('agent_full_name', 'agent_group_name', 'agent_login_name', 'agent_nickname', 'permission',
+                          'role', 'user_type', 'user_type_name'),
+    'agent_participant_active': ('agent_full_name', 'agent_group_name', 'agent_login_name', 'agent_nickname',
+                                 'permission', 'role', 'user_type', 'user_type_name'),
+    'transfer': ('assigned_agent_full_name', 'assigned_agent_login_name', 'assigned_agent_nickname', 'by', 'reason',
+                 'source_agent_full_name', 'source_agent_login_name', 'source_agent_nickname', 'source_skill_name',
+                 'target_skill_name'),
+    'interaction': ('assigned_agent_login_name', 'assigned_agent_nickname', 'assigned_agent_full_name'),
+    'message_status': ('message_delivery_status', 'participant_type'),
+    'survey': ('survey_question', 'survey_status', 'survey_type'),
+    'cobrowse_session': ('end_reason', 'type')
+}
+
+# Epoch millisecond fields and the string timestamp field holding the same time, by table.  See
+# Conversations.datetimes and Conversations(drop_time_strings=True).
+TIME_FIELDS = {
+    table: {field: field[:-2] for field in row_type._fields if field.endswith('_l') and field[:-2] in row_type._fields}
+    for table, row_type in TABLES.items()
+}
+
+
+class Conversations(RecordTables):
+    TABLES = TABLES
+    COMPACT_TABLES = COMPACT_TABLES
+    FIELD_KEYS = FIELD_KEYS
+    FIELD_TRANSFORMS = FIELD_TRANSFORMS
+    CATEGORICAL_FIELDS = CATEGORICAL_FIELDS
+    TIME_FIELDS = TIME_FIELDS
+    KEY_FIELD = 'conversation_id'
+
+    def __init__(self, categories: Optional[Dict[str, Categories]] = None, compact_rows: bool = False,
+                 drop_time_strings: bool = False) -> None:
+        """
+        :param categories: Dictionary encodings of categorical fields, keyed by field name.  Pass the categories of
+         another Conversations object to share one copy of each repeated string between them.
+        :param compact_rows: Store rows as slot based classes (COMPACT_TABLES) instead of namedtuples.  Compact rows
+         have the same fields and support the same attribute, iteration and _fields/_make/_asdict/_replace interface.
+        :param drop_time_strings: Leave the string timestamp fields in TIME_FIELDS, such as time and start_time, as None
+         when parsing.  The same times remain available from the *_time_l fields and datetimes.
+        """
+
         self.info: List[Info] = []
         self.campaign: List[Campaign] = []
         self.message_record: List[MessageRecord] = []
@@ -121,49 +336,242 @@ class Conversations:
         self.customer_info: List[CustomerInfo] = []
         self.personal_info: List[PersonalInfo] = []
 
+        super().__init__(categories=categories, compact_rows=compact_rows, drop_time_strings=drop_time_strings)
+
+        # Lazily parsed message_context rows and the message_record row count they cover.
+        self._message_context: Tuple[List[MessageContext], int] = ([], 0)
+
+        # Lazily built full-text index of message_record.  See transcript_index.
+        self._transcript_index = None
+
+    def normalize(self):
+        """
+        Returns a NormalizedConversations with agents, agent_groups and skills dimension tables, and info,
+        agent_participant, transfer and interaction fact tables that hold only IDs.  Every other table is carried
+        through unchanged.  To avoid holding both forms in memory, normalize while parsing instead, with
+        MessagingInteractions.conversations(normalize=True).
+
+        :return: NormalizedConversations
+        """
+        from .normalized_conversations import NormalizedConversations
+
+        normalized = NormalizedConversations()
+        normalized.append(conversations=self)
+        return normalized
+
+    def save(self, path: str) -> None:
+        """
+        Saves every table in a columnar binary format that Conversations.open memory-maps.
+
+        Each table is a directory under path with files for each column: numbers as fixed width arrays, strings as one
+        UTF-8 buffer with offsets, categorical fields as integer codes with their distinct values.  manifest.json is
+        written last and describes every column.
+
+        :param path: Directory to write.  Created if it does not exist.
+        """
+
+        os.makedirs(path, exist_ok=True)
+        manifest = {'format': 'lp_api_wrapper.conversations', 'version': 1, 'byteorder': sys.byteorder, 'tables': {}}
+
+        for table, row_type in TABLES.items():
+            rows = self._table(table)
+            directory = os.path.join(path, table)
+            os.makedirs(directory, exist_ok=True)
+            categorical = CATEGORICAL_FIELDS.get(table, ())
+
+            # Columns are written one at a time, so at most one extra column is held in memory.
+            manifest['tables'][table] = {
+                'rows': len(rows),
+                'columns': {
+                    field: write_column(directory=directory, field=field, values=list(map(attrgetter(field), rows)),
+                                        categorical=field in categorical)
+                    for field in row_type._fields
+                }
+            }
+
+        with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def open(cls, path: str, compact_rows: bool = False):
+        """
+        Opens Conversations written by save without reading them.
+
+        Columns are memory-mapped when first used, so opening is near instant and only the columns that are touched
+        are paged in from disk.  columns, index, join, codes, to_pandas and to_arrow read the mapped columns directly;
+        a table's rows are only built when its attribute, such as conversations.info, is accessed.  Close the result,
+        or use it in a with block, to release the mapped files.
+
+        :param path: Directory written by save.
+        :param compact_rows: Build rows as slot based classes (COMPACT_TABLES) instead of namedtuples.
+        :return: MappedConversations
+        """
+        from .mapped_conversations import MappedConversations
+
+        return MappedConversations(path=path, compact_rows=compact_rows)
+
+    def kpis(self, by: Tuple[str, ...] = ('agent',)) -> list:
+        """
+        Computes handle time, CSAT, MCS distribution, message score, transfer rate and first response time per group
+        with vectorized group by operations.  See kpis.conversation_kpis.  Requires numpy.
+
+        :param by: Any of 'agent', 'skill' and 'hour'.  Example: ('skill', 'hour')
+        :return: List of namedtuples with the group fields followed by the KPI fields, one per group.
+        """
+        from .kpis import conversation_kpis
+
+        return conversation_kpis(conversations=self, by=by)
+
+    def message_context(self) -> List[MessageContext]:
+        """
+        Returns the contextData of every message as structured rows: bot intents, action reasons, external IDs and
+        other metadata items.  message_record keeps contextData as a compact JSON string, which is only parsed here.
+        Rows are parsed on first use and extended with any messages appended since.
+
+        :return: List of MessageContext rows, one per metadata item or bot intent, in message_record order.
+        """
+
+        columns = self.columns(table='message_record')
+        context_data = columns['context_data']
+        rows, parsed_count = self._message_context
+
+        # Rebuild if messages were removed since the rows were parsed.
+        if parsed_count > len(context_data):
+            rows, parsed_count = [], 0
+
+        row_type = CompactMessageContext if self.compact_rows else MessageContext
+        fields = MessageContext._fields
+        categoricals = [(fields.index(field), self._categories(field=field)) for field in CONTEXT_CATEGORICAL_FIELDS]
+
+        def make(values: list) -> MessageContext:
+            for position, categories in categoricals:
+                value = values[position]
+                if value.__class__ is str:
+                    values[position] = categories.intern(value)
+            return row_type._make(values)
+
+        conversation_ids, message_ids, seqs = columns['conversation_id'], columns['message_id'], columns['seq']
+        for i in range(parsed_count, len(context_data)):
+            if context_data[i]:
+                rows.extend(parse_context(conversation_id=conversation_ids[i], message_id=message_ids[i], seq=seqs[i],
+                                          context_data=context_data[i], make=make))
+
+        self._message_context = (rows, len(context_data))
+        return rows
+
+    def transcript_index(self):
+        """
+        Returns an inverted full-text index of the message text in message_record, supporting term, phrase and prefix
+        queries that return matching conversation IDs.  The index is built on first use and extended with any
+        messages appended since.
+
+        :return: TranscriptIndex
+        """
+        from .transcript_index import TranscriptIndex
+
+        if self._transcript_index is None:
+            self._transcript_index = TranscriptIndex(conversations=self)
+        self._transcript_index.update()
+        return self._transcript_index
+
+    def conversation(self, conversation_id: str) -> Dict[str, list]:
+        """
+        Returns every row related to a single conversation.
+
+        :param conversation_id: ID of the conversation.
+        :return: Dictionary of table name to the rows of that table belonging to the conversation.
+        """
+
+        return {
+            table: self.lookup(table=table, field='conversation_id', value=conversation_id) for table in TABLES
+        }
+
+    def survey_pivot(self):
+        """
+        Pivots the survey table into a wide table with one row per conversation and survey type and one column per
+        question, built in one pass over the survey columns.
+
+        :return: SurveyPivot keyed by (conversation_id, survey_type).  Use its columns or to_pandas methods.
+        """
+        from ...util.survey_pivot import SurveyPivot
+
+        columns = self.columns(table='survey')
+        pivot = SurveyPivot(key_fields=('conversation_id', 'survey_type'))
+        pivot.extend(keys=zip(columns['conversation_id'], columns['survey_type']), questions=columns['survey_question'],
+                     answers=columns['survey_answer'])
+        return pivot
+
+    def timeline(self, conversation_id: str, tables: Optional[Tuple[str, ...]] = None) -> list:
+        """
+        Returns the events of a conversation in time order, merging its agent_participant, interaction, transfer,
+        message_record and message_status rows.  Rows are found through per conversation indexes and each table's
+        rows are combined with a k-way merge.  See timeline.conversation_timeline.
+
+        :param conversation_id: ID of the conversation.
+        :param tables: Tables to merge.  Default: all of timeline.TIMELINE_TABLES
+        :return: List of TimelineEvent(time_l, table, row).
+        """
+        from .timeline import (TIMELINE_TABLES, conversation_timeline)
+
+        return conversation_timeline(conversations=self, conversation_id=conversation_id,
+                                     tables=tables or TIMELINE_TABLES)
+
+    def timelines(self, conversation_ids: Optional[List[str]] = None, tables: Optional[Tuple[str, ...]] = None):
+        """
+        Returns the timeline of many conversations, one conversation at a time.
+
+        :param conversation_ids: IDs of the conversations.  Default: every conversation in info.
+        :param tables: Tables to merge.  Default: all of timeline.TIMELINE_TABLES
+        :return: Iterator of (conversation_id, list of TimelineEvent).
+        """
+        from .timeline import (TIMELINE_TABLES, conversation_timelines)
+
+        return conversation_timelines(conversations=self, conversation_ids=conversation_ids,
+                                      tables=tables or TIMELINE_TABLES)
+
     def append_records(self, records: List[dict]) -> None:
         for record in records:
             cid = record['info']['conversationId']
             for event, data in record.items():
                 if event == 'info':
                     self.info.append(
-                        self._set_info(info_data=data, conversation_id=cid)
+                        self._set_row(table='info', data=data, record_id=cid)
                     )
                 elif event == 'campaign':
                     self.campaign.append(
-                        self._set_campaign(campaign_data=data, conversation_id=cid)
+                        self._set_row(table='campaign', data=data, record_id=cid)
                     )
                 elif event == 'messageRecords':
                     self.message_record.extend(
-                        self._set_message_records(message_record_data=data, conversation_id=cid)
+                        self._set_rows(table='message_record', data=data, record_id=cid)
                     )
                 elif event == 'agentParticipants':
                     self.agent_participant.extend(
-                        self._set_agent_participants(agent_participant_data=data, conversation_id=cid)
+                        self._set_rows(table='agent_participant', data=data, record_id=cid)
                     )
                 elif event == 'agentParticipantsActive':
                     self.agent_participant_active.extend(
-                        self._set_agent_participants(agent_participant_data=data, conversation_id=cid)
+                        self._set_rows(table='agent_participant_active', data=data, record_id=cid)
                     )
                 elif event == 'consumerParticipants':
                     self.consumer_participant.extend(
-                        self._set_consumer_participants(consumer_participant_data=data, conversation_id=cid)
+                        self._set_rows(table='consumer_participant', data=data, record_id=cid)
                     )
                 elif event == 'transfers':
                     self.transfer.extend(
-                        self._set_transfers(transfer_data=data, conversation_id=cid)
+                        self._set_rows(table='transfer', data=data, record_id=cid)
                     )
                 elif event == 'interactions':
                     self.interaction.extend(
-                        self._set_interactions(interaction_data=data, conversation_id=cid)
+                        self._set_rows(table='interaction', data=data, record_id=cid)
                     )
                 elif event == 'messageScores':
                     self.message_score.extend(
-                        self._set_message_scores(message_score_data=data, conversation_id=cid)
+                        self._set_rows(table='message_score', data=data, record_id=cid)
                     )
                 elif event == 'messageStatuses':
                     self.message_status.extend(
-                        self._set_message_statuses(message_status_data=data, conversation_id=cid)
+                        self._set_rows(table='message_status', data=data, record_id=cid)
                     )
                 elif event == 'conversationSurveys':
                     self.survey.extend(
@@ -171,540 +579,27 @@ class Conversations:
                     )
                 elif event == 'coBrowseSessions':
                     self.cobrowse_session.extend(
-                        self._set_cobrowse_sessions(cobrowse_session_data=data, conversation_id=cid)
+                        self._set_rows(table='cobrowse_session', data=data, record_id=cid)
                     )
                 elif event == 'summary':
                     self.summary.append(
-                        self._set_summary(summary_data=data, conversation_id=cid)
+                        self._set_row(table='summary', data=data, record_id=cid)
                     )
                 elif event == 'sdes':
                     if 'events' in data:
                         customer_info, personal_info = self._filter_sdes(sde_data=data['events'])
                         if customer_info:
                             self.customer_info.extend(
-                                self._set_customer_info(customer_info_data=customer_info, conversation_id=cid)
+                                self._set_customer_info(customer_info_data=customer_info, record_id=cid)
                             )
                         if personal_info:
                             self.personal_info.extend(
-                                self._set_personal_info(personal_info_data=personal_info, conversation_id=cid)
+                                self._set_personal_info(personal_info_data=personal_info, record_id=cid)
                             )
 
-    @staticmethod
-    def _set_info(info_data: dict, conversation_id: str) -> Info:
-
-        agent_deleted = None
-        alerted_mcs = None
-        brand_id = None
-        browser = None
-        close_reason = None
-        close_reason_description = None
-        csat = None
-        csat_rate = None
-        device = None
-        duration = None
-        end_time = None
-        end_time_l = None
-        first_conversation = None
-        is_partial = None
-        latest_agent_full_name = None
-        latest_agent_group_id = None
-        latest_agent_group_name = None
-        latest_agent_id = None
-        latest_agent_login_name = None
-        latest_agent_nickname = None
-        latest_queue_state = None
-        latest_skill_id = None
-        latest_skill_name = None
-        mcs = None
-        operating_system = None
-        source = None
-        start_time = None
-        start_time_l = None
-        status = None
-
-        for key, value in info_data.items():
-            if key == 'agentDeleted':
-                agent_deleted = value
-            elif key == 'alertedMCS':
-                alerted_mcs = value
-            elif key == 'brandId':
-                brand_id = value
-            elif key == 'browser':
-                browser = value
-            elif key == 'closeReason':
-                close_reason = value
-            elif key == 'closeReasonDescription':
-                close_reason_description = value
-            elif key == 'csat':
-                csat = value
-            elif key == 'csatRate':
-                csat_rate = value
-            elif key == 'device':
-                device = value
-            elif key == 'duration':
-                duration = value
-            elif key == 'endTime':
-                end_time = value
-            elif key == 'endTimeL':
-                end_time_l = value
-            elif key == 'firstConversation':
-                first_conversation = value
-            elif key == 'isPartial':
-                is_partial = value
-            elif key == 'latestAgentFullName':
-                latest_agent_full_name = value
-            elif key == 'latestAgentGroupId':
-                latest_agent_group_id = value
-            elif key == 'latestAgentGroupName':
-                latest_agent_group_name = value
-            elif key == 'latestAgentId':
-                latest_agent_id = value
-            elif key == 'latestAgentLoginName':
-                latest_agent_login_name = value
-            elif key == 'latestAgentNickname':
-                latest_agent_nickname = value
-            elif key == 'latestQueueState':
-                latest_queue_state = value
-            elif key == 'latestSkillId':
-                latest_skill_id = value
-            elif key == 'latestSkillName':
-                latest_skill_name = value
-            elif key == 'mcs':
-                mcs = value
-            elif key == 'operatingSystem':
-                operating_system = value
-            elif key == 'source':
-                source = value
-            elif key == 'startTime':
-                start_time = value
-            elif key == 'startTimeL':
-                start_time_l = value
-            elif key == 'status':
-                status = value
-
-        return Info(conversation_id=conversation_id, agent_deleted=agent_deleted, alerted_mcs=alerted_mcs,
-                    brand_id=brand_id, browser=browser, close_reason=close_reason,
-                    close_reason_description=close_reason_description, csat=csat, csat_rate=csat_rate,
-                    device=device, duration=duration, end_time=end_time, end_time_l=end_time_l,
-                    first_conversation=first_conversation, is_partial=is_partial,
-                    latest_agent_full_name=latest_agent_full_name, latest_agent_group_id=latest_agent_group_id,
-                    latest_agent_group_name=latest_agent_group_name, latest_agent_id=latest_agent_id,
-                    latest_agent_login_name=latest_agent_login_name, latest_agent_nickname=latest_agent_nickname,
-                    latest_queue_state=latest_queue_state, latest_skill_id=latest_skill_id,
-                    latest_skill_name=latest_skill_name, mcs=mcs, operating_system=operating_system, source=source,
-                    start_time=start_time, start_time_l=start_time_l, status=status)
-
-    @staticmethod
-    def _set_campaign(campaign_data: dict, conversation_id: str) -> Campaign:
-
-        behavior_system_default = None
-        campaign_engagement_id = None
-        campaign_engagement_name = None
-        campaign_id = None
-        campaign_name = None
-        engagement_agent_note = None
-        engagement_application_id = None
-        engagement_application_name = None
-        engagement_application_type_id = None
-        engagement_application_type_name = None
-        engagement_source = None
-        goal_id = None
-        goal_name = None
-        lob_id = None
-        lob_name = None
-        location_id = None
-        location_name = None
-        profile_system_default = None
-        visitor_behavior_id = None
-        visitor_behavior_name = None
-        visitor_profile_id = None
-        visitor_profile_name = None
-
-        for key, value in campaign_data.items():
-            if key == 'behaviorSystemDefault':
-                behavior_system_default = value
-            elif key == 'campaignEngagementId':
-                campaign_engagement_id = value
-            elif key == 'campaignEngagementName':
-                campaign_engagement_name = value
-            elif key == 'campaignId':
-                campaign_id = value
-            elif key == 'campaignName':
-                campaign_name = value
-            elif key == 'engagementAgentNote':
-                engagement_agent_note = value
-            elif key == 'engagementApplicationId':
-                engagement_application_id = value
-            elif key == 'engagementApplicationName':
-                engagement_application_name = value
-            elif key == 'engagementApplicationTypeId':
-                engagement_application_type_id = value
-            elif key == 'engagementApplicationTypeName':
-                engagement_application_type_name = value
-            elif key == 'engagementSource':
-                engagement_source = value
-            elif key == 'goalId':
-                goal_id = value
-            elif key == 'goalName':
-                goal_name = value
-            elif key == 'lobId':
-                lob_id = value
-            elif key == 'lobName':
-                lob_name = value
-            elif key == 'LocationId':
-                location_id = value
-            elif key == 'LocationName':
-                location_name = value
-            elif key == 'profileSystemDefault':
-                profile_system_default = value
-            elif key == 'visitorBehaviorId':
-                visitor_behavior_id = value
-            elif key == 'visitorBehaviorName':
-                visitor_behavior_name = value
-            elif key == 'visitorProfileId':
-                visitor_profile_id = value
-            elif key == 'visitorProfileName':
-                visitor_profile_name = value
-
-        return Campaign(conversation_id=conversation_id, behavior_system_default=behavior_system_default,
-                        campaign_engagement_id=campaign_engagement_id,
-                        campaign_engagement_name=campaign_engagement_name, campaign_id=campaign_id,
-                        campaign_name=campaign_name, engagement_agent_note=engagement_agent_note,
-                        engagement_application_id=engagement_application_id,
-                        engagement_application_name=engagement_application_name,
-                        engagement_application_type_id=engagement_application_type_id,
-                        engagement_application_type_name=engagement_application_type_name,
-                        engagement_source=engagement_source, goal_id=goal_id, goal_name=goal_name, lob_id=lob_id,
-                        lob_name=lob_name, location_id=location_id, location_name=location_name,
-                        profile_system_default=profile_system_default, visitor_behavior_id=visitor_behavior_id,
-                        visitor_behavior_name=visitor_behavior_name, visitor_profile_id=visitor_profile_id,
-                        visitor_profile_name=visitor_profile_name)
-
-    @staticmethod
-    def _set_message_records(message_record_data: dict, conversation_id: str) -> List[MessageRecord]:
-        # TODO: Parse context data (contains context data, structured metadata, bot response, intent, and action reason)
-
-        def parse_message_record(item: dict, cid: str) -> MessageRecord:
-            context_data = None
-            device = None
-            dialog_id = None
-            message_data = None
-            message_id = None
-            participant_id = None
-            sent_by = None
-            seq = None
-            source = None
-            time = None
-            time_l = None
-            type = None
-
-            for key, value in item.items():
-                if key == 'contextData':
-                    context_data = value
-                elif key == 'device':
-                    device = value
-                elif key == 'dialogId':
-                    dialog_id = value
-                elif key == 'messageData':
-                    if 'msg' in value and 'text' in value['msg']:
-                        message_data = value['msg']['text']
-                elif key == 'messageId':
-                    message_id = value
-                elif key == 'participantId':
-                    participant_id = value
-                elif key == 'sentBy':
-                    sent_by = value
-                elif key == 'seq':
-                    seq = value
-                elif key == 'source':
-                    source = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-                elif key == 'type':
-                    type = value
-
-            return MessageRecord(conversation_id=cid, context_data=context_data, device=device, dialog_id=dialog_id,
-                                 message_data=message_data, message_id=message_id, participant_id=participant_id,
-                                 sent_by=sent_by, seq=seq, source=source, time=time, time_l=time_l, type=type)
-
-        return [parse_message_record(item=item, cid=conversation_id) for item in message_record_data]
-
-    @staticmethod
-    def _set_agent_participants(agent_participant_data: dict, conversation_id: str) -> List[AgentParticipant]:
-
-        def parse_agent_participant(item: dict, cid: str) -> AgentParticipant:
-
-            agent_deleted = None
-            agent_full_name = None
-            agent_group_id = None
-            agent_group_name = None
-            agent_id = None
-            agent_login_name = None
-            agent_nickname = None
-            agent_pid = None
-            permission = None
-            role = None
-            time = None
-            time_l = None
-            user_type = None
-            user_type_name = None
-
-            for key, value in item.items():
-                if key == 'agentDeleted':
-                    agent_deleted = value
-                elif key == 'agentFullName':
-                    agent_full_name = value
-                elif key == 'agentGroupId':
-                    agent_group_id = value
-                elif key == 'agentGroupName':
-                    agent_group_name = value
-                elif key == 'agentId':
-                    agent_id = value
-                elif key == 'agentLoginName':
-                    agent_login_name = value
-                elif key == 'agentNickname':
-                    agent_nickname = value
-                elif key == 'agentPid':
-                    agent_pid = value
-                elif key == 'permission':
-                    permission = value
-                elif key == 'role':
-                    role = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-                elif key == 'userType':
-                    user_type = value
-                elif key == 'userTypeName':
-                    user_type_name = value
-
-            return AgentParticipant(conversation_id=cid, agent_deleted=agent_deleted, agent_full_name=agent_full_name,
-                                    agent_group_id=agent_group_id, agent_group_name=agent_group_name, agent_id=agent_id,
-                                    agent_login_name=agent_login_name, agent_nickname=agent_nickname,
-                                    agent_pid=agent_pid, permission=permission, role=role, time=time, time_l=time_l,
-                                    user_type=user_type, user_type_name=user_type_name)
-
-        return [parse_agent_participant(item=item, cid=conversation_id) for item in agent_participant_data]
-
-    @staticmethod
-    def _set_consumer_participants(consumer_participant_data: dict, conversation_id: str) -> List[ConsumerParticipant]:
-
-        def parse_consumer_participant(item: dict, cid: str) -> ConsumerParticipant:
-            avatar_url = None
-            consumer_name = None
-            email = None
-            first_name = None
-            last_name = None
-            participant_id = None
-            phone = None
-            time = None
-            time_l = None
-            token = None
-
-            for key, value in item.items():
-                if key == 'avatarURL':
-                    avatar_url = value
-                elif key == 'consumerName':
-                    consumer_name = value
-                elif key == 'email':
-                    email = value
-                elif key == 'firstName':
-                    first_name = value
-                elif key == 'lastName':
-                    last_name = value
-                elif key == 'participantId':
-                    participant_id = value
-                elif key == 'phone':
-                    phone = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-                elif key == 'token':
-                    token = value
-
-            return ConsumerParticipant(conversation_id=cid, avatar_url=avatar_url, consumer_name=consumer_name,
-                                       email=email, first_name=first_name, last_name=last_name,
-                                       participant_id=participant_id, phone=phone, time=time, time_l=time_l,
-                                       token=token)
-
-        return [parse_consumer_participant(item=item, cid=conversation_id) for item in consumer_participant_data]
-
-    @staticmethod
-    def _set_transfers(transfer_data: dict, conversation_id: str) -> List[Transfer]:
-
-        def parse_transfer(item: dict, cid: str) -> Transfer:
-            assigned_agent_full_name = None
-            assigned_agent_id = None
-            assigned_agent_login_name = None
-            assigned_agent_nickname = None
-            by = None
-            context_data = None
-            reason = None
-            source_agent_full_name = None
-            source_agent_id = None
-            source_agent_login_name = None
-            source_agent_nickname = None
-            source_skill_id = None
-            source_skill_name = None
-            target_skill_id = None
-            target_skill_name = None
-            time = None
-            time_l = None
-
-            for key, value in item.items():
-                if key == 'assignedAgentFullName':
-                    assigned_agent_full_name = value
-                elif key == 'assignedAgentId':
-                    assigned_agent_id = value
-                elif key == 'assignedAgentLoginName':
-                    assigned_agent_login_name = value
-                elif key == 'assignedAgentNickname':
-                    assigned_agent_nickname = value
-                elif key == 'by':
-                    by = value
-                elif key == 'contextData':
-                    context_data = value
-                elif key == 'reason':
-                    reason = value
-                elif key == 'sourceAgentFullName':
-                    source_agent_full_name = value
-                elif key == 'sourceAgentId':
-                    source_agent_id = value
-                elif key == 'sourceAgentLoginName':
-                    source_agent_login_name = value
-                elif key == 'sourceAgentNickname':
-                    source_agent_nickname = value
-                elif key == 'sourceSkillId':
-                    source_skill_id = value
-                elif key == 'sourceSkillName':
-                    source_skill_name = value
-                elif key == 'targetSkillId':
-                    target_skill_id = value
-                elif key == 'targetSkillName':
-                    target_skill_name = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-
-            return Transfer(conversation_id=cid, assigned_agent_full_name=assigned_agent_full_name,
-                            assigned_agent_id=assigned_agent_id, assigned_agent_login_name=assigned_agent_login_name,
-                            assigned_agent_nickname=assigned_agent_nickname, by=by, context_data=context_data,
-                            reason=reason, source_agent_full_name=source_agent_full_name,
-                            source_agent_id=source_agent_id, source_agent_login_name=source_agent_login_name,
-                            source_agent_nickname=source_agent_nickname, source_skill_id=source_skill_id,
-                            source_skill_name=source_skill_name, target_skill_id=target_skill_id,
-                            target_skill_name=target_skill_name, time=time, time_l=time_l)
-
-        return [parse_transfer(item=item, cid=conversation_id) for item in transfer_data]
-
-    @staticmethod
-    def _set_interactions(interaction_data: dict, conversation_id: str) -> List[Interaction]:
-
-        def parse_interaction(item: dict, cid: str) -> Interaction:
-
-            assigned_agent_id = None
-            assigned_agent_login_name = None
-            assigned_agent_nickname = None
-            assigned_agent_full_name = None
-            interaction_time = None
-            interaction_time_l = None
-            interactive_sequence = None
-
-            for key, value in item.items():
-                if key == 'assignedAgentId':
-                    assigned_agent_id = value
-                elif key in ['assignedAgentLoginName', 'agentLoginName']:
-                    assigned_agent_login_name = value
-                elif key in ['assignedAgentNickname', 'agentNickname']:
-                    assigned_agent_nickname = value
-                elif key in ['assignedAgentFullName', 'agentFullName']:
-                    assigned_agent_full_name = value
-                elif key == 'interactionTime':
-                    interaction_time = value
-                elif key == 'interactionTimeL':
-                    interaction_time_l = value
-                elif key == 'interactiveSequence':
-                    interactive_sequence = value
-
-            return Interaction(conversation_id=cid, assigned_agent_id=assigned_agent_id,
-                               assigned_agent_login_name=assigned_agent_login_name,
-                               assigned_agent_nickname=assigned_agent_nickname,
-                               assigned_agent_full_name=assigned_agent_full_name, interaction_time=interaction_time,
-                               interaction_time_l=interaction_time_l, interactive_sequence=interactive_sequence)
-
-        return [parse_interaction(item=item, cid=conversation_id) for item in interaction_data]
-
-    @staticmethod
-    def _set_message_scores(message_score_data: dict, conversation_id: str) -> List[MessageScore]:
-
-        def parse_message_score(item: dict, cid: str) -> MessageScore:
-            mcs = None
-            message_id = None
-            message_raw_score = None
-            time = None
-            time_l = None
-
-            for key, value in item.items():
-                if key == 'mcs':
-                    mcs = value
-                elif key == 'messageId':
-                    message_id = value
-                elif key == 'messageRawScore':
-                    message_raw_score = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-
-            return MessageScore(conversation_id=cid, mcs=mcs, message_id=message_id,
-                                message_raw_score=message_raw_score, time=time, time_l=time_l)
-
-        return [parse_message_score(item=item, cid=conversation_id) for item in message_score_data]
-
-    @staticmethod
-    def _set_message_statuses(message_status_data: dict, conversation_id: str) -> List[MessageStatus]:
-
-        def parse_message_status(item: dict, cid: str) -> MessageStatus:
-
-            message_delivery_status = None
-            message_id = None
-            participant_id = None
-            participant_type = None
-            seq = None
-            time = None
-            time_l = None
-
-            for key, value in item.items():
-                if key == 'messageDeliveryStatus':
-                    message_delivery_status = value
-                elif key == 'messageId':
-                    message_id = value
-                elif key == 'participantId':
-                    participant_id = value
-                elif key == 'participantType':
-                    participant_type = value
-                elif key == 'seq':
-                    seq = value
-                elif key == 'time':
-                    time = value
-                elif key == 'timeL':
-                    time_l = value
-
-            return MessageStatus(conversation_id=cid, message_delivery_status=message_delivery_status,
-                                 message_id=message_id, participant_id=participant_id,
-                                 participant_type=participant_type, seq=seq, time=time, time_l=time_l)
-
-        return [parse_message_status(item=item, cid=conversation_id) for item in message_status_data]
-
-    @staticmethod
-    def _set_surveys(survey_data: dict, conversation_id: str) -> List[Survey]:
-
-        def parse_survey(survey_event, cid) -> Survey:
+    def _set_surveys(self, survey_data: dict, conversation_id: str) -> List[Survey]:
+
+        def parse_survey(survey_event, cid) -> List[Survey]:
 
             survey_type = None
             survey_status = None
@@ -730,283 +625,13 @@ class Conversations:
                         survey_question = sd['question']
 
                     surveys.append(
-                        Survey(conversation_id=cid, survey_answer=survey_answer, survey_question=survey_question,
-                               survey_type=survey_type, survey_status=survey_status)
+                        self._make_row(table='survey',
+                                       values=[cid, survey_answer, survey_question, survey_status, survey_type])
                     )
             else:
                 surveys.append(
-                    Survey(
-                        conversation_id=cid,
-                        survey_answer=None,
-                        survey_question=None,
-                        survey_type=survey_type,
-                        survey_status=survey_status
-                    )
+                    self._make_row(table='survey', values=[cid, None, None, survey_status, survey_type])
                 )
             return surveys
 
         return [survey for item in survey_data for survey in parse_survey(survey_event=item, cid=conversation_id)]
-
-    @staticmethod
-    def _set_cobrowse_sessions(cobrowse_session_data: dict, conversation_id: str) -> List[CoBrowseSession]:
-
-        def parse_cobrowse_session(item: dict, cid: str) -> CoBrowseSession:
-
-            agent_id = None
-            capabilities = None
-            duration = None
-            end_reason = None
-            end_time = None
-            end_time_l = None
-            interactive_time = None
-            interactive_time_l = None
-            is_interactive = None
-            session_id = None
-            start_time = None
-            start_time_l = None
-            type = None
-
-            for key, value in item.items():
-                if key == 'agentId':
-                    agent_id = value
-                elif key == 'capabilities':
-                    capabilities = value
-                elif key == 'duration':
-                    duration = value
-                elif key == 'endReason':
-                    end_reason = value
-                elif key == 'endTime':
-                    end_time = value
-                elif key == 'endTimeL':
-                    end_time_l = value
-                elif key == 'interactiveTime':
-                    interactive_time = value
-                elif key == 'interactiveTimeL':
-                    interactive_time_l = value
-                elif key == 'isInteractive':
-                    is_interactive = value
-                elif key == 'sessionId':
-                    session_id = value
-                elif key == 'startTime':
-                    start_time = value
-                elif key == 'startTimeL':
-                    start_time_l = value
-                elif key == 'type':
-                    type = value
-
-            return CoBrowseSession(conversation_id=cid, agent_id=agent_id, capabilities=capabilities,
-                                   duration=duration, end_reason=end_reason, end_time=end_time, end_time_l=end_time_l,
-                                   interactive_time=interactive_time, interactive_time_l=interactive_time_l,
-                                   is_interactive=is_interactive, session_id=session_id, start_time=start_time,
-                                   start_time_l=start_time_l, type=type)
-
-        return [parse_cobrowse_session(item=item, cid=conversation_id) for item in cobrowse_session_data]
-
-    @staticmethod
-    def _set_summary(summary_data: dict, conversation_id: str) -> Summary:
-
-        last_updated_time = None
-        text = None
-
-        for key, value in summary_data.items():
-            if key == 'lastUpdatedTime':
-                last_updated_time = value
-            elif key == 'text':
-                text = value
-
-        return Summary(conversation_id=conversation_id, text=text, last_updated_time=last_updated_time)
-
-    @staticmethod
-    def _filter_sdes(sde_data: dict) -> (List[dict], List[dict]):
-
-        customer_info_events = []
-        personal_info_events = []
-
-        for event in sde_data:
-            if 'customerInfo' in event and event['customerInfo']:
-                customer_info_events.append(event)
-            elif 'personalInfo' in event and event['personalInfo']:
-                personal_info_events.append(event)
-
-        return customer_info_events, personal_info_events
-
-    @staticmethod
-    def _set_customer_info(customer_info_data: List[dict], conversation_id: str) -> List[CustomerInfo]:
-
-        def parse_customer_info(ci_item: dict, cid: str) -> CustomerInfo:
-
-            account_name = None
-            balance = None
-            company_branch = None
-            company_size = None
-            customer_id = None
-            customer_info_server_time_stamp = None
-            customer_status = None
-            customer_type = None
-            imei = None
-            last_payment_day = None
-            last_payment_month = None
-            last_payment_year = None
-            login_status = None
-            registration_day = None
-            registration_month = None
-            registration_year = None
-            role = None
-            sde_type = None
-            sde_server_time_stamp = None
-            social_id = None
-            store_number = None
-            store_zip_code = None
-            user_name = None
-
-            c_info = ci_item['customerInfo']['customerInfo']
-
-            for key, value in c_info.items():
-                if key == 'accountName':
-                    account_name = value
-                elif key == 'balance':
-                    balance = value
-                elif key == 'companyBranch':
-                    company_branch = value
-                elif key == 'companySize':
-                    company_size = value
-                elif key == 'customerId':
-                    customer_id = value
-                elif key == 'customerStatus':
-                    customer_status = value
-                elif key == 'customerType':
-                    customer_type = value
-                elif key == 'imei':
-                    imei = value
-                elif key == 'lastPaymentDate':
-                    if 'year' in value and value['year']:
-                        last_payment_year = value['year']
-                    if 'month' in value and value['month']:
-                        last_payment_month = value['month']
-                    if 'day' in value and value['day']:
-                        last_payment_day = value['day']
-                elif key == 'loginStatus':
-                    login_status = value
-                elif key == 'registrationDate':
-                    if 'year' in value and value['year']:
-                        registration_year = value['year']
-                    if 'month' in value and value['month']:
-                        registration_month = value['month']
-                    if 'day' in value and value['day']:
-                        registration_day = value['day']
-                elif key == 'role':
-                    role = value
-                elif key == 'socialId':
-                    social_id = value
-                elif key == 'storeNumber':
-                    store_number = value
-                elif key == 'storeZipCode':
-                    store_zip_code = value
-                elif key == 'userName':
-                    user_name = value
-
-            # SDE Type
-            if 'sdeType' in ci_item and ci_item['sdeType']:
-                sde_type = ci_item['sdeType']
-
-            # SDE Server Time Stamp
-            if 'serverTimeStamp' in ci_item and ci_item['serverTimeStamp']:
-                sde_server_time_stamp = ci_item['serverTimeStamp']
-
-            # Get time stamp from inside customer info
-            if 'serverTimeStamp' in ci_item['customerInfo'] and ci_item['customerInfo']['serverTimeStamp']:
-                customer_info_server_time_stamp = ci_item['customerInfo']['serverTimeStamp']
-
-            return CustomerInfo(conversation_id=cid, account_name=account_name, balance=balance,
-                                company_branch=company_branch, company_size=company_size, customer_id=customer_id,
-                                customer_info_server_time_stamp=customer_info_server_time_stamp,
-                                customer_status=customer_status, customer_type=customer_type, imei=imei,
-                                last_payment_day=last_payment_day, last_payment_month=last_payment_month,
-                                last_payment_year=last_payment_year, login_status=login_status,
-                                registration_day=registration_day, registration_month=registration_month,
-                                registration_year=registration_year, role=role, sde_type=sde_type,
-                                sde_server_time_stamp=sde_server_time_stamp, social_id=social_id,
-                                store_number=store_number, store_zip_code=store_zip_code, user_name=user_name)
-
-        return [parse_customer_info(ci_item=item, cid=conversation_id) for item in customer_info_data]
-
-    @staticmethod
-    def _set_personal_info(personal_info_data: List[dict], conversation_id: str) -> List[PersonalInfo]:
-
-        def parse_personal_info(pi_item: dict, cid: str) -> PersonalInfo:
-
-            company = None
-            customer_age = None
-            gender = None
-            language = None
-            name = None
-            personal_info_server_time_stamp = None
-            sde_type = None
-            sde_server_time_stamp = None
-            surname = None
-
-            p_info = pi_item['personalInfo']['personalInfo']
-
-            for key, value in p_info.items():
-                if key == 'company':
-                    company = value
-                elif key == 'customerAge':
-                    customer_age = value
-                elif key == 'gender':
-                    gender = value
-                elif key == 'language':
-                    language = value
-                elif key == 'name':
-                    name = value
-                elif key == 'surname':
-                    surname = value
-
-            # SDE Type
-            if 'sdeType' in pi_item and pi_item['sdeType']:
-                sde_type = pi_item['sdeType']
-
-            # SDE Server Time Stamp
-            if 'serverTimeStamp' in pi_item and pi_item['serverTimeStamp']:
-                sde_server_time_stamp = pi_item['serverTimeStamp']
-
-            # Get time stamp from inside customer info
-            if 'serverTimeStamp' in pi_item['personalInfo'] and pi_item['personalInfo']['serverTimeStamp']:
-                personal_info_server_time_stamp = pi_item['personalInfo']['serverTimeStamp']
-
-            personal_info_rows = []
-
-            if 'contacts' in p_info and p_info['contacts']:
-                for contact in p_info['contacts']:
-
-                    email = None
-                    phone = None
-
-                    if 'personalContact' in contact and contact['personalContact']:
-                        if 'email' in contact['personalContact'] and contact['personalContact']['email']:
-                            email = contact['personalContact']['email']
-                        if 'phone' in contact['personalContact'] and contact['personalContact']['phone']:
-                            phone = contact['personalContact']['phone']
-
-                    personal_info_rows.append(
-                        PersonalInfo(conversation_id=cid, company=company, customer_age=customer_age, email=email,
-                                     gender=gender, language=language, name=name,
-                                     personal_info_server_time_stamp=personal_info_server_time_stamp,
-                                     phone=phone, sde_server_time_stamp=sde_server_time_stamp, sde_type=sde_type,
-                                     surname=surname)
-                    )
-            else:
-                personal_info_rows.append(
-                    PersonalInfo(conversation_id=cid, company=company, customer_age=customer_age, email=None,
-                                 gender=gender, language=language, name=name,
-                                 personal_info_server_time_stamp=personal_info_server_time_stamp,
-                                 phone=None, sde_server_time_stamp=sde_server_time_stamp, sde_type=sde_type,
-                                 surname=surname)
-                )
-
-            return personal_info_rows
-
-        return [
-            personal_info
-            for item in personal_info_data
-            for personal_info in parse_personal_info(pi_item=item, cid=conversation_id)
-        ]
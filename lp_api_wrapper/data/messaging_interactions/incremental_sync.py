@@ -0,0 +1,191 @@
+"""
+Provides incremental syncs of Messaging Interactions conversations, so each run only moves conversations that changed
+since the previous run.
+
+A JSON state file keeps, per account, a watermark: the latest update time seen in the synced conversations, taken
+from their end time and the times of their messages, transfers and participants.  The watermark comes from
+LivePerson's clock, not this machine's, so clock skew between the two cannot open a gap.  Each run searches for
+conversations updated after the watermark minus an overlap, which catches conversations that were still being written
+when the previous run searched.  Conversations that were open at the previous run are searched for again from their
+start time until they close.
+
+Conversations are deduplicated by conversation_id: a conversation found on more than one page is kept once, and a
+conversation that has not changed since it was last delivered, judged by its status, end time and number of messages
+and transfers, is skipped.
+
+Usage Example:
+    > sync = IncrementalSync(mi_conn, state_path='./mi_sync.json', initial_from=1491004800000)
+    > conversations = sync.conversations()  # Only new or changed conversations, or None.
+"""
+
+import os
+import time
+from .conversations import Conversations
+from ...util.json_decoder import (decode_json, encode_json)
+from typing import (Dict, List, Optional)
+
+_DAY_MS = 86400000
+
+
+def update_time(record: dict) -> Optional[int]:
+    """
+    :param record: conversationHistoryRecord.
+    :return: Latest epoch millisecond time in the record: its latestUpdateTime or end time, or the time of its latest
+     message, transfer or participant.  None if the record holds no time.
+    """
+    info = record.get('info') or {}
+    times = [info.get(field) for field in ('latestUpdateTime', 'endTimeL', 'startTimeL')]
+    for section in ('messageRecords', 'transfers', 'agentParticipants', 'consumerParticipants', 'messageStatuses'):
+        times.extend(item.get('timeL') for item in record.get(section) or ())
+    return max((time_l for time_l in times if isinstance(time_l, int)), default=None)
+
+
+def fingerprint(record: dict) -> list:
+    """
+    :param record: conversationHistoryRecord.
+    :return: [status, end time, message count, transfer count] of the conversation, which changes when it does.
+    """
+    info = record.get('info') or {}
+    return [info.get('status'), info.get('endTimeL'), len(record.get('messageRecords') or ()),
+            len(record.get('transfers') or ())]
+
+
+class IncrementalSync:
+    def __init__(self, mi_conn, state_path: str, initial_from: Optional[int] = None, overlap: int = 600000) -> None:
+        """
+        :param mi_conn: MessagingInteractions connection.
+        :param state_path: JSON file holding the sync state.  Created by the first commit.
+        :param initial_from: Epoch milliseconds to sync from when the account has no watermark yet.
+         Default: one day before the first run.
+        :param overlap: Milliseconds before the watermark searched again on every run.  Default: 10 minutes.
+        """
+
+        self.mi_conn = mi_conn
+        self.state_path = state_path
+        self.initial_from = initial_from
+        self.overlap = overlap
+        self.account_id = str(mi_conn.account_id)
+
+        self._pending: Optional[dict] = None
+
+    def load_state(self) -> Dict[str, dict]:
+        """
+        :return: State of every account in the state file, or an empty dictionary if there is no state file.
+        """
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, 'rb') as f:
+            return decode_json(f.read())
+
+    def state(self) -> dict:
+        """
+        :return: State of this account: watermark, open conversation start times, and the fingerprint and update time
+         of each delivered conversation.
+        """
+        return self.load_state().get(self.account_id) or {'watermark': None, 'open': {}, 'delivered': {}}
+
+    def records(self, body: Optional[dict] = None, now: Optional[int] = None, max_workers: int = 10,
+                debug: bool = False, commit: bool = True) -> List[dict]:
+        """
+        Fetches the conversationHistoryRecords that are new or changed since the last committed run.
+
+        :param body: Search filters, as in MessagingInteractions.conversations.  start and latestUpdateTime are set
+         by the sync.
+        :param now: Epoch milliseconds the search ends at.  Default: the current time.  The watermark is taken from the
+         records instead, so it never runs ahead of what LivePerson returned.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :param commit: Save the new state once the records are fetched.  If False, call commit after the records are
+         landed, so a failed run is fetched again.
+        :return: List of conversationHistoryRecords, one per conversation.
+        """
+
+        if now is None:
+            now = int(time.time() * 1000)
+
+        state = self.state()
+        watermark = state['watermark']
+        since = (self.initial_from if self.initial_from is not None else now - _DAY_MS) if watermark is None \
+            else watermark - self.overlap
+
+        search = dict(body or {})
+        search['start'] = {'from': min([since] + list(state['open'].values())), 'to': now}
+        if watermark is not None:
+            search['latestUpdateTime'] = since
+
+        # Latest record of each conversation in this run: the one with the most messages and transfers.
+        latest: Dict[str, dict] = {}
+        for page in self.mi_conn.conversation_record_pages(body=search, max_workers=max_workers, debug=debug):
+            for record in page:
+                conversation_id = record['info']['conversationId']
+                current = latest.get(conversation_id)
+                if current is None or fingerprint(record)[2:] >= fingerprint(current)[2:]:
+                    latest[conversation_id] = record
+
+        delivered, open_conversations = state['delivered'], state['open']
+        watermark = state['watermark']
+        records = []
+        for conversation_id, record in latest.items():
+            changed = fingerprint(record)
+            updated = update_time(record)
+            previous = delivered.get(conversation_id)
+            if previous is None or previous[0] != changed:
+                records.append(record)
+            delivered[conversation_id] = [changed, since if updated is None else updated]
+            if updated is not None and (watermark is None or updated > watermark):
+                watermark = updated
+
+            if record['info'].get('status') == 'OPEN':
+                open_conversations[conversation_id] = record['info'].get('startTimeL', since)
+            else:
+                open_conversations.pop(conversation_id, None)
+
+        # Conversations last updated before the next run's overlap cannot be found again unless they are still open.
+        if watermark is not None:
+            next_since = watermark - self.overlap
+            state['delivered'] = {
+                conversation_id: entry for conversation_id, entry in delivered.items()
+                if entry[1] >= next_since or conversation_id in open_conversations
+            }
+        state['watermark'] = watermark
+
+        self._pending = state
+        if commit:
+            self.commit()
+        return records
+
+    def conversations(self, body: Optional[dict] = None, now: Optional[int] = None, max_workers: int = 10,
+                      debug: bool = False, drop_time_strings: bool = False,
+                      commit: bool = True) -> Optional[Conversations]:
+        """
+        Same as records, but parses the records into a Conversations object.
+
+        :param drop_time_strings: Skip the string timestamps that duplicate the *_time_l fields.  See Conversations.
+        :return: Conversations that are new or changed since the last committed run, or None if there are none.
+        """
+
+        records = self.records(body=body, now=now, max_workers=max_workers, debug=debug, commit=commit)
+        if not records:
+            return None
+
+        conversations = Conversations(drop_time_strings=drop_time_strings)
+        conversations.append_records(records=records)
+        return conversations
+
+    def commit(self) -> None:
+        """
+        Saves the state of the last run.  The state file is replaced atomically, so it is never left half written.
+        """
+
+        if self._pending is None:
+            return
+
+        states = self.load_state()
+        states[self.account_id] = self._pending
+
+        temporary = '{}.tmp'.format(self.state_path)
+        with open(temporary, 'wb') as f:
+            f.write(encode_json(states))
+        os.replace(temporary, self.state_path)
+
+        self._pending = None
@@ -0,0 +1,188 @@
+"""
+Computes contact center KPIs from a Conversations data object with vectorized group by operations.  Requires numpy.
+
+Conversations are grouped by their latest agent, latest skill and/or start hour.  Rows of message_record, transfer and
+message_score are attributed to the group of their conversation.  Building the arrays takes one Python pass per column:
+group keys are dictionary encoded, conversation IDs are mapped to positions and numbers are read into NumPy arrays.
+Every KPI is then computed with bincount over the group codes, and only building the output rows loops over groups.
+
+KPIs of each group:
+    conversations           Number of conversations.
+    handle_time             Average info.duration in milliseconds.
+    csat                    Average info.csat of conversations with a CSAT answer.
+    csat_count              Number of conversations with a CSAT answer.
+    mcs_negative            Conversations with an info.mcs from 0 to 33.
+    mcs_neutral             Conversations with an info.mcs from 34 to 66.
+    mcs_positive            Conversations with an info.mcs from 67 to 100.
+    message_mcs             Average message_score.mcs.
+    transfer_rate           Share of conversations with at least one transfer.
+    first_response_time     Average milliseconds from start_time_l to the first message sent by an agent.
+
+Usage Example:
+    > conversations = mi_conn.conversations(body)
+    > conversations.kpis(by=('skill', 'hour'))
+"""
+
+from collections import namedtuple
+from typing import (Dict, List, Sequence, Tuple)
+
+# Group by key name, mapped to the output field name and the info field it is read from.
+GROUP_KEYS = {
+    'agent': ('agent_id', 'latest_agent_id'),
+    'skill': ('skill_id', 'latest_skill_id'),
+    'hour': ('hour', 'start_time_l')
+}
+
+KPI_FIELDS = ('conversations', 'handle_time', 'csat', 'csat_count', 'mcs_negative', 'mcs_neutral', 'mcs_positive',
+              'message_mcs', 'transfer_rate', 'first_response_time')
+
+_HOUR_MS = 3600000
+
+# Row types of the result tables, keyed by group by key names.
+_KPI_TYPES = {}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError('kpis requires numpy.  Install with: pip install numpy')
+    return np
+
+
+def _floats(np, values: Sequence):
+    # Column as a float array with NaN for missing values.
+    return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64, count=len(values))
+
+
+def _encode(np, values: Sequence) -> Tuple[object, list]:
+    # Dictionary encodes a column into integer codes and the distinct values in order of first appearance.
+    codes = {}
+    return np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64,
+                       count=len(values)), list(codes)
+
+
+def _mean(np, totals, counts) -> list:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = totals / counts
+    return [None if count == 0 else mean for mean, count in zip(means.tolist(), counts.tolist())]
+
+
+def kpi_type(by: Sequence[str]) -> type:
+    """
+    :param by: Group by key names from GROUP_KEYS.
+    :return: namedtuple type of the result rows, with the group fields followed by KPI_FIELDS.
+    """
+    by = tuple(by)
+    if by not in _KPI_TYPES:
+        _KPI_TYPES[by] = namedtuple(
+            typename='Kpi', field_names=[GROUP_KEYS[key][0] for key in by] + list(KPI_FIELDS)
+        )
+    return _KPI_TYPES[by]
+
+
+def conversation_kpis(conversations, by: Sequence[str] = ('agent',)) -> list:
+    """
+    :param conversations: Conversations data object.
+    :param by: Group by key names from GROUP_KEYS: 'agent', 'skill' and/or 'hour'.  hour is the epoch milliseconds
+     of the start of the conversation's start hour, in UTC.  Default: ('agent',)
+    :return: List of namedtuples, one per group, ordered by the first appearance of each key value.
+    """
+
+    np = _numpy()
+
+    by = tuple(by)
+    if not by or any(key not in GROUP_KEYS for key in by):
+        raise ValueError('by must contain one or more of: {}'.format(', '.join(GROUP_KEYS)))
+
+    info = conversations.columns(table='info')
+    size = len(info['conversation_id'])
+
+    # Group code of each conversation, combining the codes of every key.
+    conversation_groups = np.zeros(size, dtype=np.int64)
+    key_values: List[list] = []
+    for key in by:
+        values = info[GROUP_KEYS[key][1]]
+        if key == 'hour':
+            values = [None if value is None else value - value % _HOUR_MS for value in values]
+        codes, distinct = _encode(np, values)
+        conversation_groups = conversation_groups * len(distinct) + codes
+        key_values.append(distinct)
+
+    groups, conversation_groups = np.unique(conversation_groups, return_inverse=True)
+    conversation_groups = conversation_groups.reshape(-1)
+    group_count = len(groups)
+
+    positions: Dict[str, int] = {cid: i for i, cid in enumerate(info['conversation_id'])}
+
+    def conversation_positions(table: str):
+        # Position in info of the conversation of each row of a table, or -1 if the conversation is not in info.
+        return np.fromiter(
+            (positions.get(cid, -1) for cid in conversations.columns(table=table)['conversation_id']), dtype=np.int64
+        )
+
+    def group_sum(weights, groups_of=conversation_groups):
+        return np.bincount(groups_of, weights=weights, minlength=group_count)
+
+    counts = np.bincount(conversation_groups, minlength=group_count)
+
+    # Handle time and CSAT.
+    duration = _floats(np, info['duration'])
+    has_duration = ~np.isnan(duration)
+    handle_time = _mean(np, group_sum(np.where(has_duration, duration, 0)), group_sum(has_duration))
+
+    csat = _floats(np, info['csat'])
+    has_csat = ~np.isnan(csat)
+    csat_counts = group_sum(has_csat)
+    csat_mean = _mean(np, group_sum(np.where(has_csat, csat, 0)), csat_counts)
+
+    # MCS distribution.
+    mcs = _floats(np, info['mcs'])
+    mcs_negative = group_sum((mcs >= 0) & (mcs < 34))
+    mcs_neutral = group_sum((mcs >= 34) & (mcs < 67))
+    mcs_positive = group_sum((mcs >= 67) & (mcs <= 100))
+
+    # Average message score.
+    score_rows = conversation_positions('message_score')
+    score = _floats(np, conversations.columns(table='message_score')['mcs'])
+    scored = (score_rows >= 0) & ~np.isnan(score)
+    score_groups = conversation_groups[score_rows[scored]]
+    message_mcs = _mean(np, group_sum(score[scored], score_groups), group_sum(None, score_groups))
+
+    # Transfer rate.
+    transferred = np.zeros(size, dtype=bool)
+    transfer_rows = conversation_positions('transfer')
+    transferred[transfer_rows[transfer_rows >= 0]] = True
+    transfer_rate = _mean(np, group_sum(transferred), counts.astype(np.float64))
+
+    # First response time: earliest agent message of each conversation, relative to the conversation start.
+    message_rows = conversation_positions('message_record')
+    messages = conversations.columns(table='message_record')
+    sent = _floats(np, messages['time_l'])
+    by_agent = np.fromiter((sent_by == 'Agent' for sent_by in messages['sent_by']), dtype=bool,
+                           count=len(message_rows))
+    responses = by_agent & (message_rows >= 0) & ~np.isnan(sent)
+    first_response = np.full(size, np.inf)
+    np.minimum.at(first_response, message_rows[responses], sent[responses])
+    response_time = first_response - _floats(np, info['start_time_l'])
+    responded = np.isfinite(response_time)
+    first_response_time = _mean(np, group_sum(np.where(responded, response_time, 0)), group_sum(responded))
+
+    # Decode each group's key values from its combined code.
+    group_keys = []
+    for group in groups.tolist():
+        keys = []
+        for distinct in reversed(key_values):
+            group, code = divmod(group, len(distinct))
+            keys.append(distinct[code])
+        group_keys.append(keys[::-1])
+
+    row_type = kpi_type(by)
+    return [
+        row_type(*keys, *kpis)
+        for keys, kpis in zip(group_keys, zip(
+            counts.tolist(), handle_time, csat_mean, csat_counts.astype(np.int64).tolist(),
+            mcs_negative.astype(np.int64).tolist(), mcs_neutral.astype(np.int64).tolist(),
+            mcs_positive.astype(np.int64).tolist(), message_mcs, transfer_rate, first_response_time
+        ))
+    ]
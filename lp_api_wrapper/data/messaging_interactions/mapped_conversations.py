@@ -0,0 +1,114 @@
+"""
+Provides Conversations read from the columnar binary files written by Conversations.save.
+
+Columns are memory-mapped on first use.  columns, index, join, codes, to_pandas and to_arrow read the mapped columns
+directly, and lookup, group_by and conversation build only the rows they return.  Accessing a table attribute builds
+all of its rows, after which the table behaves like any other Conversations table and can be appended to.
+
+Each mapped column holds an open file until close is called or the with block ends.  Rows already built stay usable
+after closing, but mapped columns returned by columns do not.
+
+Usage Example:
+    > conversations.save('conversations_2019_01')
+    > with Conversations.open('conversations_2019_01') as conversations:
+    >     conversations.columns('info')['duration']
+"""
+
+import json
+import os
+from .conversations import (Conversations, TABLES)
+from ...util.columnar_file import MappedTable
+from typing import (Any, Dict, List)
+
+
+class MappedConversations(Conversations):
+    def __init__(self, path: str, compact_rows: bool = False) -> None:
+        """
+        :param path: Directory written by Conversations.save.
+        :param compact_rows: Build rows as slot based classes (COMPACT_TABLES) instead of namedtuples.
+        """
+
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if manifest.get('format') != 'lp_api_wrapper.conversations':
+            raise ValueError('{} was not written by Conversations.save.'.format(path))
+
+        super().__init__(compact_rows=compact_rows)
+        self.path = path
+
+        # Tables not yet built from their columns.  Their attributes are removed so that __getattr__ builds them.
+        self._mapped: Dict[str, MappedTable] = {}
+        for table in TABLES:
+            description = manifest['tables'].get(table, {'rows': 0, 'columns': {}})
+            self._mapped[table] = MappedTable(directory=os.path.join(path, table), rows=description['rows'],
+                                              description=description['columns'], byteorder=manifest['byteorder'])
+            delattr(self, table)
+
+    def __enter__(self) -> 'MappedConversations':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmaps every column opened so far, releasing their files.  Tables not yet built map their columns again if
+        they are used afterwards.
+        """
+        for mapped in self._mapped.values():
+            mapped.close()
+
+    def __getattr__(self, name: str) -> Any:
+        mapped = self.__dict__.get('_mapped', {}).pop(name, None)
+        if mapped is None:
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+        columns = [mapped.column(field) for field in TABLES[name]._fields]
+        rows = list(map(self.row_types[name]._make, zip(*columns)))
+        # The rows hold copies of every value, so the files of the table are no longer needed.
+        mapped.close()
+        setattr(self, name, rows)
+        return rows
+
+    def columns(self, table: str) -> Dict[str, list]:
+        """
+        Returns a columnar view of a table.  Tables whose rows have not been built return their memory-mapped columns,
+        which support len, indexing, slicing and iteration like lists.
+
+        :param table: Name of the table attribute.  Example: 'info'
+        :return: Dictionary of field name to column values.
+        """
+
+        if table in self._mapped:
+            mapped = self._mapped[table]
+            return {field: mapped.column(field) for field in TABLES[table]._fields}
+        return super().columns(table=table)
+
+    def index(self, table: str, field: str) -> Dict[Any, List[int]]:
+        if table not in self._mapped:
+            return super().index(table=table, field=field)
+
+        if field not in TABLES[table]._fields:
+            raise ValueError('{} has no field {}.'.format(table, field))
+
+        # Mapped tables cannot change until they are built, so their indexes are built once from a single column.
+        if (table, field) not in self._indexes:
+            index = {}
+            for i, key in enumerate(self._mapped[table].column(field)):
+                if key in index:
+                    index[key].append(i)
+                else:
+                    index[key] = [i]
+            self._indexes[(table, field)] = (index, self._mapped[table].rows)
+
+        return self._indexes[(table, field)][0]
+
+    def _rows(self, table: str, positions: List[int]) -> list:
+        if table not in self._mapped:
+            return super()._rows(table=table, positions=positions)
+
+        mapped = self._mapped[table]
+        columns = [mapped.column(field) for field in TABLES[table]._fields]
+        make = self.row_types[table]._make
+        return [make([column[i] for column in columns]) for i in positions]
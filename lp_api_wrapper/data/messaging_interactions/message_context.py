@@ -0,0 +1,86 @@
+"""
+Provides structured rows for the contextData of messages, such as bot intents and action reasons.
+
+message_record stores each message's contextData as a compact JSON string.  Conversations.message_context parses those
+strings only when it is called, into one MessageContext row per metadata item of rawMetadata and structuredMetadata.
+A BotResponse item gives one row per intent.  The complete item is kept as compact JSON in the metadata field.
+
+Usage Example:
+    > context = conversations.message_context()
+    > [row.intent_name for row in context if row.type == 'BotResponse']
+"""
+
+from collections import namedtuple
+from ...util.compact_row import compact_row_type
+from ...util.json_decoder import (decode_json, encode_json)
+from typing import (Any, Callable, List, Optional)
+
+MessageContext = namedtuple(
+    typename='MessageContext',
+    field_names=['conversation_id', 'message_id', 'seq', 'source', 'type', 'intent_id', 'intent_name',
+                 'intent_confidence', 'intent_confidence_score', 'reason', 'reason_id', 'external_conversation_id',
+                 'business_cases', 'metadata']
+)
+
+CompactMessageContext = compact_row_type(MessageContext)
+
+# Fields whose values repeat across many rows, dictionary encoded like conversations.CATEGORICAL_FIELDS.
+CONTEXT_CATEGORICAL_FIELDS = ('source', 'type', 'intent_id', 'intent_name', 'intent_confidence', 'reason',
+                              'reason_id')
+
+
+def compact_context(context_data: dict) -> Optional[str]:
+    """
+    :param context_data: contextData of a message record.
+    :return: Compact JSON string, or None if there is no context.
+    """
+    return encode_json(context_data).decode() if context_data else None
+
+
+def _items(metadata: Any) -> List[dict]:
+    # rawMetadata is a JSON string holding a list of items.  structuredMetadata is already a list.
+    if isinstance(metadata, str):
+        try:
+            metadata = decode_json(metadata)
+        except ValueError:
+            return []
+    if isinstance(metadata, dict):
+        metadata = [metadata]
+    return [item for item in metadata or () if isinstance(item, dict)]
+
+
+def parse_context(conversation_id: str, message_id: str, seq: int, context_data: Optional[str],
+                  make: Callable[[list], tuple] = MessageContext._make) -> list:
+    """
+    :param conversation_id: ID of the conversation of the message.
+    :param message_id: ID of the message.
+    :param seq: Sequence of the message.
+    :param context_data: contextData as stored in message_record, a compact JSON string.
+    :param make: Builds a row from its values in field order.
+    :return: List of MessageContext rows, one per metadata item or bot intent.
+    """
+
+    if not context_data:
+        return []
+
+    context = decode_json(context_data) if isinstance(context_data, (str, bytes)) else context_data
+
+    rows = []
+    for source, key in (('raw', 'rawMetadata'), ('structured', 'structuredMetadata')):
+        for item in _items(context.get(key)):
+            business_cases = item.get('businessCases')
+            values = [conversation_id, message_id, seq, source, item.get('type'), None, None, None, None,
+                      item.get('reason'), item.get('reasonId'), item.get('externalConversationId'),
+                      tuple(business_cases) if business_cases else None, encode_json(item).decode()]
+
+            intents = [intent for intent in item.get('intents') or () if isinstance(intent, dict)]
+            if not intents:
+                rows.append(make(values))
+                continue
+
+            for intent in intents:
+                values[5:9] = [intent.get('id'), intent.get('name'), intent.get('confidence'),
+                               intent.get('confidenceScore')]
+                rows.append(make(list(values)))
+
+    return rows
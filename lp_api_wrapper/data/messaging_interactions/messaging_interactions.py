@@ -30,19 +30,28 @@ Usage Example:
     > data = mi_conn.conversations(body)
 """
 
-import concurrent.futures
 from ..messaging_interactions.messaging_interactions_endpoints import MessagingInteractionsEndpoints
+from ..messaging_interactions.conversation_cache import ConversationCache
 from ..messaging_interactions.conversations import Conversations
+from ..messaging_interactions.incremental_sync import IncrementalSync
+from ..messaging_interactions.normalized_conversations import NormalizedConversations
+from ..messaging_interactions.open_conversation_poller import OpenConversationPoller
+from ...export.checkpoint import Checkpoint
+from ...export.ndjson_archive import (NdjsonArchive, page_record_count)
+from ...util.json_decoder import decode_json
 from ...util.login_service import (UserLogin, OAuthLogin)
-from typing import (List, Optional, Union)
+from ...util.pipeline import Pipeline
+from typing import (Callable, Iterator, List, Optional, Tuple, Union)
 
 
 class MessagingInteractions(MessagingInteractionsEndpoints):
     def __init__(self, auth: Union[UserLogin, OAuthLogin]) -> None:
         super().__init__(auth=auth)
 
-    def conversations(self, body: dict, max_workers: int = 10,
-                      debug: bool = False, raw_data: bool = False) -> Union[Optional[Conversations], List, List[dict]]:
+    def conversations(self, body: dict, max_workers: int = 10, debug: bool = False, raw_data: bool = False,
+                      queue_size: int = 4, drop_time_strings: bool = False, checkpoint: Optional[str] = None,
+                      normalize: bool = False
+                      ) -> Union[Optional[Conversations], Optional[NormalizedConversations], List, List[dict]]:
 
         """
         Documentation:
@@ -51,46 +60,236 @@ class MessagingInteractions(MessagingInteractionsEndpoints):
         This method retrieves conversations with all their metadata and related messages based on a predefined search
         criteria. Search criteria includes filtering by time range, agent, skill, etc.
 
+        Pages are parsed while later pages are still downloading.  See conversation_pages.
+
         :param body: REQUIRED Enter body parameters that are the same as the API documentation.
         :param max_workers: Number of workers for requests.
         :param debug: Prints data collection process.
         :param raw_data: Returns raw data
+        :param queue_size: Max number of pages waiting between the download, decode and parse stages.
+        :param drop_time_strings: Skip the string timestamps that duplicate the *_time_l fields.  See Conversations.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  Running the same search again
+         with the same directory resumes an interrupted extraction.  See Checkpoint.
+        :param normalize: Return a NormalizedConversations, normalizing each page as it is parsed, so the full
+         Conversations object is never held in memory.
         :return:
         """
 
-        initial_payload = self.conversations_endpoint(
+        if raw_data:
+            return [
+                record
+                for records in self.conversation_record_pages(body=body, max_workers=max_workers, debug=debug,
+                                                              queue_size=queue_size, checkpoint=checkpoint)
+                for record in records
+            ]
+
+        pages = self.conversation_pages(body=body, max_workers=max_workers, debug=debug, queue_size=queue_size,
+                                        drop_time_strings=drop_time_strings, checkpoint=checkpoint)
+
+        if normalize:
+            normalized = None
+            for page in pages:
+                if normalized is None:
+                    normalized = NormalizedConversations()
+                normalized.append(conversations=page)
+            return normalized
+
+        conversations = None
+        for page in pages:
+            if conversations is None:
+                conversations = page
+            else:
+                conversations.extend(page)
+
+        return conversations
+
+    def conversation_record_pages(self, body: dict, max_workers: int = 10, debug: bool = False,
+                                  queue_size: int = 4, checkpoint: Optional[str] = None) -> Iterator[List[dict]]:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-messaging-interactions-conversations.html
+
+        Yields the conversationHistoryRecords of each page of the search as soon as the page is retrieved, so
+        callers can process or export large date ranges without holding every record in memory.
+
+        Pages are downloaded by max_workers threads and decoded in a separate thread.  At most queue_size pages wait
+        between stages, so downloading pauses while the caller falls behind.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :param queue_size: Max number of pages waiting between the download and decode stages and the caller.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  Pages already journaled are
+         read from disk first, then only the missing offsets are downloaded.  See Checkpoint.
+        :return: Iterator of lists of conversationHistoryRecords, one list per page, in completion order.
+        """
+
+        return self._conversation_pipeline(body=body, max_workers=max_workers, debug=debug, queue_size=queue_size,
+                                           checkpoint=checkpoint)
+
+    def conversation_pages(self, body: dict, max_workers: int = 10, debug: bool = False, queue_size: int = 4,
+                           drop_time_strings: bool = False, checkpoint: Optional[str] = None,
+                           normalize: bool = False) -> Iterator[Union[Conversations, NormalizedConversations]]:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-messaging-interactions-conversations.html
+
+        Yields a Conversations object for each page of the search as soon as the page is retrieved and parsed.
+
+        Pages flow through download, decode and parse stages that run at the same time, connected by queues holding
+        at most queue_size pages.  Raw records are released as soon as their page is parsed, and downloading pauses
+        while the caller falls behind.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :param queue_size: Max number of pages waiting between the download, decode and parse stages and the caller.
+        :param drop_time_strings: Skip the string timestamps that duplicate the *_time_l fields.  See Conversations.
+        :param checkpoint: Directory where completed pages are spilled and journaled.  See conversation_record_pages.
+        :param normalize: Yield a NormalizedConversations for each page instead.  Its dimension tables hold only the
+         agents, agent groups and skills that are new or changed since the previous page.  See normalized_pages.
+        :return: Iterator of Conversations, one per page, in completion order.
+        """
+
+        # Pages share one dictionary encoding, so repeated strings are stored once across the whole search.
+        categories = {}
+        # Dimension state shared by normalized pages.  The parse stage has one worker, so pages update it in order.
+        dimensions = NormalizedConversations()
+
+        def parse(records: List[dict]) -> Union[Conversations, NormalizedConversations]:
+            conversations = Conversations(categories=categories, drop_time_strings=drop_time_strings)
+            conversations.append_records(records=records)
+            if not normalize:
+                return conversations
+
+            normalized = NormalizedConversations(dimensions_from=dimensions)
+            normalized.append(conversations=conversations, changed_only=True)
+            return normalized
+
+        return self._conversation_pipeline(body=body, max_workers=max_workers, debug=debug, queue_size=queue_size,
+                                           parse=parse, checkpoint=checkpoint)
+
+    def _conversation_pipeline(self, body: dict, max_workers: int, debug: bool, queue_size: int,
+                               parse: Optional[Callable[[List[dict]], Conversations]] = None,
+                               checkpoint: Optional[str] = None, raw: bool = False) -> Iterator:
+        # Yields parsed pages, decoded record lists, or with raw, (record count, undecoded response) of each page.
+
+        journal = Checkpoint(path=checkpoint, search={'source': 'conversations', 'body': body}) if checkpoint else None
+
+        initial_content = self.conversations_endpoint_content(
             body=body, url_parameters={'offset': 0, 'limit': 100, 'sort': None}
         )
+        initial_payload = decode_json(initial_content)
         count = initial_payload['_metadata']['count']
 
         if count == 0:
-            if raw_data:
-                return []
-            else:
-                return None
+            return
+
+        def download(offset: int) -> Tuple[int, bytes]:
+            content = self.conversations_endpoint_content(
+                body=body, url_parameters={'offset': offset, 'limit': 100, 'sort': None}
+            )
+            if debug:
+                print('Record Count: {}, Offset: {} finished.'.format(count, offset))
+            return offset, content
+
+        if raw:
+            # Responses are passed on undecoded, with the number of records each one actually holds.
+            yield len(initial_payload.get('conversationHistoryRecords') or ()), initial_content
+            pages = Pipeline(stages=[(download, max_workers)], queue_size=queue_size).run(items=range(100, count, 100))
+            for offset, content in pages:
+                yield page_record_count(content), content
+            return
+
+        offsets = range(100, count, 100)
+
+        if journal:
+            journal.check_layout(count=count, page_size=100)
+            # Pages completed by an earlier run are read back from disk instead of downloaded.
+            for records in journal.pages(offsets=set(range(0, count, 100))):
+                yield parse(records) if parse else records
+            offsets = [offset for offset in offsets if offset not in journal]
+
+        if journal is None or 0 not in journal:
+            records = initial_payload.pop('conversationHistoryRecords')
+            if journal:
+                journal.write_page(offset=0, records=records)
+            yield parse(records) if parse else records
+
+        def decode(page: Tuple[int, bytes]) -> List[dict]:
+            offset, content = page
+            records = decode_json(content)['conversationHistoryRecords']
+            if journal:
+                journal.write_page(offset=offset, records=records)
+            return records
+
+        stages = [(download, max_workers), (decode, 1)]
+        if parse:
+            stages.append((parse, 1))
+
+        yield from Pipeline(stages=stages, queue_size=queue_size).run(items=offsets)
+
+    def archive_conversations(self, body: dict, path: str, max_workers: int = 10, compresslevel: int = 1,
+                              debug: bool = False) -> int:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-messaging-interactions-conversations.html
 
-        conversation_history_records = [record for record in initial_payload['conversationHistoryRecords']]
+        Writes the raw conversationHistoryRecords of the search to a compressed newline delimited JSON file, streaming
+        each page to disk as it completes.  Responses are written as received, one page per line, and only decoded to
+        count their records.  Read the records back with read_archive.
 
-        # Multi-threading to handle multiple requests at a time.
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_requests = {
-                executor.submit(self.conversations_endpoint, body, {'offset': offset, 'limit': 100, 'sort': None}):
-                    offset for offset in range(100, count, 100)
-            }
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param path: REQUIRED File to write.  Example: './conversations.ndjson.gz'
+        :param max_workers: Number of workers for requests.
+        :param compresslevel: Gzip compression level from 0 to 9.  Default 1 favours speed over size.
+        :param debug: Prints data collection process.
+        :return: Number of records written.
+        """
 
-            for future in concurrent.futures.as_completed(future_requests):
-                if debug:
-                    print('Record Count: {}, Offset: {} finished.'.format(count, future_requests[future]))
-                # Add data to results.
-                records = future.result()['conversationHistoryRecords']
-                conversation_history_records.extend([record for record in records])
+        with NdjsonArchive(path=path, compresslevel=compresslevel) as archive:
+            for records, content in self._conversation_pipeline(body=body, max_workers=max_workers, debug=debug,
+                                                                queue_size=4, raw=True):
+                archive.write_page_content(content=content, records=records)
+            return archive.count
 
-        if raw_data:
-            return conversation_history_records
-        else:
-            conversations = Conversations()
-            conversations.append_records(records=conversation_history_records)
-            return conversations
+    def conversation_cache(self, path: str, settle: int = 3600000) -> ConversationCache:
+        """
+        Creates a ConversationCache, which serves the already fetched parts of a search from disk and downloads only
+        the missing time ranges.
+
+        :param path: REQUIRED Cache directory.  Example: './mi_cache'
+        :param settle: Milliseconds before the fetch time that are not cached, because their conversations may still
+         change.  Default: one hour.
+        :return: ConversationCache using this connection.
+        """
+
+        return ConversationCache(mi_conn=self, path=path, settle=settle)
+
+    def incremental_sync(self, state_path: str, initial_from: Optional[int] = None,
+                         overlap: int = 600000) -> IncrementalSync:
+        """
+        Creates an IncrementalSync, which fetches only the conversations that changed since its previous run.
+
+        :param state_path: REQUIRED JSON file holding the watermark of each account.  Example: './mi_sync.json'
+        :param initial_from: Epoch milliseconds to sync from when there is no watermark yet.  Default: one day back.
+        :param overlap: Milliseconds before the watermark searched again on every run.  Default: 10 minutes.
+        :return: IncrementalSync using this connection.
+        """
+
+        return IncrementalSync(mi_conn=self, state_path=state_path, initial_from=initial_from, overlap=overlap)
+
+    def open_conversation_poller(self, body: Optional[dict] = None, lookback: int = 86400000) -> OpenConversationPoller:
+        """
+        Creates an OpenConversationPoller, which emits only the new messages, transfers and closes of open
+        conversations on each poll.
+
+        :param body: Search filters, as in conversations.  start and status are set by the poller.
+        :param lookback: Milliseconds before each poll that open conversations are searched from.  Default: one day.
+        :return: OpenConversationPoller using this connection.
+        """
+
+        return OpenConversationPoller(mi_conn=self, body=body, lookback=lookback)
 
     def get_conversation_by_conversation_id(self, conversation_id: str) -> Conversations:
         """
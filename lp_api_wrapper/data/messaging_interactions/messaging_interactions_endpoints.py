@@ -14,6 +14,7 @@ summary, participated agents, the reason the conversation was closed etc.
 
 import concurrent.futures
 import requests
+from ...util.json_decoder import decode_json
 from ...util.login_service import (LoginService, UserLogin, OAuthLogin)
 from typing import List, Optional, Union
 
@@ -36,6 +37,20 @@ class MessagingInteractionsEndpoints(LoginService):
         :return: Dictionary with same structure as the JSON data from the API.
         """
 
+        return decode_json(self.conversations_endpoint_content(body=body, url_parameters=url_parameters))
+
+    def conversations_endpoint_content(self, body: dict, url_parameters: dict) -> bytes:
+        """
+        Documentation:
+        https://developers.liveperson.com/data_api-messaging-interactions-conversations.html
+
+        Same as conversations_endpoint, but returns the undecoded response body so decoding can happen elsewhere.
+
+        :param body: REQUIRED Enter body parameters that are the same as the API documentation.
+        :param url_parameters: REQUIRED Enter url parameters that are the same as the API documentation.
+        :return: JSON response body as bytes.
+        """
+
         # Establish Authorization
         auth_args = self.authorize(headers={'content-type': 'application/json'})
 
@@ -52,7 +67,7 @@ class MessagingInteractionsEndpoints(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return r.content
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -149,7 +164,7 @@ class MessagingInteractionsEndpoints(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -180,7 +195,7 @@ class MessagingInteractionsEndpoints(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
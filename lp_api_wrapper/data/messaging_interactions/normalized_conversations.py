@@ -0,0 +1,244 @@
+"""
+Provides a normalized form of the Conversations data object.
+
+Agent, agent group and skill names are stored once in the agents, agent_groups and skills dimension tables.  The
+info, agent_participant, transfer and interaction fact tables keep only their IDs, and agent_participant and
+agent_participant_active are merged into one table with an active flag.  Every other table, such as message_record,
+campaign and survey, is carried through unchanged.  When an agent, group or skill is renamed, its dimension row holds
+the most recent name seen.
+
+Pages can be normalized as they are parsed (MessagingInteractions.conversations(normalize=True)), so the full
+Conversations object is never built.  normalized_pages yields one NormalizedConversations per page whose dimension
+tables hold only the agents, groups and skills that are new or changed since the previous page, so writing the pages
+does not repeat dimension rows.
+
+Usage Example:
+    > conversations = mi_conn.conversations(body)
+    > normalized = conversations.normalize()
+    > normalized.agents
+"""
+
+from collections import namedtuple
+from .conversations import (Conversations, Info, TABLES)
+from typing import (Dict, Iterable, Iterator, List, Optional)
+
+# Dimension tables.
+Agent = namedtuple(
+    typename='Agent',
+    field_names=['agent_id', 'agent_full_name', 'agent_login_name', 'agent_nickname', 'agent_pid', 'agent_deleted',
+                 'user_type', 'user_type_name']
+)
+
+AgentGroup = namedtuple(
+    typename='AgentGroup',
+    field_names=['agent_group_id', 'agent_group_name']
+)
+
+Skill = namedtuple(
+    typename='Skill',
+    field_names=['skill_id', 'skill_name']
+)
+
+# Fact tables.
+_INFO_NAME_FIELDS = ('latest_agent_full_name', 'latest_agent_group_name', 'latest_agent_login_name',
+                     'latest_agent_nickname', 'latest_skill_name')
+
+InfoFact = namedtuple(
+    typename='InfoFact',
+    field_names=[field for field in Info._fields if field not in _INFO_NAME_FIELDS]
+)
+
+AgentParticipantFact = namedtuple(
+    typename='AgentParticipantFact',
+    field_names=['conversation_id', 'agent_id', 'agent_group_id', 'permission', 'role', 'time', 'time_l', 'active']
+)
+
+TransferFact = namedtuple(
+    typename='TransferFact',
+    field_names=['conversation_id', 'assigned_agent_id', 'by', 'context_data', 'reason', 'source_agent_id',
+                 'source_skill_id', 'target_skill_id', 'time', 'time_l']
+)
+
+InteractionFact = namedtuple(
+    typename='InteractionFact',
+    field_names=['conversation_id', 'assigned_agent_id', 'interaction_time', 'interaction_time_l',
+                 'interactive_sequence']
+)
+
+# Conversations tables that are normalized, and so not carried through as they are.
+_NORMALIZED_SOURCE_TABLES = ('info', 'agent_participant', 'agent_participant_active', 'transfer', 'interaction')
+
+# Conversations tables carried through unchanged, such as message_record, campaign and survey.
+PASSTHROUGH_TABLES = tuple(table for table in TABLES if table not in _NORMALIZED_SOURCE_TABLES)
+
+# Maps each NormalizedConversations table attribute to the row type it stores.
+NORMALIZED_TABLES = dict([
+    ('agents', Agent),
+    ('agent_groups', AgentGroup),
+    ('skills', Skill),
+    ('info', InfoFact),
+    ('agent_participant', AgentParticipantFact),
+    ('transfer', TransferFact),
+    ('interaction', InteractionFact)
+] + [(table, TABLES[table]) for table in PASSTHROUGH_TABLES])
+
+
+class _Dimension:
+    # Keeps the most recently seen non missing value of every field of each ID.
+    def __init__(self, row_type) -> None:
+        self.row_type = row_type
+        self.width = len(row_type._fields)
+        self.values: Dict[object, list] = {}
+        self.times: Dict[object, list] = {}
+        # Keys added or changed since the last call of changed_rows.
+        self.changed = set()
+
+    def observe(self, key, time_l: Optional[int], *values) -> None:
+        if key is None:
+            return
+
+        if key not in self.values:
+            self.values[key] = [key] + [None] * (self.width - 1)
+            self.times[key] = [None] * self.width
+
+            self.changed.add(key)
+
+        current = self.values[key]
+        times = self.times[key]
+        for i, value in enumerate(values, start=1):
+            if value is None:
+                continue
+            seen = times[i]
+            if current[i] is None or seen is None or (time_l is not None and time_l >= seen):
+                if current[i] != value:
+                    self.changed.add(key)
+                current[i] = value
+                times[i] = time_l
+
+    def rows(self) -> list:
+        self.changed.clear()
+        return [self.row_type._make(values) for values in self.values.values()]
+
+    def changed_rows(self) -> list:
+        rows = [self.row_type._make(self.values[key]) for key in self.values if key in self.changed]
+        self.changed.clear()
+        return rows
+
+
+class NormalizedConversations:
+    TABLES = NORMALIZED_TABLES
+
+    def __init__(self, dimensions_from: Optional['NormalizedConversations'] = None) -> None:
+        """
+        :param dimensions_from: NormalizedConversations whose dimension state is shared, so that with
+         append(changed_only=True) only agents, groups and skills not already emitted by either are emitted.
+        """
+
+        self.agents: List[Agent] = []
+        self.agent_groups: List[AgentGroup] = []
+        self.skills: List[Skill] = []
+        self.info: List[InfoFact] = []
+        self.agent_participant: List[AgentParticipantFact] = []
+        self.transfer: List[TransferFact] = []
+        self.interaction: List[InteractionFact] = []
+        for table in PASSTHROUGH_TABLES:
+            setattr(self, table, [])
+
+        if dimensions_from is None:
+            self._agents = _Dimension(row_type=Agent)
+            self._agent_groups = _Dimension(row_type=AgentGroup)
+            self._skills = _Dimension(row_type=Skill)
+        else:
+            self._agents = dimensions_from._agents
+            self._agent_groups = dimensions_from._agent_groups
+            self._skills = dimensions_from._skills
+
+    def append(self, conversations: Conversations, changed_only: bool = False) -> None:
+        """
+        Normalizes and appends every row of a Conversations object, such as a page from
+        MessagingInteractions.conversation_pages.  Dimension tables are updated with any new or renamed agents, agent
+        groups and skills, and every other table is appended unchanged.
+
+        :param conversations: Conversations data object to append.
+        :param changed_only: Append to the dimension tables only the rows that are new or changed since the dimension
+         state was last read, instead of replacing them with every row.  Used to write pages without repeating
+         dimension rows.
+        """
+
+        info_positions = [Info._fields.index(field) for field in InfoFact._fields]
+        for row in conversations.info:
+            time_l = row.end_time_l or row.start_time_l
+            self._agents.observe(row.latest_agent_id, time_l, row.latest_agent_full_name, row.latest_agent_login_name,
+                                 row.latest_agent_nickname, None, row.agent_deleted)
+            self._agent_groups.observe(row.latest_agent_group_id, time_l, row.latest_agent_group_name)
+            self._skills.observe(row.latest_skill_id, time_l, row.latest_skill_name)
+            values = tuple(row)
+            self.info.append(InfoFact._make([values[i] for i in info_positions]))
+
+        # Participants listed in agent_participant_active are flagged as active instead of being stored twice.
+        active = {
+            (row.conversation_id, row.agent_id, row.time_l) for row in conversations.agent_participant_active
+        }
+        seen = set()
+        for row in conversations.agent_participant + conversations.agent_participant_active:
+            key = (row.conversation_id, row.agent_id, row.time_l)
+            if key in seen:
+                continue
+            seen.add(key)
+            self._agents.observe(row.agent_id, row.time_l, row.agent_full_name, row.agent_login_name,
+                                 row.agent_nickname, row.agent_pid, row.agent_deleted, row.user_type,
+                                 row.user_type_name)
+            self._agent_groups.observe(row.agent_group_id, row.time_l, row.agent_group_name)
+            self.agent_participant.append(
+                AgentParticipantFact(row.conversation_id, row.agent_id, row.agent_group_id, row.permission, row.role,
+                                     row.time, row.time_l, key in active)
+            )
+
+        for row in conversations.transfer:
+            self._agents.observe(row.assigned_agent_id, row.time_l, row.assigned_agent_full_name,
+                                 row.assigned_agent_login_name, row.assigned_agent_nickname)
+            self._agents.observe(row.source_agent_id, row.time_l, row.source_agent_full_name,
+                                 row.source_agent_login_name, row.source_agent_nickname)
+            self._skills.observe(row.source_skill_id, row.time_l, row.source_skill_name)
+            self._skills.observe(row.target_skill_id, row.time_l, row.target_skill_name)
+            self.transfer.append(
+                TransferFact(row.conversation_id, row.assigned_agent_id, row.by, row.context_data, row.reason,
+                             row.source_agent_id, row.source_skill_id, row.target_skill_id, row.time, row.time_l)
+            )
+
+        for row in conversations.interaction:
+            self._agents.observe(row.assigned_agent_id, row.interaction_time_l, row.assigned_agent_full_name,
+                                 row.assigned_agent_login_name, row.assigned_agent_nickname)
+            self.interaction.append(
+                InteractionFact(row.conversation_id, row.assigned_agent_id, row.interaction_time,
+                                row.interaction_time_l, row.interactive_sequence)
+            )
+
+        for table in PASSTHROUGH_TABLES:
+            getattr(self, table).extend(getattr(conversations, table))
+
+        if changed_only:
+            self.agents.extend(self._agents.changed_rows())
+            self.agent_groups.extend(self._agent_groups.changed_rows())
+            self.skills.extend(self._skills.changed_rows())
+        else:
+            self.agents = self._agents.rows()
+            self.agent_groups = self._agent_groups.rows()
+            self.skills = self._skills.rows()
+
+
+def normalized_pages(pages: Iterable[Conversations]) -> Iterator[NormalizedConversations]:
+    """
+    Normalizes pages one at a time.  Each page's Conversations can be released once its NormalizedConversations is
+    yielded.
+
+    :param pages: Conversations pages, such as MessagingInteractions.conversation_pages.
+    :return: Iterator of NormalizedConversations, one per page.  Fact and carried through tables hold the rows of the
+     page; dimension tables hold only the rows new or changed since the previous page.
+    """
+
+    state = NormalizedConversations()
+    for page in pages:
+        normalized = NormalizedConversations(dimensions_from=state)
+        normalized.append(conversations=page, changed_only=True)
+        yield normalized
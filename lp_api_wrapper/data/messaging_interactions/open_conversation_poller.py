@@ -0,0 +1,156 @@
+"""
+Provides change data capture for open Messaging Interactions conversations.
+
+The poller searches for open conversations on every poll and keeps a fingerprint of each one: its number of messages,
+latest message seq and number of transfers.  A conversation whose fingerprint is unchanged is skipped without further
+work, so only conversations that moved are sliced and passed on.  Deltas carry only the messages after the last seq
+seen and the transfers after the last transfer seen.  A tracked conversation that is no longer returned as open is
+fetched once by conversation ID, and its final delta is emitted with closed set.
+
+The search starts lookback before the poll, or at the start time of the oldest tracked open conversation if that is
+earlier, so conversations open longer than lookback are still found by the search instead of fetched one by one.
+Fingerprints are only updated once a poll completes, so a poll that fails part way is repeated in full by the next one.
+
+Usage Example:
+    > poller = mi_conn.open_conversation_poller(body={'skillIds': ['12']})
+    > for delta in poller.stream(interval=30):
+    >     print(delta.conversation_id, len(delta.messages), delta.closed)
+"""
+
+import time
+from collections import namedtuple
+from typing import (Dict, Iterator, List, Optional, Tuple)
+
+ConversationDelta = namedtuple(
+    typename='ConversationDelta',
+    field_names=['conversation_id', 'status', 'new', 'closed', 'messages', 'transfers', 'record']
+)
+
+_DAY_MS = 86400000
+
+
+def fingerprint(record: dict) -> Tuple[int, int, int]:
+    """
+    :param record: conversationHistoryRecord.
+    :return: (message count, latest message seq, transfer count) of the conversation.
+    """
+    messages = record.get('messageRecords') or ()
+    latest_seq = max((message.get('seq', -1) for message in messages), default=-1)
+    return len(messages), latest_seq, len(record.get('transfers') or ())
+
+
+class OpenConversationPoller:
+    def __init__(self, mi_conn, body: Optional[dict] = None, lookback: int = _DAY_MS) -> None:
+        """
+        :param mi_conn: MessagingInteractions connection.
+        :param body: Search filters, as in MessagingInteractions.conversations.  start and status are set by the
+         poller.
+        :param lookback: Milliseconds before each poll that open conversations are searched from.  Default: one day.
+        """
+
+        self.mi_conn = mi_conn
+        self.body = body or {}
+        self.lookback = lookback
+
+        # Fingerprint and start time of each tracked open conversation.
+        self.fingerprints: Dict[str, Tuple[int, int, int]] = {}
+        self.start_times: Dict[str, int] = {}
+
+    def _delta(self, record: dict, updates: Dict[str, Optional[Tuple[int, int, int, int]]]
+               ) -> Optional[ConversationDelta]:
+        # Delta of the record against its fingerprint, or None if the conversation is unchanged and still open.  The
+        # new fingerprint and start time, or None once closed, are put in updates.
+        info = record['info']
+        conversation_id, status = info['conversationId'], info.get('status')
+        closed = status != 'OPEN'
+
+        current = fingerprint(record)
+        previous = self.fingerprints.get(conversation_id)
+
+        if closed:
+            updates[conversation_id] = None
+        else:
+            start_time = info.get('startTimeL', self.start_times.get(conversation_id))
+            updates[conversation_id] = current + (start_time,)
+
+        if previous == current and not closed:
+            return None
+
+        if previous is None:
+            messages = record.get('messageRecords') or []
+            transfers = record.get('transfers') or []
+        else:
+            messages = [message for message in record.get('messageRecords') or ()
+                        if message.get('seq', -1) > previous[1]]
+            transfers = (record.get('transfers') or [])[previous[2]:]
+
+        return ConversationDelta(conversation_id, status, previous is None, closed, messages, transfers, record)
+
+    def poll(self, now: Optional[int] = None, max_workers: int = 10, debug: bool = False) -> List[ConversationDelta]:
+        """
+        Searches for open conversations once.
+
+        :param now: Epoch milliseconds the search ends at.  Default: the current time.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :return: List of ConversationDelta for conversations that are new, changed or closed since the last poll.
+        """
+
+        if now is None:
+            now = int(time.time() * 1000)
+
+        search = dict(self.body)
+        tracked_from = [start_time for start_time in self.start_times.values() if start_time is not None]
+        search['start'] = {'from': min([now - self.lookback] + tracked_from), 'to': now}
+        search['status'] = ['OPEN']
+
+        deltas = []
+        seen = set()
+        updates: Dict[str, Optional[Tuple[int, int, int, int]]] = {}
+        for page in self.mi_conn.conversation_record_pages(body=search, max_workers=max_workers, debug=debug):
+            for record in page:
+                conversation_id = record['info']['conversationId']
+                if conversation_id in seen:
+                    continue
+                seen.add(conversation_id)
+
+                delta = self._delta(record, updates)
+                if delta:
+                    deltas.append(delta)
+
+        # Tracked conversations that are no longer open are fetched once to capture their final messages.
+        for conversation_id in [key for key in self.fingerprints if key not in seen]:
+            payload = self.mi_conn.get_conversation_by_conversation_id_endpoint(conversation_id=conversation_id)
+            records = payload.get('conversationHistoryRecords') or []
+            if not records:
+                updates[conversation_id] = None
+                continue
+
+            delta = self._delta(records[0], updates)
+            if delta:
+                deltas.append(delta)
+
+        for conversation_id, update in updates.items():
+            if update is None:
+                self.fingerprints.pop(conversation_id, None)
+                self.start_times.pop(conversation_id, None)
+            else:
+                self.fingerprints[conversation_id] = update[:3]
+                self.start_times[conversation_id] = update[3]
+
+        return deltas
+
+    def stream(self, interval: float = 30, max_workers: int = 10, debug: bool = False) -> Iterator[ConversationDelta]:
+        """
+        Polls forever, yielding each delta as its poll completes.
+
+        :param interval: Seconds between the starts of consecutive polls.
+        :param max_workers: Number of workers for requests.
+        :param debug: Prints data collection process.
+        :return: Iterator of ConversationDelta.
+        """
+
+        while True:
+            started = time.monotonic()
+            yield from self.poll(max_workers=max_workers, debug=debug)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
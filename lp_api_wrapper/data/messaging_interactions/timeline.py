@@ -0,0 +1,84 @@
+"""
+Reconstructs the ordered timeline of events of a conversation.
+
+The rows of each table belonging to a conversation are found through the conversation_id index of the table, so no
+table is scanned.  Rows of one table are already in time order in API responses, so each table's rows form a sorted
+stream and the streams are combined with a k-way merge (heapq.merge) instead of sorting every event.  A stream that is
+out of order is sorted on its own first.  Events with equal times keep the order of TIMELINE_TABLES, and events without
+a time come last.
+
+Usage Example:
+    > for event in conversations.timeline(conversation_id='abc'):
+    >     print(event.time_l, event.table, event.row)
+"""
+
+import heapq
+from collections import namedtuple
+from typing import (Iterator, List, Optional, Sequence, Tuple)
+
+TimelineEvent = namedtuple(
+    typename='TimelineEvent',
+    field_names=['time_l', 'table', 'row']
+)
+
+# Tables merged into a timeline, and their order for events at the same time.
+TIMELINE_TABLES = ('agent_participant', 'interaction', 'transfer', 'message_record', 'message_status')
+
+# Field holding the epoch millisecond time of each timeline table's rows.
+TIME_FIELD = {
+    'agent_participant': 'time_l',
+    'interaction': 'interaction_time_l',
+    'transfer': 'time_l',
+    'message_record': 'time_l',
+    'message_status': 'time_l'
+}
+
+
+def _sort_key(event: TimelineEvent) -> Tuple[bool, int]:
+    return event.time_l is None, event.time_l or 0
+
+
+def _stream(table: str, rows: list) -> List[TimelineEvent]:
+    # The rows of one table as events, sorted only if they are not already in time order.
+    field = TIME_FIELD[table]
+    events = [TimelineEvent(getattr(row, field), table, row) for row in rows]
+    keys = [_sort_key(event) for event in events]
+    if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+        events.sort(key=_sort_key)
+    return events
+
+
+def conversation_timeline(conversations, conversation_id: str,
+                          tables: Sequence[str] = TIMELINE_TABLES) -> List[TimelineEvent]:
+    """
+    :param conversations: Conversations data object.
+    :param conversation_id: ID of the conversation.
+    :param tables: Tables to merge, from TIMELINE_TABLES.  Default: all of them.
+    :return: List of TimelineEvent in time order.
+    """
+
+    unknown = [table for table in tables if table not in TIME_FIELD]
+    if unknown:
+        raise ValueError('Timelines can only merge: {}'.format(', '.join(TIMELINE_TABLES)))
+
+    streams = [
+        _stream(table, conversations.lookup(table=table, field='conversation_id', value=conversation_id))
+        for table in tables
+    ]
+    return list(heapq.merge(*streams, key=_sort_key))
+
+
+def conversation_timelines(conversations, conversation_ids: Optional[Sequence[str]] = None,
+                           tables: Sequence[str] = TIMELINE_TABLES) -> Iterator[Tuple[str, List[TimelineEvent]]]:
+    """
+    :param conversations: Conversations data object.
+    :param conversation_ids: IDs of the conversations.  Default: every conversation in info, in info order.
+    :param tables: Tables to merge, from TIMELINE_TABLES.  Default: all of them.
+    :return: Iterator of (conversation_id, list of TimelineEvent in time order).
+    """
+
+    if conversation_ids is None:
+        conversation_ids = list(conversations.index(table='info', field='conversation_id'))
+
+    for conversation_id in conversation_ids:
+        yield conversation_id, conversation_timeline(conversations, conversation_id=conversation_id, tables=tables)
@@ -0,0 +1,154 @@
+"""
+Provides an inverted full-text index over the message_data text of Conversations.message_record.
+
+Messages are split into lowercase word tokens.  Each term has a posting list of the message_record row and token
+position of every occurrence, stored in compact arrays.  A row identifies the conversation_id and seq of the message,
+so term, phrase and prefix queries return matching conversations without scanning any text.
+
+The index is built on first use and extended with any messages appended since.
+
+Usage Example:
+    > index = conversations.transcript_index()
+    > index.term('refund')
+    > index.phrase('cancel my order')
+    > index.prefix('refund', messages=True)
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import (Dict, Iterable, List, Set, Tuple, Union)
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    :param text: Message text.
+    :return: Lowercase word tokens, in order.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class TranscriptIndex:
+    def __init__(self, conversations) -> None:
+        """
+        :param conversations: Conversations data object whose message_record is indexed.
+        """
+
+        self.conversations = conversations
+
+        # Term -> (message_record rows, token positions), one entry per occurrence in row order.
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._indexed_count = 0
+
+        # Sorted terms for prefix queries, rebuilt when new terms are added.
+        self._terms: List[str] = []
+        self._terms_stale = False
+
+    def update(self) -> None:
+        """
+        Indexes messages appended to message_record since the last update.  Called by every query.
+        """
+
+        columns = self.conversations.columns(table='message_record')
+        texts = columns['message_data']
+
+        # Rebuild if messages were removed since the index was built.
+        if self._indexed_count > len(texts):
+            self._postings, self._indexed_count, self._terms = {}, 0, []
+
+        postings = self._postings
+        for row in range(self._indexed_count, len(texts)):
+            text = texts[row]
+            if not text:
+                continue
+            for position, term in enumerate(tokenize(text)):
+                posting = postings.get(term)
+                if posting is None:
+                    posting = postings[term] = (array('q'), array('i'))
+                    self._terms_stale = True
+                posting[0].append(row)
+                posting[1].append(position)
+
+        self._indexed_count = len(texts)
+
+    def term(self, term: str, messages: bool = False) -> Union[List[str], List[Tuple[str, int]]]:
+        """
+        :param term: Single word.  Matching is case insensitive.
+        :param messages: Return (conversation_id, seq) of each matching message instead of conversation IDs.
+        :return: Matching conversation IDs, or messages, in message_record order.
+        """
+        self.update()
+        return self._results(self._rows(term.lower()), messages=messages)
+
+    def phrase(self, phrase: str, messages: bool = False) -> Union[List[str], List[Tuple[str, int]]]:
+        """
+        :param phrase: Words that must appear consecutively in one message.  Matching is case insensitive.
+        :param messages: Return (conversation_id, seq) of each matching message instead of conversation IDs.
+        :return: Matching conversation IDs, or messages, in message_record order.
+        """
+
+        self.update()
+        terms = tokenize(phrase)
+        if not terms:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+
+        # Only messages holding every term can match.  Starting from the rarest term keeps the candidate set small.
+        candidates = None
+        for rows, _ in sorted(postings, key=lambda posting: len(posting[0])):
+            candidates = set(rows) if candidates is None else candidates.intersection(rows)
+            if not candidates:
+                return []
+
+        # Occurrences of each term are shifted back by the term's offset in the phrase, so a phrase match is a
+        # (row, start position) present for every term.
+        starts = None
+        for offset, (rows, positions) in enumerate(postings):
+            shifted = {(row, position - offset) for row, position in zip(rows, positions) if row in candidates}
+            starts = shifted if starts is None else starts & shifted
+            if not starts:
+                return []
+
+        return self._results({row for row, _ in starts}, messages=messages)
+
+    def prefix(self, prefix: str, messages: bool = False) -> Union[List[str], List[Tuple[str, int]]]:
+        """
+        :param prefix: Beginning of a word.  Matching is case insensitive.
+        :param messages: Return (conversation_id, seq) of each matching message instead of conversation IDs.
+        :return: Conversation IDs, or messages, with any term starting with prefix, in message_record order.
+        """
+
+        self.update()
+        prefix = prefix.lower()
+
+        if self._terms_stale:
+            self._terms = sorted(self._postings)
+            self._terms_stale = False
+
+        rows: Set[int] = set()
+        for i in range(bisect_left(self._terms, prefix), len(self._terms)):
+            if not self._terms[i].startswith(prefix):
+                break
+            rows.update(self._postings[self._terms[i]][0])
+
+        return self._results(rows, messages=messages)
+
+    def _rows(self, term: str) -> Set[int]:
+        posting = self._postings.get(term)
+        return set(posting[0]) if posting else set()
+
+    def _results(self, rows: Iterable[int], messages: bool) -> Union[List[str], List[Tuple[str, int]]]:
+        columns = self.conversations.columns(table='message_record')
+        conversation_ids = columns['conversation_id']
+
+        if messages:
+            seqs = columns['seq']
+            return [(conversation_ids[row], seqs[row]) for row in sorted(rows)]
+
+        # Conversation IDs once each, in order of their first matching message.
+        return list(dict.fromkeys(conversation_ids[row] for row in sorted(rows)))
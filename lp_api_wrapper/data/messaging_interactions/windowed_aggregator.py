@@ -0,0 +1,178 @@
+"""
+Provides rolling conversation metrics that are updated page by page, without keeping the conversations.
+
+Each page's info rows are folded into panes: running totals per slide interval and key, such as per hour, skill and
+agent.  The page can then be discarded, so memory depends on the number of panes and keys, not on the number of
+conversations.  Tumbling windows are windows whose slide equals their size; sliding windows sum size / slide
+consecutive panes.  Panes older than retention before the latest conversation seen are dropped, so a long running
+dashboard keeps a fixed amount of state.
+
+conversation_pages yields pages in completion order, not start time order, so a page can arrive holding conversations
+of panes already dropped.  Those rows are skipped and counted in late_rows rather than folded into a new pane, which
+would otherwise be reported as a complete window holding partial totals.
+
+Usage Example:
+    > aggregator = WindowedAggregator(size=3600000, by=('skill',))
+    > aggregator.consume(mi_conn.conversation_pages(body))
+    > aggregator.windows()
+"""
+
+from collections import namedtuple
+from .conversations import Conversations
+from .kpis import GROUP_KEYS
+from typing import (Dict, Iterable, List, Optional, Sequence, Tuple)
+
+_HOUR_MS = 3600000
+
+# Row types of the window tables, keyed by group by key names.
+_WINDOW_TYPES = {}
+
+WINDOW_FIELDS = ('conversations', 'average_duration', 'average_csat', 'csat_count')
+
+
+def window_type(by: Sequence[str]) -> type:
+    """
+    :param by: Group by key names: 'agent' and/or 'skill'.
+    :return: namedtuple type of the window rows: window_start, window_end, the group fields, then WINDOW_FIELDS.
+    """
+    by = tuple(by)
+    if by not in _WINDOW_TYPES:
+        _WINDOW_TYPES[by] = namedtuple(
+            typename='Window',
+            field_names=['window_start', 'window_end'] + [GROUP_KEYS[key][0] for key in by] + list(WINDOW_FIELDS)
+        )
+    return _WINDOW_TYPES[by]
+
+
+class WindowedAggregator:
+    def __init__(self, size: int = _HOUR_MS, slide: Optional[int] = None, by: Sequence[str] = ('skill', 'agent'),
+                 time_field: str = 'start_time_l', retention: Optional[int] = None) -> None:
+        """
+        :param size: Window length in milliseconds.  Default: one hour
+        :param slide: Milliseconds between the starts of consecutive windows.  size must be a multiple of slide.
+         Default: size, which gives tumbling windows.
+        :param by: Group by key names: 'agent' and/or 'skill'.  Default: ('skill', 'agent')
+        :param time_field: Epoch millisecond field of info that places a conversation in a window.
+         Default: 'start_time_l'
+        :param retention: Milliseconds of panes to keep before the latest conversation seen.  Rows of panes already
+         dropped are skipped and counted in late_rows.  Default: keep all panes.
+        """
+
+        slide = slide or size
+        if size <= 0 or slide <= 0 or size % slide:
+            raise ValueError('size and slide must be positive, and size must be a multiple of slide.')
+
+        by = tuple(by)
+        if any(key not in ('agent', 'skill') for key in by):
+            raise ValueError('by may only contain agent and skill.')
+
+        self.size = size
+        self.slide = slide
+        self.by = by
+        self.time_field = time_field
+        self.retention = retention
+
+        # Latest time seen, in epoch milliseconds.
+        self.watermark: Optional[int] = None
+
+        # Panes starting before this epoch millisecond time have been dropped, and rows that fall in them are skipped.
+        self.evicted_before: Optional[int] = None
+        # Number of rows skipped because their pane had been dropped.
+        self.late_rows = 0
+
+        # Totals of each pane: (pane start, key values) -> [conversations, duration total, duration count,
+        # csat total, csat count].
+        self._panes: Dict[Tuple[int, tuple], List[float]] = {}
+
+    def add(self, conversations: Conversations) -> None:
+        """
+        Folds the info rows of a Conversations object, such as a page from MessagingInteractions.conversation_pages,
+        into the panes.
+
+        :param conversations: Conversations data object.
+        """
+
+        columns = conversations.columns(table='info')
+        keys = list(zip(*(columns[GROUP_KEYS[key][1]] for key in self.by))) if self.by else None
+
+        for i, (time_l, duration, csat) in enumerate(zip(columns[self.time_field], columns['duration'],
+                                                         columns['csat'])):
+            if time_l is None:
+                continue
+
+            pane_start = time_l - time_l % self.slide
+            if self.evicted_before is not None and pane_start < self.evicted_before:
+                self.late_rows += 1
+                continue
+
+            pane = (pane_start, keys[i] if keys else ())
+            totals = self._panes.get(pane)
+            if totals is None:
+                totals = self._panes[pane] = [0, 0, 0, 0, 0]
+
+            totals[0] += 1
+            if duration is not None:
+                totals[1] += duration
+                totals[2] += 1
+            if csat is not None:
+                totals[3] += csat
+                totals[4] += 1
+
+            if self.watermark is None or time_l > self.watermark:
+                self.watermark = time_l
+
+        if self.retention is not None and self.watermark is not None:
+            self.evict(before=self.watermark - self.retention)
+
+    def consume(self, pages: Iterable[Conversations]) -> 'WindowedAggregator':
+        """
+        Folds every page of an iterator in turn.  Pages are not kept.
+
+        :param pages: Iterator of Conversations, such as MessagingInteractions.conversation_pages.
+        :return: self
+        """
+        for page in pages:
+            self.add(conversations=page)
+        return self
+
+    def evict(self, before: int) -> None:
+        """
+        Drops panes that start before a time.  Rows that fall in a dropped pane are skipped by later calls of add.
+
+        :param before: Epoch milliseconds.
+        """
+        if self.evicted_before is None or before > self.evicted_before:
+            self.evicted_before = before
+        for pane in [pane for pane in self._panes if pane[0] < before]:
+            del self._panes[pane]
+
+    def windows(self, start: Optional[int] = None, end: Optional[int] = None) -> list:
+        """
+        Returns the metrics of every window holding at least one conversation.
+
+        :param start: Only windows starting at or after this epoch millisecond time.
+        :param end: Only windows starting before this epoch millisecond time.
+        :return: List of namedtuples ordered by window_start.
+        """
+
+        # Each pane contributes to the size / slide windows that contain it.
+        windows: Dict[Tuple[int, tuple], List[float]] = {}
+        for (pane_start, key), totals in self._panes.items():
+            for window_start in range(pane_start - self.size + self.slide, pane_start + 1, self.slide):
+                if (start is not None and window_start < start) or (end is not None and window_start >= end):
+                    continue
+                window = windows.get((window_start, key))
+                if window is None:
+                    windows[(window_start, key)] = list(totals)
+                else:
+                    for i, value in enumerate(totals):
+                        window[i] += value
+
+        row_type = window_type(self.by)
+        return [
+            row_type(window_start, window_start + self.size, *key, count,
+                     duration_total / duration_count if duration_count else None,
+                     csat_total / csat_count if csat_count else None, csat_count)
+            for (window_start, key), (count, duration_total, duration_count, csat_total, csat_count)
+            in sorted(windows.items(), key=lambda item: (item[0][0], [str(value) for value in item[0][1]]))
+        ]
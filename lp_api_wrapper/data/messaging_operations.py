@@ -27,7 +27,7 @@ Usage Example:
 """
 
 import requests
-from ..util import (LoginService, UserLogin, OAuthLogin)
+from ..util import (LoginService, UserLogin, OAuthLogin, decode_json)
 from typing import Optional, Union
 
 
@@ -85,7 +85,7 @@ class MessagingOperations(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -121,7 +121,7 @@ class MessagingOperations(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -167,7 +167,7 @@ class MessagingOperations(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -214,7 +214,7 @@ class MessagingOperations(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -28,7 +28,7 @@ Usage Example:
 """
 
 import requests
-from ..util import (LoginService, UserLogin, OAuthLogin)
+from ..util import (LoginService, UserLogin, OAuthLogin, decode_json)
 from typing import Optional, Union
 
 
@@ -77,7 +77,7 @@ class OperationalRealtime(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -133,7 +133,7 @@ class OperationalRealtime(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -188,7 +188,7 @@ class OperationalRealtime(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -227,7 +227,7 @@ class OperationalRealtime(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -277,7 +277,7 @@ class OperationalRealtime(LoginService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()
+            return decode_json(r.content)
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
@@ -0,0 +1,471 @@
+"""
+Provides RecordTables, the base of the data objects that parse API records into typed tables, such as Conversations
+and Engagements.
+
+Each subclass stores every table as a list of rows and describes its tables with class attributes:
+    TABLES              table attribute -> namedtuple row type
+    COMPACT_TABLES      table attribute -> slot based row type with the same fields
+    FIELD_KEYS          table attribute -> {JSON key: field}, used by the table driven parser
+    FIELD_TRANSFORMS    table attribute -> {JSON key: function applied to the value before it is stored}
+    CATEGORICAL_FIELDS  table attribute -> fields whose strings are dictionary encoded
+    TIME_FIELDS         table attribute -> {epoch millisecond field: string timestamp field}
+    KEY_FIELD           first field of every row, identifying the record it was parsed from
+
+RecordTables provides the parser and the lazily built indexes, columnar views, joins and conversions shared by them.
+"""
+
+from collections import namedtuple
+from operator import attrgetter
+from ..util.categories import Categories
+from typing import (Any, Dict, List, Optional, Tuple)
+
+# Row types generated by RecordTables.join, keyed by (left row type, right row type, output fields).
+_JOIN_TYPES = {}
+
+
+class RecordTables:
+    TABLES: Dict[str, type] = {}
+    COMPACT_TABLES: Dict[str, type] = {}
+    FIELD_KEYS: Dict[str, Dict[str, str]] = {}
+    FIELD_TRANSFORMS: Dict[str, dict] = {}
+    CATEGORICAL_FIELDS: Dict[str, Tuple[str, ...]] = {}
+    TIME_FIELDS: Dict[str, Dict[str, str]] = {}
+    KEY_FIELD = ''
+
+    def __init__(self, categories: Optional[Dict[str, Categories]] = None, compact_rows: bool = False,
+                 drop_time_strings: bool = False) -> None:
+        """
+        :param categories: Dictionary encodings of categorical fields, keyed by field name.  Pass the categories of
+         another object to share one copy of each repeated string between them.
+        :param compact_rows: Store rows as slot based classes (COMPACT_TABLES) instead of namedtuples.  Compact rows
+         have the same fields and support the same attribute, iteration and _fields/_make/_asdict/_replace interface.
+        :param drop_time_strings: Leave the string timestamp fields in TIME_FIELDS, such as time and start_time, as None
+         when parsing.  The same times remain available from the *_time_l fields and datetimes.
+        """
+
+        # Dictionary encoding of the fields in CATEGORICAL_FIELDS, keyed by field name.
+        self.categories: Dict[str, Categories] = {} if categories is None else categories
+
+        # Row type of each table, and the parser of each table built from FIELD_KEYS on first use.
+        self.compact_rows = compact_rows
+        self.drop_time_strings = drop_time_strings
+        self.row_types = self.COMPACT_TABLES if compact_rows else self.TABLES
+        self._parsers: Dict[str, tuple] = {}
+
+        # Lazily built hash indexes, keyed by (table, field).  Each entry holds the index and the row count it covers.
+        self._indexes: Dict[Tuple[str, str], Tuple[Dict[Any, List[int]], int]] = {}
+
+        # Lazily built columnar views, keyed by table.  Each entry holds the columns and the row count they cover.
+        self._columns: Dict[str, Tuple[Dict[str, list], int]] = {}
+
+    def extend(self, other: 'RecordTables') -> None:
+        """
+        Appends every row of another object of the same class, such as the next page of a search.
+
+        :param other: Data object to append.
+        """
+        for table in self.TABLES:
+            getattr(self, table).extend(getattr(other, table))
+
+    def index(self, table: str, field: str) -> Dict[Any, List[int]]:
+        """
+        Returns a hash index of a table, mapping each value of a field to the row positions holding it.
+
+        Indexes are built on first use and extended with any rows appended since, so repeated lookups on
+        fields such as conversation_id, latest_agent_id, agent_id, latest_skill_id or participant_id are O(1).
+
+        :param table: Name of the table attribute.  Example: 'message_record'
+        :param field: Name of the field to index.  Example: 'conversation_id'
+        :return: Dictionary of field value to a list of row positions, in table order.
+        """
+
+        rows = self._table(table)
+
+        if field not in self.TABLES[table]._fields:
+            raise ValueError('{} has no field {}.'.format(table, field))
+
+        get_key = attrgetter(field)
+        index, indexed_count = self._indexes.get((table, field), ({}, 0))
+
+        # Rebuild if rows were removed from the table since the index was built.
+        if indexed_count > len(rows):
+            index, indexed_count = {}, 0
+
+        for i in range(indexed_count, len(rows)):
+            key = get_key(rows[i])
+            if key in index:
+                index[key].append(i)
+            else:
+                index[key] = [i]
+
+        self._indexes[(table, field)] = (index, len(rows))
+
+        return index
+
+    def lookup(self, table: str, field: str, value: Any) -> list:
+        """
+        Returns all rows of a table where field equals value.
+
+        :param table: Name of the table attribute.  Example: 'transfer'
+        :param field: Name of the field to match.  Example: 'conversation_id'
+        :param value: Value to match.
+        :return: List of rows, in table order.
+        """
+
+        return self._rows(table=table, positions=self.index(table=table, field=field).get(value, []))
+
+    def group_by(self, table: str, field: str) -> Dict[Any, list]:
+        """
+        Groups the rows of a table by the value of a field.
+
+        :param table: Name of the table attribute.  Example: 'info'
+        :param field: Name of the field to group by.  Example: 'latest_agent_id'
+        :return: Dictionary of field value to a list of rows, in table order.
+        """
+
+        return {
+            key: self._rows(table=table, positions=positions)
+            for key, positions in self.index(table=table, field=field).items()
+        }
+
+    def columns(self, table: str) -> Dict[str, list]:
+        """
+        Returns a columnar view of a table, mapping each field name to a list of its values in row order.
+
+        Columns are built on first use and extended with any rows appended since.
+
+        :param table: Name of the table attribute.  Example: 'info'
+        :return: Dictionary of field name to column values.
+        """
+
+        rows = self._table(table)
+        fields = self.TABLES[table]._fields
+        columns, column_count = self._columns.get(table, ({field: [] for field in fields}, 0))
+
+        # Rebuild if rows were removed from the table since the columns were built.
+        if column_count > len(rows):
+            columns, column_count = {field: [] for field in fields}, 0
+
+        if column_count < len(rows):
+            for field, values in zip(fields, zip(*rows[column_count:])):
+                columns[field].extend(values)
+
+        self._columns[table] = (columns, len(rows))
+
+        return columns
+
+    def join(self, left: str, right: str, on: Optional[str] = None, right_on: Optional[str] = None,
+             how: str = 'inner', suffix: str = '_right') -> list:
+        """
+        Joins two tables with a hash join on the right table's index.
+
+        Matching row positions are computed once, then every output column is gathered from the columnar views, so
+        enrichments such as info with agent_participant, transfer, message_score or survey need no DataFrame round trip.
+
+        :param left: Name of the left table attribute.  Example: 'info'
+        :param right: Name of the right table attribute.  Example: 'transfer'
+        :param on: Field of the left table to join on.  Default: KEY_FIELD, such as 'conversation_id'
+        :param right_on: Field of the right table to join on.  Defaults to the value of on.
+        :param how: 'inner' keeps matching rows only. 'left' keeps every left row, with None for missing right fields.
+        :param suffix: Appended to right field names that collide with left field names.  Default: '_right'
+        :return: List of namedtuples with the left fields followed by the right fields.
+        """
+
+        if how not in ('inner', 'left'):
+            raise ValueError('how must be inner or left.')
+
+        on = on or self.KEY_FIELD
+        right_on = right_on or on
+        left_keys = self.columns(table=left)[on]
+        right_index = self.index(table=right, field=right_on)
+
+        left_positions = []
+        right_positions = []
+        for i, key in enumerate(left_keys):
+            matches = right_index.get(key)
+            if matches:
+                left_positions.extend([i] * len(matches))
+                right_positions.extend(matches)
+            elif how == 'left':
+                left_positions.append(i)
+                right_positions.append(None)
+
+        left_fields = self.TABLES[left]._fields
+        right_fields = [field for field in self.TABLES[right]._fields if not (field == right_on and right_on == on)]
+        output_fields = tuple(left_fields) + tuple(
+            field + suffix if field in left_fields else field for field in right_fields
+        )
+
+        left_columns = self.columns(table=left)
+        right_columns = self.columns(table=right)
+
+        output_columns = [list(map(left_columns[field].__getitem__, left_positions)) for field in left_fields]
+        for field in right_fields:
+            values = right_columns[field]
+            if how == 'left':
+                output_columns.append([None if j is None else values[j] for j in right_positions])
+            else:
+                output_columns.append(list(map(values.__getitem__, right_positions)))
+
+        key = (self.TABLES[left], self.TABLES[right], output_fields)
+        if key not in _JOIN_TYPES:
+            _JOIN_TYPES[key] = namedtuple(
+                typename=self.TABLES[left].__name__ + self.TABLES[right].__name__, field_names=output_fields
+            )
+        row_type = _JOIN_TYPES[key]
+
+        return list(map(row_type._make, zip(*output_columns)))
+
+    def datetimes(self, table: str, field: str, tz=None):
+        """
+        Converts an epoch millisecond field, such as time_l or start_time_l, into a NumPy datetime64[ms] array in one
+        vectorized pass instead of converting row by row.  Requires numpy.
+
+        :param table: Name of the table attribute.  Example: 'message_record'
+        :param field: Name of the epoch millisecond field.  Example: 'time_l'
+        :param tz: Timezone name, such as 'America/New_York', or a tzinfo object.  Values are local wall clock times in
+         that timezone.  Default: UTC
+        :return: numpy.ndarray of dtype datetime64[ms], in row order.  Missing times are NaT.
+        """
+        from ..util.datetimes import to_datetime64
+
+        columns = self.columns(table=table)
+        if field not in columns:
+            raise ValueError('{} has no field {}.'.format(table, field))
+
+        return to_datetime64(values=columns[field], tz=tz)
+
+    def to_pandas(self, table: str):
+        """
+        Converts a table into a Pandas DataFrame.
+
+        The DataFrame is built from the columnar view of the table, so rows are not re-iterated field by field.
+        Requires pandas.
+
+        :param table: Name of the table attribute.  Example: 'message_record'
+        :return: pandas.DataFrame with one column per field.
+        """
+
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('to_pandas requires pandas.  Install with: pip install pandas')
+
+        return pd.DataFrame(self.columns(table=table), columns=self.TABLES[table]._fields)
+
+    def to_arrow(self, table: str):
+        """
+        Converts a table into a PyArrow Table.
+
+        Column buffers are built directly from the columnar view of the table.  Requires pyarrow.
+
+        :param table: Name of the table attribute.  Example: 'message_record'
+        :return: pyarrow.Table with one column per field.
+        """
+
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError('to_arrow requires pyarrow.  Install with: pip install pyarrow')
+
+        columns = self.columns(table=table)
+        return pa.Table.from_arrays(
+            [pa.array(columns[field]) for field in self.TABLES[table]._fields], names=list(self.TABLES[table]._fields)
+        )
+
+    def _table(self, table: str) -> list:
+        if table not in self.TABLES:
+            raise ValueError('Unknown table {}.  Valid tables: {}'.format(table, ', '.join(self.TABLES)))
+        return getattr(self, table)
+
+    def _rows(self, table: str, positions: List[int]) -> list:
+        rows = self._table(table)
+        return [rows[i] for i in positions]
+
+    def codes(self, table: str, field: str) -> Tuple[List[int], List[Any]]:
+        """
+        Returns the dictionary encoding of a field, so group by operations can work on integer codes.
+
+        :param table: Name of the table attribute.  Example: 'info'
+        :param field: Name of the field.  Example: 'latest_skill_name'
+        :return: Tuple of (code of each row, value of each code).  Missing values have the code -1.
+        """
+
+        categories = self._categories(field=field)
+        encode = categories.encode
+
+        return [-1 if value is None else encode(value) for value in self.columns(table=table)[field]], categories.values
+
+    def _categories(self, field: str) -> Categories:
+        if field not in self.categories:
+            self.categories.setdefault(field, Categories())
+        return self.categories[field]
+
+    def _parser(self, table: str) -> Tuple[Dict[str, int], List[Tuple[int, Categories]], Any]:
+        # Returns the field position of each JSON key, the categorical positions and the row constructor of a table.
+        if table not in self._parsers:
+            fields = self.TABLES[table]._fields
+            dropped = self.TIME_FIELDS[table].values() if self.drop_time_strings else ()
+            self._parsers[table] = (
+                {
+                    key: fields.index(field)
+                    for key, field in self.FIELD_KEYS.get(table, {}).items() if field not in dropped
+                },
+                [(fields.index(field), self._categories(field=field)) for field in self.CATEGORICAL_FIELDS.get(table, ())],
+                self.row_types[table]._make
+            )
+        return self._parsers[table]
+
+    def _make_row(self, table: str, values: list) -> tuple:
+        # Builds a row from its values in field order, replacing categorical strings with their canonical copies.
+        _, categoricals, make = self._parser(table)
+        for position, categories in categoricals:
+            value = values[position]
+            if value.__class__ is str:
+                values[position] = categories.intern(value)
+        return make(values)
+
+    def _set_row(self, table: str, data: dict, record_id: str) -> tuple:
+        return self._set_rows(table=table, data=[data], record_id=record_id)[0]
+
+    def _set_rows(self, table: str, data: List[dict], record_id: str) -> list:
+        # Table driven parser: each JSON key is copied straight into the position of its field, and rows are built
+        # positionally, so no local variables or keyword argument dictionaries are created per row.
+        key_positions, categoricals, make = self._parser(table)
+        transforms = self.FIELD_TRANSFORMS.get(table)
+        width = len(self.TABLES[table]._fields)
+
+        rows = []
+        for item in data:
+            values = [None] * width
+            values[0] = record_id
+
+            for key, value in item.items():
+                position = key_positions.get(key)
+                if position is not None:
+                    if transforms and key in transforms:
+                        value = transforms[key](value)
+                    values[position] = value
+
+            for position, categories in categoricals:
+                value = values[position]
+                if value.__class__ is str:
+                    values[position] = categories.intern(value)
+
+            rows.append(make(values))
+
+        return rows
+
+    def _row_values(self, table: str, item: dict, record_id: str) -> list:
+        # Values of a single row in field order, before categorical encoding.
+        key_positions, _, _ = self._parser(table)
+        values = [None] * len(self.TABLES[table]._fields)
+        values[0] = record_id
+        for key, value in item.items():
+            position = key_positions.get(key)
+            if position is not None:
+                values[position] = value
+        return values
+
+    @staticmethod
+    def _filter_sdes(sde_data: dict) -> (List[dict], List[dict]):
+
+        customer_info_events = []
+        personal_info_events = []
+
+        for event in sde_data:
+            if 'customerInfo' in event and event['customerInfo']:
+                customer_info_events.append(event)
+            elif 'personalInfo' in event and event['personalInfo']:
+                personal_info_events.append(event)
+
+        return customer_info_events, personal_info_events
+
+    def _set_customer_info(self, customer_info_data: List[dict], record_id: str) -> list:
+
+        fields = self.TABLES['customer_info']._fields
+        date_keys = {
+            'lastPaymentDate': ('last_payment_year', 'last_payment_month', 'last_payment_day'),
+            'registrationDate': ('registration_year', 'registration_month', 'registration_day')
+        }
+
+        def parse_customer_info(ci_item: dict, cid: str) -> tuple:
+
+            c_info = ci_item['customerInfo']['customerInfo']
+            values = self._row_values(table='customer_info', item=c_info, record_id=cid)
+
+            for key, (year, month, day) in date_keys.items():
+                if key in c_info:
+                    value = c_info[key]
+                    if 'year' in value and value['year']:
+                        values[fields.index(year)] = value['year']
+                    if 'month' in value and value['month']:
+                        values[fields.index(month)] = value['month']
+                    if 'day' in value and value['day']:
+                        values[fields.index(day)] = value['day']
+
+            # SDE Type
+            if 'sdeType' in ci_item and ci_item['sdeType']:
+                values[fields.index('sde_type')] = ci_item['sdeType']
+
+            # SDE Server Time Stamp
+            if 'serverTimeStamp' in ci_item and ci_item['serverTimeStamp']:
+                values[fields.index('sde_server_time_stamp')] = ci_item['serverTimeStamp']
+
+            # Get time stamp from inside customer info
+            if 'serverTimeStamp' in ci_item['customerInfo'] and ci_item['customerInfo']['serverTimeStamp']:
+                values[fields.index('customer_info_server_time_stamp')] = ci_item['customerInfo']['serverTimeStamp']
+
+            return self._make_row(table='customer_info', values=values)
+
+        return [parse_customer_info(ci_item=item, cid=record_id) for item in customer_info_data]
+
+    def _set_personal_info(self, personal_info_data: List[dict], record_id: str) -> list:
+
+        fields = self.TABLES['personal_info']._fields
+
+        def parse_personal_info(pi_item: dict, cid: str) -> list:
+
+            p_info = pi_item['personalInfo']['personalInfo']
+            values = self._row_values(table='personal_info', item=p_info, record_id=cid)
+
+            # SDE Type
+            if 'sdeType' in pi_item and pi_item['sdeType']:
+                values[fields.index('sde_type')] = pi_item['sdeType']
+
+            # SDE Server Time Stamp
+            if 'serverTimeStamp' in pi_item and pi_item['serverTimeStamp']:
+                values[fields.index('sde_server_time_stamp')] = pi_item['serverTimeStamp']
+
+            # Get time stamp from inside customer info
+            if 'serverTimeStamp' in pi_item['personalInfo'] and pi_item['personalInfo']['serverTimeStamp']:
+                values[fields.index('personal_info_server_time_stamp')] = pi_item['personalInfo']['serverTimeStamp']
+
+            personal_info_rows = []
+
+            if 'contacts' in p_info and p_info['contacts']:
+                for contact in p_info['contacts']:
+
+                    email = None
+                    phone = None
+
+                    if 'personalContact' in contact and contact['personalContact']:
+                        if 'email' in contact['personalContact'] and contact['personalContact']['email']:
+                            email = contact['personalContact']['email']
+                        if 'phone' in contact['personalContact'] and contact['personalContact']['phone']:
+                            phone = contact['personalContact']['phone']
+
+                    contact_values = list(values)
+                    contact_values[fields.index('email')] = email
+                    contact_values[fields.index('phone')] = phone
+                    personal_info_rows.append(self._make_row(table='personal_info', values=contact_values))
+            else:
+                personal_info_rows.append(self._make_row(table='personal_info', values=values))
+
+            return personal_info_rows
+
+        return [
+            personal_info
+            for item in personal_info_data
+            for personal_info in parse_personal_info(pi_item=item, cid=record_id)
+        ]
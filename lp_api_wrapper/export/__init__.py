@@ -0,0 +1,4 @@
+from .checkpoint import Checkpoint
+from .csv_writer import CsvWriter
+from .ndjson_archive import NdjsonArchive
+from .parquet_writer import ParquetWriter
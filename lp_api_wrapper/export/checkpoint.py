@@ -0,0 +1,144 @@
+"""
+Checkpoint makes large paged extractions resumable.
+
+Every completed page is spilled to its own compressed newline delimited JSON file in the checkpoint directory, and its
+offset is then appended to a journal.  If an extraction is interrupted, running it again with the same checkpoint
+directory and search reads the journaled pages back from disk and only downloads the offsets that are missing.
+
+A page file is written under a temporary name and renamed before its offset is journaled, and a journal line cut short
+by a crash is truncated away when the checkpoint is opened, so the journal only ever lists complete pages.  Offsets
+assume the result set of the search does not change between runs, as with a search over a past time range.  The record
+count and page size of the first run are kept in the manifest, and resuming with a different count raises ValueError
+instead of mixing pages of two result sets.
+
+Usage Example:
+    > conversations = mi_conn.conversations(body, checkpoint='./checkpoints/march')
+    > # Interrupted?  Run the same call again to resume.
+"""
+
+import gzip
+import os
+import shutil
+from .ndjson_archive import encode_records
+from ..util.json_decoder import (decode_json, encode_json)
+from typing import (Iterator, List, Optional, Set)
+
+CHECKPOINT_FORMAT = 'lp_api_wrapper.checkpoint'
+
+
+class Checkpoint:
+    def __init__(self, path: str, search: dict) -> None:
+        """
+        :param path: Checkpoint directory.  Created if missing.
+        :param search: Description of the extraction, such as its body and sort.  A checkpoint only resumes the
+         extraction it was created for.
+        :raises ValueError: If the directory holds a checkpoint of a different search.
+        """
+
+        self.path = path
+        self.search = search
+
+        os.makedirs(path, exist_ok=True)
+        self._manifest_path = os.path.join(path, 'manifest.json')
+
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'rb') as f:
+                self._manifest = decode_json(f.read())
+            if self._manifest.get('format') != CHECKPOINT_FORMAT or self._manifest.get('search') != decode_json(
+                    encode_json(search)):
+                raise ValueError('{} holds a checkpoint of a different extraction.'.format(path))
+        else:
+            self._manifest = {'format': CHECKPOINT_FORMAT, 'search': search}
+            self._save_manifest()
+
+        # Offsets of the pages on disk.
+        self.offsets: Set[int] = set()
+        self._journal_path = os.path.join(path, 'journal.ndjson')
+
+        if os.path.exists(self._journal_path):
+            with open(self._journal_path, 'r+b') as f:
+                journal = f.read()
+                # A line cut short by a crash is truncated, so the next line is not appended onto it.
+                complete = journal.rfind(b'\n') + 1
+                if complete < len(journal):
+                    f.truncate(complete)
+            for line in journal[:complete].splitlines():
+                self.offsets.add(decode_json(line)['offset'])
+
+    def _save_manifest(self) -> None:
+        temporary = '{}.tmp'.format(self._manifest_path)
+        with open(temporary, 'wb') as f:
+            f.write(encode_json(self._manifest))
+        os.replace(temporary, self._manifest_path)
+
+    def check_layout(self, count: int, page_size: int) -> None:
+        """
+        Records the page layout of the extraction on its first run, and checks it on later runs.
+
+        :param count: Total record count reported by the server for the search.
+        :param page_size: Records per page.
+        :raises ValueError: If the checkpoint was created for a different count or page size, since its pages would
+         no longer line up with the offsets of the search.
+        """
+
+        layout = {'count': count, 'page_size': page_size}
+        previous = self._manifest.get('layout')
+        if previous == layout:
+            return
+        if previous is not None and self.offsets:
+            raise ValueError('{} holds a checkpoint of {} records in pages of {}, but the search now has {} records in '
+                             'pages of {}.  Clear the checkpoint to start over.'.format(
+                                 self.path, previous['count'], previous['page_size'], count, page_size))
+
+        self._manifest['layout'] = layout
+        self._save_manifest()
+
+    def __contains__(self, offset: int) -> bool:
+        return offset in self.offsets
+
+    def _page_path(self, offset: int) -> str:
+        return os.path.join(self.path, 'page-{}.ndjson.gz'.format(offset))
+
+    def write_page(self, offset: int, records: List[dict]) -> None:
+        """
+        Spills a completed page to disk, then journals its offset.
+
+        :param offset: Offset of the page in the search.
+        :param records: Records of the page.
+        """
+
+        page_path = self._page_path(offset)
+        temporary = '{}.tmp'.format(page_path)
+        with gzip.open(temporary, 'wb', compresslevel=1) as f:
+            f.write(encode_records(records))
+        os.replace(temporary, page_path)
+
+        with open(self._journal_path, 'ab') as f:
+            f.write(encode_json({'offset': offset, 'records': len(records)}) + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.offsets.add(offset)
+
+    def read_page(self, offset: int) -> List[dict]:
+        """
+        :param offset: Offset of a journaled page.
+        :return: Records of the page.
+        """
+        with gzip.open(self._page_path(offset), 'rb') as f:
+            return [decode_json(line) for line in f]
+
+    def pages(self, offsets: Optional[Set[int]] = None) -> Iterator[List[dict]]:
+        """
+        :param offsets: Offsets to read.  Default: every journaled page.
+        :return: Iterator of the records of each journaled page, in offset order.
+        """
+        for offset in sorted(self.offsets if offsets is None else self.offsets & offsets):
+            yield self.read_page(offset)
+
+    def clear(self) -> None:
+        """
+        Deletes the checkpoint directory, for example once the extraction has been landed.
+        """
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.offsets = set()
@@ -0,0 +1,91 @@
+"""
+CsvWriter streams pages of Messaging Interactions data into one CSV flat file per table, without pandas.
+
+Headers come from the field names of each table's namedtuple.  Files can be gzip compressed, and each page is appended
+as soon as it is parsed, so exports of any size run in memory bounded by a single page.
+
+Usage Example:
+    > from lp_api_wrapper import MessagingInteractions, CsvWriter
+    > mi_conn = MessagingInteractions(auth=auth)
+    > body = {'start': {'from': 1491004800000, 'to': 1491091199000}}
+    > with CsvWriter(path='./export', compress=True) as writer:
+    >     for conversations in mi_conn.conversation_pages(body):
+    >         writer.write_conversations(conversations)
+
+Output Layout:
+    ./export/message_record.csv.gz
+"""
+
+import csv
+import gzip
+import json
+import os
+from ..data.messaging_interactions.conversations import Conversations
+from ..data.messaging_interactions.normalized_conversations import NormalizedConversations
+from typing import (Dict, Sequence, Union)
+
+
+class CsvWriter:
+    def __init__(self, path: str, compress: bool = False) -> None:
+        """
+        :param path: Directory the tables are written to.  Created if it does not exist.
+        :param compress: Gzip compress each file.  Default: False
+        """
+
+        self.path = path
+        self.compress = compress
+
+        # Open files and their csv writers, keyed by table.
+        self._files: Dict[str, tuple] = {}
+
+    def __enter__(self) -> 'CsvWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write_conversations(self, conversations: Union[Conversations, NormalizedConversations]) -> None:
+        """
+        Appends every table of a Conversations page to its CSV file.
+
+        :param conversations: Conversations data object, usually one page from MessagingInteractions.conversation_pages,
+         or a NormalizedConversations.
+        """
+
+        for table, row_type in conversations.TABLES.items():
+            rows = getattr(conversations, table)
+            if rows:
+                self.write_table(table=table, fields=row_type._fields, rows=rows)
+
+    def write_table(self, table: str, fields: Sequence[str], rows: Sequence[tuple]) -> None:
+        """
+        Appends rows to the CSV file of a table.  The file and its header are created on the first write.
+
+        :param table: Name of the table file.
+        :param fields: Column names of the rows.
+        :param rows: Rows to write.
+        """
+
+        if table not in self._files:
+            os.makedirs(self.path, exist_ok=True)
+            if self.compress:
+                file = gzip.open(os.path.join(self.path, table + '.csv.gz'), 'wt', newline='', encoding='utf-8')
+            else:
+                file = open(os.path.join(self.path, table + '.csv'), 'w', newline='', encoding='utf-8')
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            self._files[table] = (file, writer)
+
+        _, writer = self._files[table]
+        writer.writerows(
+            # Nested dicts and lists are stored as JSON strings.
+            [json.dumps(value) if isinstance(value, (dict, list)) else value for value in row] for row in rows
+        )
+
+    def close(self) -> None:
+        """
+        Closes every open file.  Compressed files are only complete once closed.
+        """
+        for file, _ in self._files.values():
+            file.close()
+        self._files = {}
@@ -0,0 +1,119 @@
+"""
+NdjsonArchive lands raw conversationHistoryRecords or interactionHistoryRecords as compressed newline delimited JSON.
+
+Decoded records are written one per line, compactly encoded, as soon as each page arrives.  Undecoded API responses
+can be written as they were received, one page per line, so archiving never builds Python objects for the records:
+a literal newline can only be whitespace in JSON, so removing newlines leaves the response valid on a single line.
+read_archive yields the records of both kinds of line.  No page is held after it is written, so raw landing runs in
+memory bounded by a single page.  The records of an undecoded page are still counted with page_record_count, so the
+count reported is what the archive holds rather than what the server's total promised.
+
+Usage Example:
+    > from lp_api_wrapper import MessagingInteractions
+    > mi_conn = MessagingInteractions(auth=auth)
+    > body = {'start': {'from': 1491004800000, 'to': 1491091199000}}
+    > count = mi_conn.archive_conversations(body, path='./conversations.ndjson.gz')
+"""
+
+import gzip
+from ..util.json_decoder import (decode_json, encode_json)
+from typing import (Iterable, Iterator, List)
+
+# Keys of the records array in Messaging Interactions and Engagement History responses.
+RECORDS_KEYS = ('conversationHistoryRecords', 'interactionHistoryRecords')
+
+
+def page_record_count(content: bytes) -> int:
+    """
+    :param content: JSON response body of one page.
+    :return: Number of records in the page.
+    """
+    page = decode_json(content)
+    return len(next((page[key] for key in RECORDS_KEYS if page.get(key) is not None), ()))
+
+
+def encode_records(records: List[dict]) -> bytes:
+    """
+    :param records: Decoded records.
+    :return: Records as compact JSON, one per line, each line ending in a newline.
+    """
+    return b''.join(encode_json(record) + b'\n' for record in records)
+
+
+class NdjsonArchive:
+    def __init__(self, path: str, compresslevel: int = 1) -> None:
+        """
+        :param path: File the records are written to.  Gzip compressed unless compresslevel is 0.
+        :param compresslevel: Gzip compression level from 0 to 9.  Default 1 favours speed over size.
+        """
+
+        self.path = path
+        self.count = 0
+
+        if compresslevel:
+            self._file = gzip.open(path, 'wb', compresslevel=compresslevel)
+        else:
+            self._file = open(path, 'wb')
+
+    def __enter__(self) -> 'NdjsonArchive':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write_records(self, records: List[dict]) -> None:
+        """
+        Appends a page of records to the archive.
+
+        :param records: List of conversationHistoryRecords or interactionHistoryRecords.
+        """
+        self._file.write(encode_records(records))
+        self.count += len(records)
+
+    def write_page_content(self, content: bytes, records: int) -> None:
+        """
+        Appends an undecoded API response as one line, without decoding it.
+
+        :param content: JSON response body of one page.
+        :param records: Number of records in the page.
+        """
+        self._file.write(content.replace(b'\r', b'').replace(b'\n', b'') + b'\n')
+        self.count += records
+
+    def write_pages(self, pages: Iterable[List[dict]]) -> int:
+        """
+        Appends every page of records to the archive as each page arrives.
+
+        :param pages: Iterator of record pages, such as MessagingInteractions.conversation_record_pages
+        :return: Number of records written by this archive.
+        """
+        for records in pages:
+            self.write_records(records)
+        return self.count
+
+    def close(self) -> None:
+        """
+        Closes the archive file.  Compressed archives are only complete once closed.
+        """
+        self._file.close()
+
+
+def read_archive(path: str) -> Iterator[dict]:
+    """
+    :param path: Archive written by NdjsonArchive, compressed or not.
+    :return: Iterator of the records in the archive, from record lines and page lines alike.
+    """
+
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+
+    with (gzip.open(path, 'rb') if compressed else open(path, 'rb')) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = decode_json(line)
+            key = next((key for key in RECORDS_KEYS if key in item), None)
+            if key is None:
+                yield item
+            else:
+                yield from item[key] or ()
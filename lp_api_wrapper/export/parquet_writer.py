@@ -0,0 +1,314 @@
+"""
+ParquetWriter streams pages of Messaging Interactions and Engagement History data into Parquet files.
+
+Each table is written to its own directory and partitioned by the UTC day of the conversation or engagement start
+time.  Rows are buffered per partition and written in row groups of row_group_size rows, so small pages do not produce
+many tiny row groups.  At most max_open_files Parquet files are open at once; when another partition needs a file, the
+least recently used one is closed and that partition continues in a new part file.  Part numbers continue after the
+highest part file already in a partition, so a later run into the same path adds files instead of overwriting them.
+
+Every column has a fixed nullable type derived from its field name (see field_type), so a column that is empty on one
+page and filled on another, or holds ints on one page and floats on the next, is written with the same schema.
+
+Usage Example:
+    > from lp_api_wrapper import MessagingInteractions, ParquetWriter
+    > mi_conn = MessagingInteractions(auth=auth)
+    > body = {'start': {'from': 1491004800000, 'to': 1491091199000}}
+    > with ParquetWriter(path='./export') as writer:
+    >     for conversations in mi_conn.conversation_pages(body):
+    >         writer.write_conversations(conversations)
+
+Output Layout:
+    ./export/message_record/date=2017-04-01/part-0.parquet
+"""
+
+import json
+import os
+from collections import OrderedDict
+from datetime import (datetime, timezone)
+from ..data.messaging_interactions.conversations import Conversations
+from ..data.messaging_interactions.normalized_conversations import NormalizedConversations
+from typing import (Any, Dict, List, Optional, Sequence, Union)
+
+# Columns of the engagements table.  Each record section is stored as a JSON string.
+ENGAGEMENT_FIELDS = ('engagement_id', 'start_time_l', 'info', 'campaign', 'visitor_info', 'transcript', 'surveys',
+                     'sdes', 'cobrowse_sessions')
+ENGAGEMENT_SECTIONS = (('info', 'info'), ('campaign', 'campaign'), ('visitor_info', 'visitorInfo'),
+                       ('transcript', 'transcript'), ('surveys', 'surveys'), ('sdes', 'sdes'),
+                       ('cobrowse_sessions', 'coBrowseSessions'))
+
+# Fields holding whole numbers, other than epoch millisecond fields ending in _l or time_stamp.
+INT_FIELDS = frozenset(['alerted_mcs', 'csat', 'duration', 'interactive_sequence', 'last_updated_time', 'mcs', 'seq'])
+
+# Fields holding numbers that may have a fraction.
+FLOAT_FIELDS = frozenset(['balance', 'csat_rate', 'message_raw_score'])
+
+# Fields holding flags.
+BOOL_FIELDS = frozenset(['active', 'agent_deleted', 'behavior_system_default', 'can_be_translated',
+                         'first_conversation', 'is_interactive', 'is_partial', 'profile_system_default'])
+
+
+def field_type(field: str) -> str:
+    """
+    :param field: Column name.
+    :return: Column type: 'bool', 'float', 'int' or 'string'.  IDs and every other field are strings.
+    """
+    if field in BOOL_FIELDS:
+        return 'bool'
+    if field in FLOAT_FIELDS:
+        return 'float'
+    if field in INT_FIELDS or field.endswith('_l') or field.endswith('time_stamp'):
+        return 'int'
+    return 'string'
+
+
+def _to_string(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        # Nested dicts and lists are stored as JSON strings.
+        return json.dumps(value)
+    return str(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+# Converts a value to the Python type of each column type.  Values that cannot be converted become null.
+_CONVERTERS = {'bool': _to_bool, 'float': _to_float, 'int': _to_int, 'string': _to_string}
+
+
+def day_partition(time_l: Optional[int]) -> str:
+    """
+    :param time_l: Epoch time in milliseconds.
+    :return: UTC day of the time as YYYY-MM-DD, or 'unknown' when there is no time.
+    """
+    if time_l is None:
+        return 'unknown'
+    return datetime.fromtimestamp(time_l / 1000, timezone.utc).strftime('%Y-%m-%d')
+
+
+def _next_part(directory: str) -> int:
+    # Part number after the highest part-N.parquet file in the directory, or 0 if there is none.
+    parts = [-1]
+    for name in os.listdir(directory):
+        number = name[len('part-'):-len('.parquet')]
+        if name.startswith('part-') and name.endswith('.parquet') and number.isdigit():
+            parts.append(int(number))
+    return max(parts) + 1
+
+
+class ParquetWriter:
+    def __init__(self, path: str, compression: str = 'snappy', row_group_size: int = 100000,
+                 max_open_files: int = 64, max_buffered_rows: int = 1000000) -> None:
+        """
+        :param path: Directory the tables are written to.  Created if it does not exist.
+        :param compression: Parquet compression codec.  Default: 'snappy'
+        :param row_group_size: Rows buffered per partition before they are written as one row group.
+         Default: 100000
+        :param max_open_files: Maximum Parquet files open at once.  Default: 64
+        :param max_buffered_rows: Maximum rows buffered across all partitions.  When exceeded, the largest buffer is
+         written early.  Default: 1000000
+        """
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('ParquetWriter requires pyarrow.  Install with: pip install pyarrow')
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.compression = compression
+        self.row_group_size = row_group_size
+        self.max_open_files = max_open_files
+        self.max_buffered_rows = max_buffered_rows
+
+        # Open file writers keyed by (table, day), least recently used first.
+        self._writers: 'OrderedDict[tuple, object]' = OrderedDict()
+        # Number of part files started for each (table, day).
+        self._parts: Dict[tuple, int] = {}
+        # Schema and column names of each table.
+        self._schemas: Dict[str, object] = {}
+        # Rows waiting to be written, keyed by (table, day).
+        self._buffers: Dict[tuple, List[tuple]] = {}
+        self._buffered = 0
+
+    def __enter__(self) -> 'ParquetWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def write_conversations(self, conversations: Union[Conversations, NormalizedConversations]) -> None:
+        """
+        Writes every table of a Conversations page to its day partitions.
+
+        Rows are partitioned by the start_time_l of the conversation they belong to.  Tables without a
+        conversation_id, such as the dimension tables of a NormalizedConversations, are not partitioned.
+
+        :param conversations: Conversations data object, usually one page from MessagingInteractions.conversation_pages,
+         or a NormalizedConversations.
+        """
+
+        days = {row.conversation_id: day_partition(row.start_time_l) for row in conversations.info}
+
+        for table, row_type in conversations.TABLES.items():
+            rows = getattr(conversations, table)
+            if not rows:
+                continue
+            if 'conversation_id' in row_type._fields:
+                self.write_table(table=table, fields=row_type._fields, rows=rows,
+                                 days=[days.get(row.conversation_id, 'unknown') for row in rows])
+            else:
+                self.write_table(table=table, fields=row_type._fields, rows=rows)
+
+    def write_engagements(self, records: List[dict]) -> None:
+        """
+        Writes a page of interactionHistoryRecords to the engagements table's day partitions.
+
+        Rows are partitioned by the startTimeL of each engagement.
+
+        :param records: List of interactionHistoryRecords, usually one page from EngagementHistory.engagement_pages
+        """
+
+        rows = []
+        for record in records:
+            info = record.get('info') or {}
+            rows.append(
+                (info.get('engagementId'), info.get('startTimeL')) +
+                tuple(record.get(section) for _, section in ENGAGEMENT_SECTIONS)
+            )
+
+        if rows:
+            self.write_table(table='engagements', fields=ENGAGEMENT_FIELDS, rows=rows,
+                             days=[day_partition(row[1]) for row in rows])
+
+    def schema(self, table: str, fields: Sequence[str]):
+        """
+        :param table: Name of the table directory.
+        :param fields: Column names of the table.
+        :return: pyarrow.Schema of the table: one nullable column per field, typed by field_type.
+        """
+
+        schema = self._schemas.get(table)
+        if schema is None:
+            types = {'bool': self.pa.bool_(), 'float': self.pa.float64(), 'int': self.pa.int64(),
+                     'string': self.pa.string()}
+            schema = self._schemas[table] = self.pa.schema(
+                [self.pa.field(field, types[field_type(field)], nullable=True) for field in fields]
+            )
+        elif list(schema.names) != list(fields):
+            raise ValueError('Rows of table {} must always have the same fields.'.format(table))
+        return schema
+
+    def write_table(self, table: str, fields: Sequence[str], rows: Sequence[tuple],
+                    days: Optional[Sequence[str]] = None) -> None:
+        """
+        Buffers rows for the day partitions of a table.  A partition is written as a row group once it holds
+        row_group_size rows, and the rest when the writer is flushed or closed.
+
+        :param table: Name of the table directory.
+        :param fields: Column names of the rows.
+        :param rows: Rows to write.
+        :param days: Partition of each row, as returned by day_partition.  None writes the table unpartitioned.
+        """
+
+        self.schema(table=table, fields=fields)
+
+        if days is None:
+            days = [None] * len(rows)
+
+        for row, day in zip(rows, days):
+            buffer = self._buffers.get((table, day))
+            if buffer is None:
+                buffer = self._buffers[(table, day)] = []
+            buffer.append(row)
+            self._buffered += 1
+            if len(buffer) >= self.row_group_size:
+                self._flush(key=(table, day))
+
+        while self._buffered > self.max_buffered_rows:
+            self._flush(key=max(self._buffers, key=lambda key: len(self._buffers[key])))
+
+    def flush(self) -> None:
+        """
+        Writes every buffered row.
+        """
+        for key in list(self._buffers):
+            self._flush(key=key)
+
+    def close(self) -> None:
+        """
+        Writes the buffered rows and closes every open Parquet file.  Files are only readable once closed.
+        """
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = OrderedDict()
+
+    def _flush(self, key: tuple) -> None:
+        # Writes the buffered rows of one partition as a row group.
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        self._buffered -= len(rows)
+
+        table, day = key
+        schema = self._schemas[table]
+        arrays = []
+        for field, values in zip(schema, zip(*rows)):
+            convert = _CONVERTERS[field_type(field.name)]
+            arrays.append(self.pa.array([convert(value) for value in values], type=field.type))
+
+        self._writer(key=key).write_table(self.pa.Table.from_arrays(arrays, schema=schema))
+
+    def _writer(self, key: tuple):
+        # Open writer of the partition, opening a new part file if needed and closing the least recently used file.
+        writer = self._writers.get(key)
+        if writer is not None:
+            self._writers.move_to_end(key)
+            return writer
+
+        while len(self._writers) >= self.max_open_files:
+            _, oldest = self._writers.popitem(last=False)
+            oldest.close()
+
+        table, day = key
+        directory = os.path.join(self.path, table) if day is None else \
+            os.path.join(self.path, table, 'date={}'.format(day))
+        os.makedirs(directory, exist_ok=True)
+
+        part = self._parts.get(key)
+        if part is None:
+            part = _next_part(directory)
+        self._parts[key] = part + 1
+        writer = self._writers[key] = self.pq.ParquetWriter(
+            os.path.join(directory, 'part-{}.parquet'.format(part)), self._schemas[table],
+            compression=self.compression
+        )
+        return writer
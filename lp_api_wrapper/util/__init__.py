@@ -1,2 +1,5 @@
 from .domain_service import DomainService
+from .json_decoder import (decode_json, encode_json, set_json_decoder)
 from .login_service import (LoginService, UserLogin, OAuthLogin)
+from .pipeline import Pipeline
+from .survey_pivot import SurveyPivot
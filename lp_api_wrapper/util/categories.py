@@ -0,0 +1,57 @@
+"""
+Categories provides dictionary encoding for fields whose values repeat across many rows, such as agent names, skill
+names, devices and sources.
+
+Encoding a value returns a small integer code and stores one canonical copy of the value.  Rows that hold the canonical
+copy share a single string object instead of each holding their own, and group by operations can work on codes.
+"""
+
+import threading
+from typing import (Any, Dict, List, Optional)
+
+
+class Categories:
+    def __init__(self) -> None:
+        # Canonical value of each code, in order of first appearance.
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Any) -> int:
+        """
+        :param value: Hashable value.
+        :return: Code of the value.  New values are assigned the next code.
+        """
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def lookup(self, value: Any) -> Optional[int]:
+        """
+        :param value: Hashable value.
+        :return: Code of the value, or None if it has not been encoded.  Unlike encode, never assigns a code.
+        """
+        return self._codes.get(value)
+
+    def intern(self, value: Any) -> Any:
+        """
+        :param value: Hashable value.
+        :return: Canonical copy of the value, equal to it.
+        """
+        return self.values[self.encode(value)]
+
+    def decode(self, code: int) -> Any:
+        """
+        :param code: Code returned by encode.
+        :return: Value of the code.
+        """
+        return self.values[code]
@@ -0,0 +1,226 @@
+"""
+Provides a simple columnar binary format whose columns are memory-mapped when read.
+
+A table is stored as a directory with one or more files per column:
+    <field>.values      int64, float64 or int8 values, or the UTF-8 bytes of every string
+    <field>.offsets     int64 start offset of each string, plus the end offset of the last one
+    <field>.valid       one byte per row, 0 where the value is None (only written when a column has None values)
+    <field>.categories  JSON list of the distinct values of a dictionary encoded column, whose codes are int32 values
+
+Columns are opened lazily and read through mmap, so opening a large table costs almost nothing and only the pages of
+the columns that are actually read are loaded from disk.  Each mapping holds a file descriptor until the column is
+closed, and on Windows a mapped file cannot be replaced, so close tables once they are no longer read.  Values that are not bool, int, float or str, such as nested
+dicts, are stored as JSON strings.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import (Any, Dict, Sequence)
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+def column_kind(values: Sequence, categorical: bool = False) -> str:
+    """
+    :param values: Values of a column.
+    :param categorical: Dictionary encode the column if every value is a string or None.
+    :return: Storage kind of the column: 'null', 'bool', 'int', 'float', 'category', 'str' or 'json'.
+    """
+
+    types = {value.__class__ for value in values if value is not None}
+
+    if not types:
+        return 'null'
+    if types == {bool}:
+        return 'bool'
+    if types == {int}:
+        if all(_INT64_MIN <= value <= _INT64_MAX for value in values if value is not None):
+            return 'int'
+        return 'json'
+    if types == {float}:
+        return 'float'
+    if types == {str}:
+        return 'category' if categorical else 'str'
+    return 'json'
+
+
+def write_column(directory: str, field: str, values: Sequence, categorical: bool = False) -> dict:
+    """
+    Writes the files of one column.
+
+    :param directory: Directory of the table.
+    :param field: Name of the column.
+    :param values: Values of the column.
+    :param categorical: Dictionary encode the column if every value is a string or None.
+    :return: Description of the column for the manifest.
+    """
+
+    kind = column_kind(values=values, categorical=categorical)
+    path = os.path.join(directory, field)
+    nulls = any(value is None for value in values)
+
+    if kind == 'null':
+        return {'kind': kind, 'nulls': True}
+
+    if nulls:
+        with open(path + '.valid', 'wb') as f:
+            f.write(bytes(value is not None for value in values))
+
+    if kind in ('bool', 'int', 'float'):
+        typecode, missing = {'bool': ('b', 0), 'int': ('q', 0), 'float': ('d', 0.0)}[kind]
+        with open(path + '.values', 'wb') as f:
+            array(typecode, (missing if value is None else value for value in values)).tofile(f)
+
+    elif kind == 'category':
+        categories = {}
+        codes = array('i', (-1 if value is None else categories.setdefault(value, len(categories)) for value in values))
+        with open(path + '.values', 'wb') as f:
+            codes.tofile(f)
+        with open(path + '.categories', 'w', encoding='utf-8') as f:
+            json.dump(list(categories), f)
+
+    else:
+        offsets = array('q', [0])
+        with open(path + '.values', 'wb') as f:
+            position = 0
+            for value in values:
+                if value is not None:
+                    encoded = (value if kind == 'str' else json.dumps(value, separators=(',', ':'))).encode()
+                    f.write(encoded)
+                    position += len(encoded)
+                offsets.append(position)
+        with open(path + '.offsets', 'wb') as f:
+            offsets.tofile(f)
+
+    return {'kind': kind, 'nulls': nulls}
+
+
+def _map(path: str) -> memoryview:
+    # Memory-maps a file read only.  Empty files cannot be mapped and are returned as an empty view.
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _unmap(view) -> None:
+    # Releases a view returned by _map or cast from one, and closes its mapping.
+    if not isinstance(view, memoryview):
+        return
+    mapped = view.obj
+    view.release()
+    if isinstance(mapped, mmap.mmap):
+        mapped.close()
+
+
+def _numbers(path: str, typecode: str, byteorder: str) -> Sequence:
+    view = _map(path)
+    if byteorder != sys.byteorder and typecode != 'b':
+        # Mapped files written on a machine of the other byte order are copied and swapped.
+        values = array(typecode)
+        values.frombytes(view.tobytes())
+        values.byteswap()
+        _unmap(view)
+        return values
+    return view.cast(typecode)
+
+
+class Column(SequenceABC):
+    """
+    Read only, memory-mapped column.  Supports len, indexing, slicing and iteration like a list.
+    """
+
+    def __init__(self, directory: str, field: str, rows: int, kind: str, nulls: bool,
+                 byteorder: str = sys.byteorder) -> None:
+        path = os.path.join(directory, field)
+        self.kind = kind
+        self.rows = rows
+        self._valid = _map(path + '.valid') if nulls and kind != 'null' else None
+        self._values = None
+        self._offsets = None
+        self._categories = None
+
+        if kind in ('bool', 'int', 'float'):
+            self._values = _numbers(path + '.values', {'bool': 'b', 'int': 'q', 'float': 'd'}[kind], byteorder)
+        elif kind == 'category':
+            self._values = _numbers(path + '.values', 'i', byteorder)
+            with open(path + '.categories', encoding='utf-8') as f:
+                self._categories = json.load(f)
+        elif kind in ('str', 'json'):
+            self._values = _map(path + '.values')
+            self._offsets = _numbers(path + '.offsets', 'q', byteorder)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._value(i) for i in range(*item.indices(self.rows))]
+        if item < 0:
+            item += self.rows
+        if not 0 <= item < self.rows:
+            raise IndexError('column index out of range')
+        return self._value(item)
+
+    def __iter__(self):
+        return (self._value(i) for i in range(self.rows))
+
+    def _value(self, i: int) -> Any:
+        if self.kind == 'null' or (self._valid is not None and not self._valid[i]):
+            return None
+        if self.kind == 'bool':
+            return bool(self._values[i])
+        if self.kind in ('int', 'float'):
+            return self._values[i]
+        if self.kind == 'category':
+            return self._categories[self._values[i]]
+        data = bytes(self._values[self._offsets[i]:self._offsets[i + 1]]).decode()
+        return data if self.kind == 'str' else json.loads(data)
+
+    def close(self) -> None:
+        """
+        Unmaps the files of the column.  The column cannot be read afterwards.
+        """
+        for view in (self._valid, self._values, self._offsets):
+            _unmap(view)
+
+
+class MappedTable:
+    """
+    Columns of a table whose files were written by write_column.  Each column is memory-mapped on first access.
+    """
+
+    def __init__(self, directory: str, rows: int, description: Dict[str, dict],
+                 byteorder: str = sys.byteorder) -> None:
+        """
+        :param directory: Directory of the table.
+        :param rows: Number of rows.
+        :param description: Dictionary of field name to the description returned by write_column.
+        :param byteorder: Byte order of the machine that wrote the files.  Default: this machine's byte order.
+        """
+        self.directory = directory
+        self.rows = rows
+        self.description = description
+        self.byteorder = byteorder
+        self._columns: Dict[str, Column] = {}
+
+    def column(self, field: str) -> Column:
+        if field not in self._columns:
+            # Fields added to a row type after the files were written read as None.
+            spec = self.description.get(field, {'kind': 'null', 'nulls': True})
+            self._columns[field] = Column(directory=self.directory, field=field, rows=self.rows, kind=spec['kind'],
+                                          nulls=spec['nulls'], byteorder=self.byteorder)
+        return self._columns[field]
+
+    def close(self) -> None:
+        """
+        Unmaps every column opened so far.  Columns accessed afterwards are mapped again.
+        """
+        for column in self._columns.values():
+            column.close()
+        self._columns = {}
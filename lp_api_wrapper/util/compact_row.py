@@ -0,0 +1,91 @@
+"""
+Provides compact, slot based row classes with the same fields and interface as a namedtuple.
+
+A compact row stores its values in __slots__ instead of a tuple.  _make is generated per class: it allocates the
+row and unpacks the values straight into the slots in one assignment, without calling __init__, which makes it
+faster than namedtuple._make.  Rows support attribute access, iteration, indexing, _fields, _make,
+_asdict and _replace, and compare equal to rows of the same class with the same values.
+"""
+
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Type
+
+
+def compact_row_type(row_type: Type[tuple]) -> type:
+    """
+    :param row_type: namedtuple type whose fields the compact row class copies.
+    :return: Slot based row class named Compact<row_type name>.
+    """
+
+    fields = tuple(row_type._fields)
+    arguments = ', '.join(fields)
+
+    # Generated like namedtuple's constructor, so rows are built with plain positional assignments.  _make unpacks
+    # the values into the slots of a new instance in a single assignment, skipping the call to __init__.
+    namespace = {'_new': object.__new__}
+    exec(
+        'def __init__(self, {0}):\n'.format(arguments) +
+        ''.join('    self.{0} = {0}\n'.format(field) for field in fields) +
+        'def _make(cls, iterable):\n'
+        '    self = _new(cls)\n'
+        '    {0}, = iterable\n'
+        '    return self\n'.format(', '.join('self.' + field for field in fields)),
+        namespace
+    )
+
+    if len(fields) == 1:
+        values_getter = attrgetter(fields[0])
+
+        def values_of(row):
+            return values_getter(row),
+    else:
+        values_of = attrgetter(*fields)
+
+    def __iter__(self):
+        return iter(values_of(self))
+
+    def __len__(self):
+        return len(fields)
+
+    def __getitem__(self, item):
+        return values_of(self)[item]
+
+    def __eq__(self, other):
+        return type(other) is type(self) and values_of(self) == values_of(other)
+
+    def __hash__(self):
+        return hash(values_of(self))
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__, ', '.join('{}={!r}'.format(field, value) for field, value in zip(fields, self))
+        )
+
+    def __reduce__(self):
+        return type(self), values_of(self)
+
+    def _asdict(self):
+        return OrderedDict(zip(fields, self))
+
+    def _replace(self, **kwargs):
+        values = self._asdict()
+        values.update(kwargs)
+        return type(self)(**values)
+
+    return type('Compact' + row_type.__name__, (), {
+        '__module__': row_type.__module__,
+        '__slots__': fields,
+        '__init__': namespace['__init__'],
+        '__iter__': __iter__,
+        '__len__': __len__,
+        '__getitem__': __getitem__,
+        '__eq__': __eq__,
+        '__hash__': __hash__,
+        '__repr__': __repr__,
+        '__reduce__': __reduce__,
+        '_fields': fields,
+        '_make': classmethod(namespace['_make']),
+        '_asdict': _asdict,
+        '_replace': _replace
+    })
@@ -0,0 +1,79 @@
+"""
+Converts columns of epoch millisecond timestamps, such as the *_time_l fields of Conversations, into NumPy
+datetime64[ms] arrays in one vectorized pass.  Requires numpy.
+
+datetime64 values carry no timezone.  Without a timezone they are UTC; with one they are the local wall clock time in
+that timezone.  UTC offsets are looked up once per distinct 15 minute bucket rather than once per value, since
+timezones such as America/St_Johns and Australia/Lord_Howe change offset on the half hour.  A bucket whose offset
+differs between its first and last millisecond holds a transition, and only its values are looked up one by one.
+
+Usage Example:
+    > from lp_api_wrapper.util.datetimes import to_datetime64
+    > to_datetime64([1491004800000, None], tz='America/New_York')
+    array(['2017-03-31T20:00:00.000', 'NaT'], dtype='datetime64[ms]')
+"""
+
+from datetime import (datetime, timezone, tzinfo)
+from typing import (Iterable, Optional, Union)
+
+_BUCKET_MS = 900000
+
+# Integer value numpy uses for NaT.
+_NAT = -2 ** 63
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError('datetime conversion requires numpy.  Install with: pip install numpy')
+    return np
+
+
+def _timezone(tz: Union[str, tzinfo]) -> tzinfo:
+    if isinstance(tz, tzinfo):
+        return tz
+    if tz.upper() == 'UTC':
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+    except ImportError:
+        raise ImportError('Timezone names require Python 3.9 or later.  Pass a tzinfo object, such as pytz.timezone, '
+                          'instead.')
+    return ZoneInfo(tz)
+
+
+def _offsets(np, millis, tz: tzinfo):
+    # UTC offset in milliseconds at each epoch millisecond.
+    return np.array([
+        round(datetime.fromtimestamp(value / 1000, tz).utcoffset().total_seconds() * 1000) for value in millis.tolist()
+    ], dtype=np.int64)
+
+
+def to_datetime64(values: Iterable[Optional[int]], tz: Optional[Union[str, tzinfo]] = None):
+    """
+    :param values: Epoch milliseconds.  None becomes NaT.
+    :param tz: Timezone name, such as 'America/New_York', or a tzinfo object.  Default: UTC
+    :return: numpy.ndarray of dtype datetime64[ms].
+    """
+
+    np = _numpy()
+
+    millis = np.fromiter((_NAT if value is None else value for value in values), dtype=np.int64)
+
+    if tz is not None:
+        tz = _timezone(tz)
+        valid = np.flatnonzero(millis != _NAT)
+        buckets, positions = np.unique(millis[valid] // _BUCKET_MS, return_inverse=True)
+        starts = _offsets(np, buckets * _BUCKET_MS, tz)
+        ends = _offsets(np, buckets * _BUCKET_MS + _BUCKET_MS - 1, tz)
+        offsets = starts[positions]
+
+        # Values in a bucket holding a transition take the offset at their own time.
+        transitions = np.flatnonzero((starts != ends)[positions])
+        if len(transitions):
+            offsets[transitions] = _offsets(np, millis[valid[transitions]], tz)
+
+        millis[valid] += offsets
+
+    return millis.view('datetime64[ms]')
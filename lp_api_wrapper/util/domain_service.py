@@ -9,6 +9,7 @@ https://developers.liveperson.com/agent-domain-domain-api.html
 """
 
 import requests
+from .json_decoder import decode_json
 
 
 class DomainService:
@@ -31,7 +32,7 @@ class DomainService:
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            return r.json()['baseURI']
+            return decode_json(r.content)['baseURI']
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
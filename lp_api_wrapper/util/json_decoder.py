@@ -0,0 +1,69 @@
+"""
+Provides the JSON decoder used by every lp_api_wrapper class to decode API responses.
+
+orjson is used when it is installed, as it decodes large conversation pages several times faster than the standard
+library and holds the GIL for less time per page.  Otherwise the standard library json module is used.  Any other
+decoder can be plugged in with set_json_decoder.
+
+Usage Example:
+    > import rapidjson
+    > from lp_api_wrapper import set_json_decoder
+    > set_json_decoder(loads=rapidjson.loads)
+"""
+
+import json
+from typing import (Any, Callable, Optional, Union)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default_loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some documents the standard library accepts, such as NaN and Infinity.
+            pass
+    return json.loads(data)
+
+
+def _default_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+_loads: Callable[[Union[bytes, str]], Any] = _default_loads
+
+
+def set_json_decoder(loads: Optional[Callable[[Union[bytes, str]], Any]] = None) -> None:
+    """
+    Sets the function used to decode every API response.
+
+    :param loads: Function that takes the response body as bytes and returns the decoded JSON.
+     None restores the default decoder (orjson when installed, else the standard library).
+    """
+    global _loads
+    _loads = loads or _default_loads
+
+
+def decode_json(data: Union[bytes, str]) -> Any:
+    """
+    :param data: JSON document, usually the content of a response.
+    :return: Decoded JSON in the form of Python data types.
+    """
+    return _loads(data)
+
+
+def encode_json(obj: Any) -> bytes:
+    """
+    :param obj: Python data types to encode.
+    :return: Compact UTF-8 JSON.  Uses orjson when installed.
+    """
+    return _default_dumps(obj)
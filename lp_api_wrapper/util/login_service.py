@@ -9,6 +9,7 @@ https://developers.liveperson.com/login-getting-started.html
 import requests
 from requests_oauthlib import OAuth1
 from .domain_service import DomainService
+from .json_decoder import decode_json
 from typing import (Union, Optional, NamedTuple)
 
 
@@ -82,8 +83,9 @@ class LoginService(DomainService):
 
         # Check request status
         if r.status_code == requests.codes.ok:
-            self.bearer = r.json()['bearer']
-            self.csrf = r.json()['csrf']
+            payload = decode_json(r.content)
+            self.bearer = payload['bearer']
+            self.csrf = payload['csrf']
         else:
             print('Error: {}'.format(r.json()))
             r.raise_for_status()
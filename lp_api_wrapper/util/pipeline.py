@@ -0,0 +1,137 @@
+"""
+Pipeline runs items through a chain of stages, each in its own threads, connected by bounded queues.
+
+Stages overlap, so for example pages are decoded and parsed while later pages are still downloading.  Every queue holds
+at most queue_size items, so when a later stage or the consumer falls behind, the earlier stages block instead of
+piling up data in memory.  Results are yielded in completion order.
+
+Usage Example:
+    > from lp_api_wrapper.util import Pipeline
+    > pipeline = Pipeline(stages=[(download, 10), (decode_json, 1), (parse, 1)], queue_size=4)
+    > for result in pipeline.run(items=offsets):
+    >     sink(result)
+"""
+
+import queue
+import threading
+from typing import (Any, Callable, Iterable, Iterator, List, Tuple)
+
+
+class _Done:
+    # Marks the end of the items flowing into a queue.
+    pass
+
+
+class _Failure:
+    # Carries an exception raised by a stage to the consumer.
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+class Pipeline:
+    def __init__(self, stages: List[Tuple[Callable[[Any], Any], int]], queue_size: int = 4) -> None:
+        """
+        :param stages: List of (function, number of worker threads).  Each function takes the output of the previous
+         stage, or an item for the first stage.
+        :param queue_size: Maximum number of items waiting between two stages.
+        """
+
+        if not stages:
+            raise ValueError('Pipeline requires at least one stage.')
+
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, items: Iterable) -> Iterator:
+        """
+        Feeds items through every stage.  Stops all stages if the iterator is closed early or a stage raises.
+
+        :param items: Inputs of the first stage.
+        :return: Iterator of the outputs of the last stage.  Exceptions raised by a stage are raised here.
+        """
+
+        stop = threading.Event()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0], stop), daemon=True)]
+
+        for i, (function, workers) in enumerate(self.stages):
+            remaining = [workers]
+            lock = threading.Lock()
+            for _ in range(workers):
+                threads.append(
+                    threading.Thread(target=self._work, args=(function, queues[i], queues[i + 1], stop, remaining,
+                                                              lock), daemon=True)
+                )
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if isinstance(item, _Done):
+                    break
+                if isinstance(item, _Failure):
+                    raise item.exception
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    @staticmethod
+    def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        # Blocks while the queue is full, unless the pipeline is stopped.
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(q: queue.Queue, stop: threading.Event) -> Any:
+        # Blocks while the queue is empty, unless the pipeline is stopped.
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _Done()
+
+    def _feed(self, items: Iterable, output: queue.Queue, stop: threading.Event) -> None:
+        try:
+            for item in items:
+                if not self._put(output, item, stop):
+                    return
+        except Exception as e:
+            self._put(output, _Failure(e), stop)
+        self._put(output, _Done(), stop)
+
+    def _work(self, function: Callable[[Any], Any], source: queue.Queue, output: queue.Queue,
+              stop: threading.Event, remaining: List[int], lock: threading.Lock) -> None:
+        while True:
+            item = self._get(source, stop)
+
+            if isinstance(item, _Done):
+                # Pass the marker on to sibling workers; the last worker of the stage signals the next stage.
+                self._put(source, item, stop)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self._put(output, item, stop)
+                return
+
+            if isinstance(item, _Failure):
+                self._put(output, item, stop)
+                continue
+
+            try:
+                result = function(item)
+            except Exception as e:
+                result = _Failure(e)
+
+            if not self._put(output, result, stop):
+                return
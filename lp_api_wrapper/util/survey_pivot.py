@@ -0,0 +1,102 @@
+"""
+SurveyPivot turns survey answers, stored as one row per question, into a wide table with one row per survey and one
+column per question.
+
+Rows and questions are dictionary encoded: each row key and each question is given a position on first appearance,
+and every answer is written straight into the column buffer of its question at the position of its row.  Building the
+table is a single pass over the answers with no per row dictionaries.
+
+Usage Example:
+    > pivot = SurveyPivot(key_fields=('conversation_id', 'survey_type'))
+    > pivot.extend(keys=[('c1', 'PCS'), ('c1', 'PCS')], questions=['q1', 'q2'], answers=['5', 'yes'])
+    > pivot.columns()
+    {'conversation_id': ['c1'], 'survey_type': ['PCS'], 'q1': ['5'], 'q2': ['yes']}
+"""
+
+from typing import (Any, Dict, Iterable, List, Sequence)
+
+
+class SurveyPivot:
+    def __init__(self, key_fields: Sequence[str]) -> None:
+        """
+        :param key_fields: Names of the fields identifying a survey, such as ('conversation_id', 'survey_type').
+        """
+
+        self.key_fields = tuple(key_fields)
+
+        # Key of each row, and the row position of each key.
+        self.keys: List[tuple] = []
+        self._rows: Dict[tuple, int] = {}
+
+        # Column position of each question, in order of first appearance, and the answers of each column.
+        self.questions: Dict[Any, int] = {}
+        self._buffers: List[list] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: tuple, question: Any, answer: Any) -> None:
+        """
+        :param key: Values of key_fields identifying the survey.
+        :param question: Question, which becomes a column.  Answers without a question are ignored.
+        :param answer: Answer.  A later answer to the same question of the same survey replaces an earlier one.
+        """
+        self.extend(keys=(key,), questions=(question,), answers=(answer,))
+
+    def extend(self, keys: Iterable[tuple], questions: Iterable[Any], answers: Iterable[Any]) -> None:
+        """
+        Adds answers given as parallel columns, such as the columns of Conversations.survey.
+
+        :param keys: Key of the survey of each answer.
+        :param questions: Question of each answer.
+        :param answers: Answers.
+        """
+
+        rows, row_keys = self._rows, self.keys
+        question_columns, buffers = self.questions, self._buffers
+
+        for key, question, answer in zip(keys, questions, answers):
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = len(row_keys)
+                row_keys.append(key)
+
+            if question is None:
+                continue
+
+            column = question_columns.get(question)
+            if column is None:
+                column = question_columns[question] = len(buffers)
+                buffers.append([])
+
+            buffer = buffers[column]
+            if len(buffer) <= row:
+                buffer.extend([None] * (row + 1 - len(buffer)))
+            buffer[row] = answer
+
+    def columns(self) -> Dict[Any, list]:
+        """
+        :return: Dictionary of the key fields followed by one column per question, each with one value per survey.
+         Questions a survey did not answer are None.
+        """
+
+        size = len(self.keys)
+        columns = {
+            field: [key[i] for key in self.keys] for i, field in enumerate(self.key_fields)
+        }
+        for question, column in self.questions.items():
+            buffer = self._buffers[column]
+            columns[question] = buffer + [None] * (size - len(buffer))
+        return columns
+
+    def to_pandas(self):
+        """
+        :return: pandas.DataFrame with one row per survey.  Requires pandas.
+        """
+
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError('to_pandas requires pandas.  Install with: pip install pandas')
+
+        return pd.DataFrame(self.columns())
@@ -12,6 +12,12 @@ setup(
     download_url='https://github.com/ajoneslp/liveperson-api-python-wrapper/archive/{}.tar.gz'.format(v),
     packages=find_packages(),
     install_requires=['requests', 'requests_oauthlib'],
+    extras_require={
+        'pandas': ['pandas'],
+        'arrow': ['pyarrow'],
+        'numpy': ['numpy'],
+        'fast': ['orjson']
+    },
     python_requires='>=3.6',
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from lp_api_wrapper.data.messaging_interactions import MessagingInteractions
+from lp_api_wrapper.export.checkpoint import Checkpoint
+
+SEARCH = {'source': 'conversations', 'body': {}}
+
+
+class FakeMessagingInteractions(MessagingInteractions):
+    def __init__(self, count):
+        self.count = count
+        self.offsets = []
+
+    def conversations_endpoint_content(self, body, url_parameters):
+        offset = url_parameters['offset']
+        self.offsets.append(offset)
+        records = [{'info': {'conversationId': 'c{}'.format(i)}} for i in range(offset, min(offset + 100, self.count))]
+        return json.dumps({'_metadata': {'count': self.count}, 'conversationHistoryRecords': records}).encode()
+
+
+def ids(pages):
+    return sorted(int(record['info']['conversationId'][1:]) for page in pages for record in page)
+
+
+def test_torn_journal_line_is_truncated(tmp_path):
+    checkpoint = Checkpoint(path=str(tmp_path), search=SEARCH)
+    checkpoint.write_page(offset=0, records=[{'id': 0}])
+    with open(str(tmp_path / 'journal.ndjson'), 'ab') as f:
+        f.write(b'{"offset": 1')
+
+    resumed = Checkpoint(path=str(tmp_path), search=SEARCH)
+    assert resumed.offsets == {0}
+    resumed.write_page(offset=100, records=[{'id': 100}])
+
+    assert Checkpoint(path=str(tmp_path), search=SEARCH).offsets == {0, 100}
+
+
+def test_resume_after_torn_line_downloads_only_missing_pages(tmp_path):
+    path = str(tmp_path)
+    mi_conn = FakeMessagingInteractions(count=350)
+    pages = mi_conn.conversation_record_pages(body={}, max_workers=1, queue_size=1, checkpoint=path)
+    next(pages)
+    next(pages)
+    pages.close()
+
+    with open(str(tmp_path / 'journal.ndjson'), 'ab') as f:
+        f.write(b'{"offs')
+    journaled = Checkpoint(path=path, search=SEARCH).offsets
+
+    mi_conn.offsets = []
+    assert ids(mi_conn.conversation_record_pages(body={}, max_workers=2, checkpoint=path)) == list(range(350))
+    assert sorted(mi_conn.offsets) == [0] + sorted({0, 100, 200, 300} - journaled)
+
+
+def test_resume_with_a_different_count_raises(tmp_path):
+    path = str(tmp_path)
+    list(FakeMessagingInteractions(count=250).conversation_record_pages(body={}, max_workers=2, checkpoint=path))
+
+    with pytest.raises(ValueError):
+        list(FakeMessagingInteractions(count=260).conversation_record_pages(body={}, max_workers=2, checkpoint=path))
+
+
+def test_different_search_raises(tmp_path):
+    Checkpoint(path=str(tmp_path), search=SEARCH)
+    with pytest.raises(ValueError):
+        Checkpoint(path=str(tmp_path), search={'source': 'engagements', 'body': {}})
@@ -0,0 +1,28 @@
+import pickle
+from collections import namedtuple
+
+import pytest
+
+from lp_api_wrapper.util.compact_row import compact_row_type
+
+Row = namedtuple('Row', ['a', 'b', 'c'])
+CompactRow = compact_row_type(Row)
+
+
+def test_make_matches_namedtuple():
+    row = CompactRow._make(iter([1, 'x', None]))
+    assert (row.a, row.b, row.c) == (1, 'x', None)
+    assert tuple(row) == tuple(Row._make([1, 'x', None]))
+    assert row == CompactRow(1, 'x', None)
+    assert row._replace(b='y')._asdict() == {'a': 1, 'b': 'y', 'c': None}
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_make_rejects_wrong_length():
+    with pytest.raises(ValueError):
+        CompactRow._make([1, 2])
+
+
+def test_single_field():
+    single = compact_row_type(namedtuple('Single', ['only']))
+    assert tuple(single._make(['v'])) == ('v',)
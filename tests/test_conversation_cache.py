@@ -0,0 +1,102 @@
+import pytest
+
+from lp_api_wrapper.data.messaging_interactions import ConversationCache
+from lp_api_wrapper.data.messaging_interactions.conversation_cache import missing_intervals
+from lp_api_wrapper.export.ndjson_archive import read_archive
+
+DAY_MS = 86400000
+
+
+def test_missing_intervals():
+    assert missing_intervals(0, 99, []) == [(0, 99)]
+    assert missing_intervals(0, 99, [(0, 99)]) == []
+    assert missing_intervals(0, 99, [(20, 29), (50, 59)]) == [(0, 19), (30, 49), (60, 99)]
+    # Overlapping, unordered and partly outside the range.
+    assert missing_intervals(10, 99, [(40, 60), (-5, 15), (55, 70), (200, 300)]) == [(16, 39), (71, 99)]
+    assert missing_intervals(0, 99, [(0, 49), (50, 99)]) == []
+
+
+class FakeMessagingInteractions:
+    def __init__(self, records):
+        self.records = records
+        self.searches = []
+
+    def conversation_record_pages(self, body, max_workers, debug):
+        self.searches.append(body['start'])
+        start = body['start']
+        yield [record for record in self.records if start['from'] <= record['info']['startTimeL'] <= start['to']]
+
+
+def record(conversation_id, start_time, status):
+    return {'info': {'conversationId': conversation_id, 'startTimeL': start_time, 'status': status}}
+
+
+def test_open_conversations_are_not_cached(tmp_path):
+    mi_conn = FakeMessagingInteractions([record('closed', 1000, 'CLOSE'), record('open', 5000, 'OPEN'),
+                                         record('later', 8000, 'CLOSE')])
+    cache = ConversationCache(mi_conn, path=str(tmp_path), settle=0)
+    body = {'start': {'from': 0, 'to': 9999}}
+
+    assert [r['info']['conversationId'] for r in cache.records(body)] == ['closed', 'open', 'later']
+    assert cache.intervals(body) == [(0, 4999)]
+
+    mi_conn.records[1] = record('open', 5000, 'CLOSE')
+    assert [r['info']['status'] for r in cache.records(body)] == ['CLOSE', 'CLOSE', 'CLOSE']
+    assert mi_conn.searches[-1] == {'from': 5000, 'to': 9999}
+    assert cache.intervals(body) == [(0, 4999), (5000, 9999)]
+
+
+def test_settle_leaves_recent_conversations_uncached(tmp_path):
+    mi_conn = FakeMessagingInteractions([])
+    cache = ConversationCache(mi_conn, path=str(tmp_path), settle=DAY_MS)
+    body = {'start': {'from': 0, 'to': 10 ** 13}}
+
+    cache.records(body)
+    ((low, high),) = cache.intervals(body)
+    assert low == 0 and high < 10 ** 13
+
+
+def cache_files(path):
+    return sorted(str(file.relative_to(path)) for file in path.rglob('*.ndjson.gz*'))
+
+
+def test_failed_fetch_leaves_no_file(tmp_path):
+    class FailingMessagingInteractions(FakeMessagingInteractions):
+        def conversation_record_pages(self, body, max_workers, debug):
+            yield [record('closed', 1000, 'CLOSE')]
+            raise IOError('connection reset')
+
+    cache = ConversationCache(FailingMessagingInteractions([]), path=str(tmp_path), settle=0)
+    with pytest.raises(IOError):
+        cache.records({'start': {'from': 0, 'to': 9999}})
+
+    assert cache_files(tmp_path) == []
+    assert cache.intervals({}) == []
+
+
+def test_unsettled_records_are_not_kept_on_disk(tmp_path):
+    mi_conn = FakeMessagingInteractions([record('closed', 1000, 'CLOSE'), record('open', 5000, 'OPEN'),
+                                         record('later', 8000, 'CLOSE')])
+    cache = ConversationCache(mi_conn, path=str(tmp_path), settle=0)
+    body = {'start': {'from': 0, 'to': 9999}}
+
+    for _ in range(3):
+        cache.records(body)
+
+    (interval_file,) = cache_files(tmp_path)
+    assert [r['info']['conversationId'] for r in read_archive(str(tmp_path / interval_file))] == ['closed']
+
+
+def test_compact_merges_adjacent_intervals(tmp_path):
+    mi_conn = FakeMessagingInteractions([record('c{}'.format(i), i * 1000, 'CLOSE') for i in range(10)])
+    cache = ConversationCache(mi_conn, path=str(tmp_path), settle=0)
+    for low in range(0, 10000, 2500):
+        cache.records({'start': {'from': low, 'to': low + 2499}})
+    assert len(cache_files(tmp_path)) == 4
+
+    cache.compact()
+
+    assert len(cache_files(tmp_path)) == 1
+    assert cache.intervals({}) == [(0, 9999)]
+    assert len(cache.records({'start': {'from': 0, 'to': 9999}})) == 10
+    assert len(mi_conn.searches) == 4
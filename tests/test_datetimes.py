@@ -0,0 +1,33 @@
+from datetime import (datetime, timezone)
+
+import pytest
+
+from lp_api_wrapper.util.datetimes import to_datetime64
+
+pytest.importorskip('numpy')
+ZoneInfo = pytest.importorskip('zoneinfo').ZoneInfo
+
+
+def wall_clock(millis, tz):
+    local = datetime.fromtimestamp(millis / 1000, ZoneInfo(tz))
+    return local.replace(tzinfo=timezone.utc).timestamp() * 1000
+
+
+@pytest.mark.parametrize('tz, transition', [
+    # 2019-03-10 02:00 NST becomes 03:00 NDT at 05:30 UTC.
+    ('America/St_Johns', 1552195800000),
+    # 2019-10-06 02:00 LHST becomes 02:30 LHDT at 15:30 UTC, a half hour change.
+    ('Australia/Lord_Howe', 1570289400000),
+    # 2019-03-10 02:00 EST becomes 03:00 EDT at 07:00 UTC.
+    ('America/New_York', 1552201200000),
+])
+def test_offsets_change_at_the_transition(tz, transition):
+    millis = [transition + delta for delta in (-1800000, -60000, -1, 0, 1, 60000, 1800000)] + [None]
+    converted = to_datetime64(millis, tz=tz)
+
+    assert [int(value) for value in converted[:-1].astype('int64')] == [wall_clock(value, tz) for value in millis[:-1]]
+    assert str(converted[-1]) == 'NaT'
+
+
+def test_without_timezone_is_utc():
+    assert str(to_datetime64([1491004800000])[0]) == '2017-04-01T00:00:00.000'
@@ -0,0 +1,47 @@
+import threading
+
+from lp_api_wrapper.data.engagement_history import EngagementHistory
+
+
+class FakeEngagementHistory(EngagementHistory):
+    def __init__(self, count):
+        # Skips login; only the engagements endpoint is used.
+        self.bearer = None
+        self.count = count
+        self.offsets = []
+        self.lock = threading.Lock()
+
+    def engagements(self, body, offset=0, limit=100, sort=None):
+        with self.lock:
+            self.offsets.append(offset)
+        records = [{'info': {'engagementId': str(i)}} for i in range(offset, min(offset + limit, self.count))]
+        return {'_metadata': {'count': self.count}, 'interactionHistoryRecords': records}
+
+
+def test_engagement_pages_yields_every_page():
+    eh = FakeEngagementHistory(count=1050)
+    pages = list(eh.engagement_pages(body={}, max_concurrent_requests=3))
+
+    assert len(pages) == 11
+    assert sorted(record['info']['engagementId'] for page in pages for record in page) == \
+        sorted(str(i) for i in range(1050))
+
+
+def test_engagement_pages_downloads_are_bounded():
+    eh = FakeEngagementHistory(count=100000)
+    pages = eh.engagement_pages(body={}, max_concurrent_requests=2, queue_size=2)
+    next(pages)
+    pages.close()
+
+    # The count request plus at most a few pages in flight, not all 1000 offsets.
+    assert len(eh.offsets) < 20
+
+
+def test_smaller_limit_leaves_no_gaps_and_resumes(tmp_path):
+    eh = FakeEngagementHistory(count=250)
+    pages = eh.engagement_pages(body={}, limit=30, max_concurrent_requests=1, queue_size=1, checkpoint=str(tmp_path))
+    next(pages)
+    pages.close()
+
+    pages = list(eh.engagement_pages(body={}, limit=30, max_concurrent_requests=2, checkpoint=str(tmp_path)))
+    assert sorted(int(record['info']['engagementId']) for page in pages for record in page) == list(range(250))
@@ -0,0 +1,52 @@
+from lp_api_wrapper.data.messaging_interactions import IncrementalSync
+from lp_api_wrapper.data.messaging_interactions.incremental_sync import update_time
+
+
+def record(conversation_id, status, messages, start=1000):
+    return {'info': {'conversationId': conversation_id, 'status': status, 'startTimeL': start,
+                     'endTimeL': None if status == 'OPEN' else start + 4000},
+            'messageRecords': [{'messageId': str(i), 'timeL': start + i} for i in range(messages)], 'transfers': []}
+
+
+class FakeMessagingInteractions:
+    account_id = '42'
+
+    def __init__(self):
+        self.pages = []
+        self.searches = []
+
+    def conversation_record_pages(self, body, max_workers, debug):
+        self.searches.append(body)
+        return iter(self.pages)
+
+
+def test_update_time():
+    assert update_time(record('a', 'CLOSE', 3)) == 5000
+    assert update_time(record('a', 'OPEN', 3)) == 1002
+    assert update_time({'info': {}}) is None
+
+
+def test_watermark_follows_record_times_not_the_local_clock(tmp_path):
+    mi_conn = FakeMessagingInteractions()
+    sync = IncrementalSync(mi_conn, state_path=str(tmp_path / 'state.json'), initial_from=0, overlap=100)
+
+    mi_conn.pages = [[record('a', 'CLOSE', 3), record('b', 'OPEN', 1, start=500)]]
+    assert [r['info']['conversationId'] for r in sync.records(now=10 ** 9)] == ['a', 'b']
+    assert sync.state()['watermark'] == 5000
+
+    mi_conn.pages = [[record('a', 'CLOSE', 3), record('b', 'OPEN', 2, start=500), record('c', 'CLOSE', 1, start=6000)]]
+    assert [r['info']['conversationId'] for r in sync.records(now=10 ** 9)] == ['b', 'c']
+    assert mi_conn.searches[-1]['latestUpdateTime'] == 4900
+    assert mi_conn.searches[-1]['start'] == {'from': 500, 'to': 10 ** 9}
+    assert sync.state()['watermark'] == 10000
+
+
+def test_watermark_is_kept_when_nothing_changed(tmp_path):
+    mi_conn = FakeMessagingInteractions()
+    sync = IncrementalSync(mi_conn, state_path=str(tmp_path / 'state.json'), initial_from=0, overlap=100)
+
+    mi_conn.pages = [[record('a', 'CLOSE', 3)]]
+    sync.records(now=10 ** 9)
+    mi_conn.pages = []
+    assert sync.records(now=2 * 10 ** 9) == []
+    assert sync.state()['watermark'] == 5000
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+from lp_api_wrapper.data.messaging_interactions import Conversations
+
+
+def saved(tmp_path):
+    conversations = Conversations()
+    conversations.append_records(records=[
+        {'info': {'conversationId': 'c{}'.format(i), 'startTimeL': i, 'duration': i * 10, 'latestSkillName': 'Sales'},
+         'messageRecords': [{'messageId': 'm{}'.format(i), 'seq': 0, 'timeL': i,
+                             'messageData': {'msg': {'text': 'hello {}'.format(i)}}}]}
+        for i in range(5)
+    ])
+    path = str(tmp_path / 'saved')
+    conversations.save(path)
+    return path
+
+
+def open_files():
+    return len(os.listdir('/proc/self/fd'))
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason='needs /proc to count open files')
+def test_close_releases_mapped_files(tmp_path):
+    path = saved(tmp_path)
+    before = open_files()
+
+    with Conversations.open(path) as conversations:
+        assert list(conversations.columns(table='info')['duration']) == [0, 10, 20, 30, 40]
+        assert [row.message_id for row in conversations.message_record] == ['m{}'.format(i) for i in range(5)]
+        assert open_files() > before
+
+    assert open_files() == before
+    # Rows built before closing stay usable.
+    assert len(conversations.message_record) == 5
+
+
+def test_columns_are_mapped_again_after_close(tmp_path):
+    conversations = Conversations.open(saved(tmp_path))
+    duration = conversations.columns(table='info')['duration']
+    conversations.close()
+
+    with pytest.raises(ValueError):
+        duration[0]
+    assert list(conversations.columns(table='info')['duration']) == [0, 10, 20, 30, 40]
+    conversations.close()
@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+from lp_api_wrapper.data.engagement_history import EngagementHistory
+from lp_api_wrapper.data.messaging_interactions import MessagingInteractions
+from lp_api_wrapper.export.ndjson_archive import (NdjsonArchive, read_archive)
+
+COUNT = 250
+
+
+def page(key, offset, limit=100):
+    records = [{'info': {'id': i, 'text': 'line\nbreak'}} for i in range(offset, min(offset + limit, COUNT))]
+    # Pretty printed, so the response holds newlines outside strings.
+    return json.dumps({'_metadata': {'count': COUNT}, key: records}, indent=2).encode()
+
+
+class FakeMessagingInteractions(MessagingInteractions):
+    def __init__(self):
+        pass
+
+    def conversations_endpoint_content(self, body, url_parameters):
+        return page('conversationHistoryRecords', url_parameters['offset'])
+
+
+class FakeEngagementHistory(EngagementHistory):
+    def __init__(self):
+        self.bearer = None
+
+    def engagements_content(self, body, offset=0, limit=100, sort=None):
+        return page('interactionHistoryRecords', offset, limit)
+
+
+def ids(path):
+    return sorted(record['info']['id'] for record in read_archive(str(path)))
+
+
+def test_archive_conversations_writes_pages_as_received(tmp_path):
+    path = tmp_path / 'conversations.ndjson.gz'
+
+    assert FakeMessagingInteractions().archive_conversations(body={}, path=str(path)) == COUNT
+    with gzip.open(str(path), 'rb') as f:
+        lines = sorted(f.read().splitlines())
+    assert lines == sorted(page('conversationHistoryRecords', offset).replace(b'\n', b'') for offset in (0, 100, 200))
+    assert ids(path) == list(range(COUNT))
+
+
+def test_archive_counts_records_actually_written(tmp_path):
+    path = tmp_path / 'engagements.ndjson.gz'
+    eh = FakeEngagementHistory()
+    # The last page comes back shorter than the server's count promised.
+    eh.engagements_content = lambda body, offset=0, limit=100, sort=None: page(
+        'interactionHistoryRecords', offset, 40 if offset == 200 else limit)
+
+    assert eh.archive_engagements(body={}, path=str(path)) == 240
+    assert len(ids(path)) == 240
+
+
+def test_archive_engagements_writes_pages_undecoded(tmp_path):
+    path = tmp_path / 'engagements.ndjson.gz'
+    assert FakeEngagementHistory().archive_engagements(body={}, path=str(path)) == COUNT
+    assert ids(path) == list(range(COUNT))
+
+
+def test_archive_engagements_raises_on_a_failed_page(tmp_path):
+    eh = FakeEngagementHistory()
+    eh.bearer = 'token'
+    eh.auth = type('Auth', (), {'username': 'u', 'password': 'p'})()
+    eh.user_login = lambda username, password: None
+
+    def engagements_content(body, offset=0, limit=100, sort=None):
+        if offset == 100:
+            raise requests.HTTPError('401')
+        return page('interactionHistoryRecords', offset, limit)
+    eh.engagements_content = engagements_content
+
+    with pytest.raises(requests.HTTPError):
+        eh.archive_engagements(body={}, path=str(tmp_path / 'engagements.ndjson.gz'))
+
+
+def test_read_archive_reads_record_lines(tmp_path):
+    path = tmp_path / 'records.ndjson'
+    with NdjsonArchive(path=str(path), compresslevel=0) as archive:
+        archive.write_records([{'info': {'id': 1}}, {'info': {'id': 0}}])
+    assert ids(path) == [0, 1]
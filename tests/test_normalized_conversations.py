@@ -0,0 +1,83 @@
+import json
+
+from lp_api_wrapper.data.messaging_interactions import (Conversations, MessagingInteractions)
+from lp_api_wrapper.data.messaging_interactions.normalized_conversations import (NORMALIZED_TABLES,
+                                                                                 PASSTHROUGH_TABLES,
+                                                                                 normalized_pages)
+
+COUNT = 250
+
+
+def record(i, agent_name=None):
+    agent_id = 'a{}'.format(i % 3)
+    start = 1546300800000 + i * 60000
+    return {
+        'info': {'conversationId': 'c{}'.format(i), 'startTimeL': start, 'status': 'CLOSE',
+                 'latestAgentId': agent_id, 'latestAgentFullName': agent_name or 'Agent {}'.format(agent_id),
+                 'latestSkillId': 1, 'latestSkillName': 'Sales'},
+        'messageRecords': [{'messageId': 'm{}'.format(i), 'seq': 0, 'timeL': start, 'participantId': agent_id,
+                            'messageData': {'msg': {'text': 'hello'}}}],
+        'agentParticipants': [{'agentId': agent_id, 'agentFullName': agent_name or 'Agent {}'.format(agent_id),
+                               'timeL': start, 'role': 'ASSIGNED_AGENT'}],
+        'conversationSurveys': [{'surveyType': 'PCS', 'surveyStatus': 'FILLED',
+                                 'surveyData': [{'question': 'q1', 'answer': '5'}]}],
+        'campaign': {'campaignId': 1, 'campaignName': 'Campaign'}
+    }
+
+
+def conversations(records):
+    parsed = Conversations()
+    parsed.append_records(records=records)
+    return parsed
+
+
+class FakeMessagingInteractions(MessagingInteractions):
+    def __init__(self):
+        pass
+
+    def conversations_endpoint_content(self, body, url_parameters):
+        offset = url_parameters['offset']
+        records = [record(i) for i in range(offset, min(offset + 100, COUNT))]
+        return json.dumps({'_metadata': {'count': COUNT}, 'conversationHistoryRecords': records}).encode()
+
+
+def test_normalize_carries_every_other_table_through():
+    source = conversations([record(i) for i in range(6)])
+    normalized = source.normalize()
+
+    assert {'message_record', 'campaign', 'survey'} <= set(PASSTHROUGH_TABLES)
+    assert set(NORMALIZED_TABLES) >= set(PASSTHROUGH_TABLES)
+    for table in PASSTHROUGH_TABLES:
+        assert getattr(normalized, table) == getattr(source, table)
+    assert len(normalized.message_record) == 6
+
+
+def test_normalized_pages_emit_each_dimension_row_once():
+    pages = [conversations([record(i) for i in range(start, start + 3)]) for start in (0, 3, 6)]
+    normalized = list(normalized_pages(pages))
+
+    assert sorted(agent.agent_id for agent in normalized[0].agents) == ['a0', 'a1', 'a2']
+    assert normalized[1].agents == [] and normalized[2].agents == []
+    assert [len(page.info) for page in normalized] == [3, 3, 3]
+
+
+def test_normalized_pages_emit_renamed_dimension_rows_again():
+    pages = [conversations([record(0)]), conversations([record(3, agent_name='Renamed')])]
+    normalized = list(normalized_pages(pages))
+
+    assert [agent.agent_id for agent in normalized[1].agents] == ['a0']
+    assert normalized[1].agents[0].agent_full_name == 'Renamed'
+
+
+def test_conversations_normalize_at_parse_time():
+    mi_conn = FakeMessagingInteractions()
+    body = {'start': {'from': 0, 'to': 1}}
+
+    normalized = mi_conn.conversations(body, max_workers=2, normalize=True)
+    assert len(normalized.info) == COUNT
+    assert len(normalized.message_record) == COUNT
+    assert sorted(agent.agent_id for agent in normalized.agents) == ['a0', 'a1', 'a2']
+
+    pages = list(mi_conn.conversation_pages(body, max_workers=2, normalize=True))
+    assert sum(len(page.info) for page in pages) == COUNT
+    assert sum(len(page.agents) for page in pages) == 3
@@ -0,0 +1,92 @@
+import pytest
+
+from lp_api_wrapper.data.messaging_interactions import OpenConversationPoller
+
+DAY_MS = 86400000
+NOW = 10 * DAY_MS
+
+
+def record(conversation_id, status, messages, start_time=NOW - 1000):
+    return {'info': {'conversationId': conversation_id, 'status': status, 'startTimeL': start_time},
+            'messageRecords': [{'seq': seq} for seq in range(messages)], 'transfers': []}
+
+
+class FakeMessagingInteractions:
+    def __init__(self):
+        self.pages = []
+        self.searches = []
+        self.by_id = {}
+        self.fetched = []
+
+    def conversation_record_pages(self, body, max_workers, debug):
+        self.searches.append(body)
+        for page in self.pages:
+            if isinstance(page, Exception):
+                raise page
+            yield page
+
+    def get_conversation_by_conversation_id_endpoint(self, conversation_id):
+        self.fetched.append(conversation_id)
+        return {'conversationHistoryRecords': [self.by_id[conversation_id]] if conversation_id in self.by_id else []}
+
+
+def test_poll_emits_only_new_messages():
+    mi_conn = FakeMessagingInteractions()
+    poller = OpenConversationPoller(mi_conn)
+
+    mi_conn.pages = [[record('a', 'OPEN', 2)]]
+    assert [delta.new for delta in poller.poll(now=NOW)] == [True]
+
+    mi_conn.pages = [[record('a', 'OPEN', 2)]]
+    assert poller.poll(now=NOW) == []
+
+    mi_conn.pages = [[record('a', 'OPEN', 4)]]
+    assert [[message['seq'] for message in delta.messages] for delta in poller.poll(now=NOW)] == [[2, 3]]
+
+
+def test_failure_mid_poll_keeps_deltas_for_the_next_poll():
+    mi_conn = FakeMessagingInteractions()
+    poller = OpenConversationPoller(mi_conn)
+
+    mi_conn.pages = [[record('a', 'OPEN', 1)]]
+    poller.poll(now=NOW)
+
+    mi_conn.pages = [[record('a', 'OPEN', 3), record('b', 'OPEN', 1)], IOError('connection reset')]
+    with pytest.raises(IOError):
+        poller.poll(now=NOW)
+    assert poller.fingerprints == {'a': (1, 0, 0)}
+
+    mi_conn.pages = [[record('a', 'OPEN', 3), record('b', 'OPEN', 1)]]
+    deltas = {delta.conversation_id: delta for delta in poller.poll(now=NOW)}
+    assert [message['seq'] for message in deltas['a'].messages] == [1, 2]
+    assert deltas['b'].new
+
+
+def test_open_conversations_older_than_lookback_are_searched_for():
+    mi_conn = FakeMessagingInteractions()
+    poller = OpenConversationPoller(mi_conn, lookback=DAY_MS)
+    old_start = NOW - 3 * DAY_MS
+
+    mi_conn.pages = [[record('old', 'OPEN', 1, start_time=old_start)]]
+    poller.poll(now=NOW)
+
+    poller.poll(now=NOW + DAY_MS)
+    assert mi_conn.searches[-1]['start'] == {'from': old_start, 'to': NOW + DAY_MS}
+    assert mi_conn.fetched == []
+
+
+def test_closed_conversation_is_fetched_once_and_untracked():
+    mi_conn = FakeMessagingInteractions()
+    poller = OpenConversationPoller(mi_conn)
+
+    mi_conn.pages = [[record('a', 'OPEN', 1)]]
+    poller.poll(now=NOW)
+
+    mi_conn.pages = [[]]
+    mi_conn.by_id = {'a': record('a', 'CLOSE', 2)}
+    deltas = poller.poll(now=NOW)
+    assert [(delta.closed, len(delta.messages)) for delta in deltas] == [(True, 1)]
+    assert poller.fingerprints == {} and poller.start_times == {}
+
+    poller.poll(now=NOW)
+    assert mi_conn.fetched == ['a']
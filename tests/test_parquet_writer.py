@@ -0,0 +1,73 @@
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from lp_api_wrapper.export.parquet_writer import (ParquetWriter, day_partition, field_type)
+
+FIELDS = ('conversation_id', 'csat', 'csat_rate', 'start_time_l', 'is_partial', 'latest_skill_id')
+DAY = '2019-01-01'
+
+
+def read(path, table='info'):
+    return pq.read_table(str(path / table / 'date={}'.format(DAY)))
+
+
+def test_field_type():
+    assert field_type('start_time_l') == 'int'
+    assert field_type('csat') == 'int'
+    assert field_type('csat_rate') == 'float'
+    assert field_type('is_partial') == 'bool'
+    assert field_type('latest_skill_id') == 'string'
+
+
+def test_schema_drift_across_pages(tmp_path):
+    with ParquetWriter(path=str(tmp_path), row_group_size=2) as writer:
+        # The first page has no csat and integer csat_rate; later pages fill them with other types.
+        writer.write_table('info', FIELDS, [('c1', None, 1, 10, False, 12), ('c2', None, 2, 11, None, 12)],
+                           days=[DAY, DAY])
+        writer.write_table('info', FIELDS, [('c3', 5, 4.5, 12, True, '13')], days=[DAY])
+        writer.write_table('info', FIELDS, [('c4', '4', None, None, 'true', None)], days=[DAY])
+
+    table = read(tmp_path)
+    assert table.schema.field('csat').type == pa.int64()
+    assert table.schema.field('csat_rate').type == pa.float64()
+    assert table.column('csat').to_pylist() == [None, None, 5, 4]
+    assert table.column('csat_rate').to_pylist() == [1.0, 2.0, 4.5, None]
+    assert table.column('is_partial').to_pylist() == [False, None, True, True]
+    assert table.column('latest_skill_id').to_pylist() == ['12', '12', '13', None]
+
+
+def test_rows_are_buffered_into_row_groups(tmp_path):
+    with ParquetWriter(path=str(tmp_path), row_group_size=3) as writer:
+        for i in range(7):
+            writer.write_table('info', FIELDS, [('c{}'.format(i), i, None, i, None, None)], days=[DAY])
+
+    metadata = pq.ParquetFile(str(tmp_path / 'info' / 'date={}'.format(DAY) / 'part-0.parquet')).metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [3, 3, 1]
+
+
+def test_open_files_are_capped(tmp_path):
+    days = ['2019-01-0{}'.format(day) for day in range(1, 4)]
+    with ParquetWriter(path=str(tmp_path), row_group_size=1, max_open_files=2) as writer:
+        for _ in range(2):
+            for day in days:
+                writer.write_table('info', FIELDS, [('c', 1, None, 1, None, None)], days=[day])
+                assert len(writer._writers) <= 2
+
+    for day in days:
+        assert pq.read_table(str(tmp_path / 'info' / 'date={}'.format(day))).num_rows == 2
+
+
+def test_later_runs_add_part_files(tmp_path):
+    for run in ('run1', 'run2'):
+        with ParquetWriter(path=str(tmp_path)) as writer:
+            writer.write_table('info', FIELDS, [(run, None, None, 1, None, None)], days=[DAY])
+
+    assert sorted(read(tmp_path).column('conversation_id').to_pylist()) == ['run1', 'run2']
+
+
+def test_day_partition():
+    assert day_partition(1546387199999) == '2019-01-01'
+    assert day_partition(1546387200000) == '2019-01-02'
+    assert day_partition(None) == 'unknown'
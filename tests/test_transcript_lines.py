@@ -0,0 +1,38 @@
+import pytest
+
+from lp_api_wrapper.data.engagement_history.transcript_lines import TranscriptLines
+from lp_api_wrapper.util.categories import Categories
+
+
+def engagement(engagement_id, sources):
+    return {'info': {'engagementId': engagement_id},
+            'transcript': {'lines': [{'source': source, 'agentId': 'a1', 'timeL': i, 'text': 'line {}'.format(i)}
+                                     for i, source in enumerate(sources)]}}
+
+
+def test_categories_lookup_does_not_assign_codes():
+    categories = Categories()
+    assert categories.encode('x') == 0
+    assert categories.lookup('x') == 0
+    assert categories.lookup('y') is None
+    assert len(categories) == 1
+
+
+def test_more_than_128_sources():
+    lines = TranscriptLines()
+    sources = ['source {}'.format(i) for i in range(300)]
+    lines.append_records([engagement('e1', sources)])
+
+    assert [line.source for line in lines] == sources
+    assert [line.text for line in lines.engagement_lines('e1')][-1] == 'line 299'
+    assert lines.engagement_lines('missing') == []
+
+
+def test_to_arrow_with_more_than_128_sources():
+    pytest.importorskip('pyarrow')
+
+    lines = TranscriptLines()
+    sources = ['source {}'.format(i) for i in range(300)] + [None]
+    lines.append_records([engagement('e1', sources)])
+
+    assert lines.to_arrow().column('source').to_pylist() == sources
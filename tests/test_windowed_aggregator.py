@@ -0,0 +1,32 @@
+from lp_api_wrapper.data.messaging_interactions import (Conversations, WindowedAggregator)
+
+HOUR_MS = 3600000
+
+
+def page(*hours):
+    conversations = Conversations()
+    conversations.append_records(records=[
+        {'info': {'conversationId': 'c{}-{}'.format(hour, i), 'startTimeL': hour * HOUR_MS + i, 'duration': 1000,
+                  'latestSkillId': 1}}
+        for i, hour in enumerate(hours)
+    ])
+    return conversations
+
+
+def counts(aggregator):
+    return {window.window_start // HOUR_MS: window.conversations for window in aggregator.windows()}
+
+
+def test_tumbling_windows():
+    aggregator = WindowedAggregator(size=HOUR_MS, by=('skill',)).consume([page(0, 0, 1), page(1, 2)])
+    assert counts(aggregator) == {0: 2, 1: 2, 2: 1}
+
+
+def test_late_pages_do_not_reopen_evicted_panes():
+    aggregator = WindowedAggregator(size=HOUR_MS, by=('skill',), retention=2 * HOUR_MS)
+
+    # Pages complete out of start time order: hours 0 and 1 are evicted once hour 10 is seen.
+    aggregator.consume([page(0, 1), page(10), page(0, 1, 9)])
+
+    assert counts(aggregator) == {9: 1, 10: 1}
+    assert aggregator.late_rows == 2